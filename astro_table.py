@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Moon phases, equinoxes and solstices for 1900-2100 from a compact binary table.
+
+The table (astro_table.bin, shipped next to this file) is built once with
+Meeus' algorithms (Astronomical Algorithms, chapters 27 and 49) and holds
+the local calendar dates in TABLE_TIMEZONE. It is memory-mapped on first
+use and a year is found through a fixed-width index, so a lookup costs the
+same for any year and nothing is computed or parsed at startup.
+
+Layout (little-endian):
+    header   "<4sHHH"  magic, version, first year, last year
+    index    "<H" * (years + 1)  offset of each year's first record; the
+             next entry ends it
+    records  "<BBB"  month, day, event kind (see EVENT_KINDS), in date order
+"""
+import argparse
+import math
+import mmap
+import os
+import struct
+import time
+from datetime import datetime, timedelta, timezone
+
+TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "astro_table.bin")
+TABLE_MAGIC = b"ASTR"
+TABLE_VERSION = 1
+TABLE_TIMEZONE = "Europe/Bucharest"
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+
+HEADER = struct.Struct("<4sHHH")
+INDEX_ENTRY = struct.Struct("<H")
+RECORD = struct.Struct("<BBB")
+
+# Record kinds: moon phases as used by the renderers, then the four seasons
+EVENT_KINDS = ['new', 'first', 'full', 'last', 'march_equinox', 'june_solstice', 'september_equinox', 'december_solstice']
+MOON_KINDS = 4
+
+# Mapped table and decoded years: year -> (moon phases, equinoxes and solstices)
+_table = None
+_years = {}
+
+# --- Building the table (Meeus) ---
+
+def delta_t(year):
+    """TT - UT in seconds (Espenak and Meeus polynomials, 1900-2150)."""
+    if year < 1920:
+        t = year - 1900
+        return -2.79 + 1.494119 * t - 0.0598939 * t ** 2 + 0.0061966 * t ** 3 - 0.000197 * t ** 4
+    if year < 1941:
+        t = year - 1920
+        return 21.20 + 0.84493 * t - 0.076100 * t ** 2 + 0.0020936 * t ** 3
+    if year < 1961:
+        t = year - 1950
+        return 29.07 + 0.407 * t - t ** 2 / 233 + t ** 3 / 2547
+    if year < 1986:
+        t = year - 1975
+        return 45.45 + 1.067 * t - t ** 2 / 260 - t ** 3 / 718
+    if year < 2005:
+        t = year - 2000
+        return 63.86 + 0.3345 * t - 0.060374 * t ** 2 + 0.0017275 * t ** 3 + 0.000651814 * t ** 4 + 0.00002373599 * t ** 5
+    if year < 2050:
+        t = year - 2000
+        return 62.92 + 0.32217 * t + 0.005589 * t ** 2
+    return -20 + 32 * ((year - 1820) / 100) ** 2 - 0.5628 * (2150 - year)
+
+def jde_to_utc(jde):
+    """Convert a Julian Ephemeris Day to a UTC datetime."""
+    moment = datetime(2000, 1, 1, 12, tzinfo=timezone.utc) + timedelta(days=jde - 2451545.0)
+    return moment - timedelta(seconds=delta_t(moment.year + (moment.timetuple().tm_yday - 0.5) / 365.25))
+
+def _sin(degrees):
+    return math.sin(math.radians(degrees))
+
+def _cos(degrees):
+    return math.cos(math.radians(degrees))
+
+# Periodic terms of the new and full moon (Meeus 49): coefficient, E power, multiples of (M, M', F, Omega)
+NEW_MOON_TERMS = [
+    (-0.40720, 0, (0, 1, 0, 0)), (0.17241, 1, (1, 0, 0, 0)), (0.01608, 0, (0, 2, 0, 0)), (0.01039, 0, (0, 0, 2, 0)),
+    (0.00739, 1, (-1, 1, 0, 0)), (-0.00514, 1, (1, 1, 0, 0)), (0.00208, 2, (2, 0, 0, 0)), (-0.00111, 0, (0, 1, -2, 0)),
+    (-0.00057, 0, (0, 1, 2, 0)), (0.00056, 1, (1, 2, 0, 0)), (-0.00042, 0, (0, 3, 0, 0)), (0.00042, 1, (1, 0, 2, 0)),
+    (0.00038, 1, (1, 0, -2, 0)), (-0.00024, 1, (-1, 2, 0, 0)), (-0.00017, 0, (0, 0, 0, 1)), (-0.00007, 0, (2, 1, 0, 0)),
+    (0.00004, 0, (0, 2, -2, 0)), (0.00004, 0, (3, 0, 0, 0)), (0.00003, 0, (1, 1, -2, 0)), (0.00003, 0, (0, 2, 2, 0)),
+    (-0.00003, 0, (1, 1, 2, 0)), (0.00003, 0, (-1, 1, 2, 0)), (-0.00002, 0, (-1, 1, -2, 0)), (-0.00002, 0, (1, 3, 0, 0)),
+    (0.00002, 0, (0, 4, 0, 0)),
+]
+FULL_MOON_TERMS = [
+    (-0.40614, 0, (0, 1, 0, 0)), (0.17302, 1, (1, 0, 0, 0)), (0.01614, 0, (0, 2, 0, 0)), (0.01043, 0, (0, 0, 2, 0)),
+    (0.00734, 1, (-1, 1, 0, 0)), (-0.00515, 1, (1, 1, 0, 0)), (0.00209, 2, (2, 0, 0, 0)), (-0.00111, 0, (0, 1, -2, 0)),
+    (-0.00057, 0, (0, 1, 2, 0)), (0.00056, 1, (1, 2, 0, 0)), (-0.00042, 0, (0, 3, 0, 0)), (0.00042, 1, (1, 0, 2, 0)),
+    (0.00038, 1, (1, 0, -2, 0)), (-0.00024, 1, (-1, 2, 0, 0)), (-0.00017, 0, (0, 0, 0, 1)), (-0.00007, 0, (2, 1, 0, 0)),
+    (0.00004, 0, (0, 2, -2, 0)), (0.00004, 0, (3, 0, 0, 0)), (0.00003, 0, (1, 1, -2, 0)), (0.00003, 0, (0, 2, 2, 0)),
+    (-0.00003, 0, (1, 1, 2, 0)), (0.00003, 0, (-1, 1, 2, 0)), (-0.00002, 0, (-1, 1, -2, 0)), (-0.00002, 0, (1, 3, 0, 0)),
+    (0.00002, 0, (0, 4, 0, 0)),
+]
+QUARTER_TERMS = [
+    (-0.62801, 0, (0, 1, 0, 0)), (0.17172, 1, (1, 0, 0, 0)), (-0.01183, 1, (1, 1, 0, 0)), (0.00862, 0, (0, 2, 0, 0)),
+    (0.00804, 0, (0, 0, 2, 0)), (0.00454, 1, (-1, 1, 0, 0)), (0.00204, 2, (2, 0, 0, 0)), (-0.00180, 0, (0, 1, -2, 0)),
+    (-0.00070, 0, (0, 1, 2, 0)), (-0.00040, 0, (0, 3, 0, 0)), (-0.00034, 1, (-1, 2, 0, 0)), (0.00032, 1, (1, 0, 2, 0)),
+    (0.00032, 1, (1, 0, -2, 0)), (-0.00028, 2, (2, 1, 0, 0)), (0.00027, 1, (1, 2, 0, 0)), (-0.00017, 0, (0, 0, 0, 1)),
+    (-0.00005, 0, (-1, 1, -2, 0)), (0.00004, 0, (0, 2, 2, 0)), (-0.00004, 0, (1, 1, 2, 0)), (0.00004, 0, (-2, 1, 0, 0)),
+    (0.00003, 0, (1, 1, -2, 0)), (0.00003, 0, (3, 0, 0, 0)), (0.00002, 0, (0, 2, -2, 0)), (0.00002, 0, (-1, 1, 2, 0)),
+    (-0.00002, 0, (1, 3, 0, 0)),
+]
+# Planetary arguments (constant, per lunation) and coefficients of the additional corrections
+PLANETARY_TERMS = [
+    (299.77, 0.107408, 0.000325), (251.88, 0.016321, 0.000165), (251.83, 26.651886, 0.000164),
+    (349.42, 36.412478, 0.000126), (84.66, 18.206239, 0.000110), (141.74, 53.303771, 0.000062),
+    (207.14, 2.453732, 0.000060), (154.84, 7.306860, 0.000056), (34.52, 27.261239, 0.000047),
+    (207.19, 0.121824, 0.000042), (291.34, 1.844379, 0.000040), (161.72, 24.198154, 0.000037),
+    (239.56, 25.513099, 0.000035), (331.55, 3.592518, 0.000023),
+]
+
+def moon_phase_jde(k):
+    """JDE of the moon phase k lunations after the new moon of 6 January 2000 (k + 0.25 first quarter, ...)."""
+    t = k / 1236.85
+    jde = 2451550.09766 + 29.530588861 * k + 0.00015437 * t ** 2 - 0.000000150 * t ** 3 + 0.00000000073 * t ** 4
+    e = 1 - 0.002516 * t - 0.0000074 * t ** 2
+    m = 2.5534 + 29.10535670 * k - 0.0000014 * t ** 2 - 0.00000011 * t ** 3
+    m1 = 201.5643 + 385.81693528 * k + 0.0107582 * t ** 2 + 0.00001238 * t ** 3 - 0.000000058 * t ** 4
+    f = 160.7108 + 390.67050284 * k - 0.0016118 * t ** 2 - 0.00000227 * t ** 3 + 0.000000011 * t ** 4
+    omega = 124.7746 - 1.56375588 * k + 0.0020672 * t ** 2 + 0.00000215 * t ** 3
+
+    phase = round((k % 1) * 4) % 4
+    terms = {0: NEW_MOON_TERMS, 2: FULL_MOON_TERMS}.get(phase, QUARTER_TERMS)
+    for coefficient, e_power, (a, b, c, d) in terms:
+        jde += coefficient * e ** e_power * _sin(a * m + b * m1 + c * f + d * omega)
+    if phase in (1, 3):
+        w = (0.00306 - 0.00038 * e * _cos(m) + 0.00026 * _cos(m1) - 0.00002 * _cos(m1 - m)
+             + 0.00002 * _cos(m1 + m) + 0.00002 * _cos(2 * f))
+        jde += w if phase == 1 else -w
+
+    planetary = [(299.77 + 0.107408 * k - 0.009173 * t ** 2, PLANETARY_TERMS[0][2])]
+    planetary += [(constant + rate * k, coefficient) for constant, rate, coefficient in PLANETARY_TERMS[1:]]
+    return jde + sum(coefficient * _sin(argument) for argument, coefficient in planetary)
+
+# Mean equinox/solstice polynomials for 1000-3000 (Meeus 27), March, June, September, December
+SEASON_POLYNOMIALS = [
+    (2451623.80984, 365242.37404, 0.05169, -0.00411, -0.00057),
+    (2451716.56767, 365241.62603, 0.00325, 0.00888, -0.00030),
+    (2451810.21715, 365242.01767, -0.11575, 0.00337, 0.00078),
+    (2451900.05952, 365242.74049, -0.06223, -0.00823, 0.00032),
+]
+SEASON_TERMS = [
+    (485, 324.96, 1934.136), (203, 337.23, 32964.467), (199, 342.08, 20.186), (182, 27.85, 445267.112),
+    (156, 73.14, 45036.886), (136, 171.52, 22518.443), (77, 222.54, 65928.934), (74, 296.72, 3034.906),
+    (70, 243.58, 9037.513), (58, 119.81, 33718.147), (52, 297.17, 150.678), (50, 21.02, 2281.226),
+    (45, 247.54, 29929.562), (44, 325.15, 31555.956), (29, 60.93, 4443.417), (18, 155.12, 67555.328),
+    (17, 288.79, 4562.452), (16, 198.04, 62894.029), (14, 199.76, 31436.921), (12, 95.39, 14577.848),
+    (12, 287.11, 31931.756), (12, 320.81, 34777.259), (9, 227.73, 1222.114), (8, 15.45, 16859.074),
+]
+
+def season_jde(year, season):
+    """JDE of the March equinox (season 0), June solstice (1), September equinox (2) or December solstice (3)."""
+    y = (year - 2000) / 1000
+    a, b, c, d, e = SEASON_POLYNOMIALS[season]
+    jde0 = a + b * y + c * y ** 2 + d * y ** 3 + e * y ** 4
+    t = (jde0 - 2451545.0) / 36525
+    w = 35999.373 * t - 2.47
+    dlambda = 1 + 0.0334 * _cos(w) + 0.0007 * _cos(2 * w)
+    s = sum(amplitude * _cos(phase + speed * t) for amplitude, phase, speed in SEASON_TERMS)
+    return jde0 + 0.00001 * s / dlambda
+
+def compute_events(first_year=FIRST_YEAR, last_year=LAST_YEAR, tz_name=TABLE_TIMEZONE):
+    """Returns {year: sorted [(month, day, kind index)]} computed with Meeus' algorithms, as local dates."""
+    from zoneinfo import ZoneInfo
+
+    tz = ZoneInfo(tz_name)
+    events = {year: [] for year in range(first_year, last_year + 1)}
+
+    def add(jde, kind):
+        moment = jde_to_utc(jde).astimezone(tz)
+        if moment.year in events:
+            events[moment.year].append((moment.month, moment.day, kind))
+
+    # Lunations from a little before the first year to a little after the last one
+    first_k = math.floor((first_year - 2000) * 12.3685) - 2
+    last_k = math.ceil((last_year + 1 - 2000) * 12.3685) + 2
+    for k in range(first_k, last_k + 1):
+        for phase in range(MOON_KINDS):
+            add(moon_phase_jde(k + phase / 4), phase)
+    for year in range(first_year, last_year + 1):
+        for season in range(4):
+            add(season_jde(year, season), MOON_KINDS + season)
+
+    return {year: sorted(year_events) for year, year_events in events.items()}
+
+def build_table(path=TABLE_PATH, first_year=FIRST_YEAR, last_year=LAST_YEAR, tz_name=TABLE_TIMEZONE):
+    """Compute the events and write the binary table. Returns the number of records."""
+    events = compute_events(first_year, last_year, tz_name)
+    index = []
+    records = bytearray()
+    for year in range(first_year, last_year + 1):
+        index.append(len(records) // RECORD.size)
+        for record in events[year]:
+            records += RECORD.pack(*record)
+    index.append(len(records) // RECORD.size)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(TABLE_MAGIC, TABLE_VERSION, first_year, last_year))
+        for offset in index:
+            f.write(INDEX_ENTRY.pack(offset))
+        f.write(records)
+    os.replace(tmp_path, path)
+    return index[-1]
+
+# --- Lookups ---
+
+def load_table(path=TABLE_PATH):
+    """Map the table into memory (once). Returns (mmap, first year, last year)."""
+    global _table
+
+    if _table is None:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, first_year, last_year = HEADER.unpack_from(data, 0)
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise ValueError(f"{path} is not an astronomical table of version {TABLE_VERSION}")
+        _table = (data, first_year, last_year)
+    return _table
+
+def year_events(year):
+    """
+    Returns (moon phases, equinoxes and solstices) of a year as
+    ({month: [(day, phase)]}, {month: [day]}). Both are empty outside the table's years.
+    """
+    if year not in _years:
+        data, first_year, last_year = load_table()
+        phases, seasons = {}, {}
+        if first_year <= year <= last_year:
+            index_position = HEADER.size + (year - first_year) * INDEX_ENTRY.size
+            start, end = struct.unpack_from("<HH", data, index_position)
+            records_position = HEADER.size + (last_year - first_year + 2) * INDEX_ENTRY.size
+            for month, day, kind in RECORD.iter_unpack(data[records_position + start * RECORD.size:records_position + end * RECORD.size]):
+                if kind < MOON_KINDS:
+                    phases.setdefault(month, []).append((day, EVENT_KINDS[kind]))
+                else:
+                    seasons.setdefault(month, []).append(day)
+        _years[year] = (phases, seasons)
+    return _years[year]
+
+def moon_phases(year):
+    """Moon phases of a year: {month: [(day, 'new' | 'first' | 'full' | 'last')]}."""
+    return year_events(year)[0]
+
+def equinoxes_solstices(year):
+    """Equinox and solstice days of a year: {month: [day]}."""
+    return year_events(year)[1]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the moon phase and equinox table.")
+    parser.add_argument("--build", action="store_true", help=f"compute the table with Meeus' algorithms and write {os.path.basename(TABLE_PATH)}")
+    parser.add_argument("--year", type=int, help="print the events of a year")
+    args = parser.parse_args()
+
+    if args.build:
+        start_time = time.perf_counter()
+        count = build_table()
+        print(f"Wrote {count} events for {FIRST_YEAR}-{LAST_YEAR} to {TABLE_PATH} "
+              f"({os.path.getsize(TABLE_PATH)} bytes) in {time.perf_counter() - start_time:.2f} s")
+    if args.year:
+        phases, seasons = year_events(args.year)
+        for month in range(1, 13):
+            print(f"{month:2d}: {phases.get(month, [])} {seasons.get(month, [])}")
+
+if __name__ == "__main__":
+    main()
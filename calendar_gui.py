@@ -1,60 +1,51 @@
 import dearpygui.dearpygui as dpg
-from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.pagesizes import A2, A3, A4, landscape
 from reportlab.lib.units import cm
 from reportlab.pdfgen import canvas
 from reportlab.lib.colors import red, black, gray
-from calendar import month_name, Calendar
+from calendar import month_name
 from datetime import date, datetime
+from collections import OrderedDict
+from functools import partial
 import os
+import multiprocessing
+import queue
 import tempfile
+import threading
 from PIL import Image
 import io
+import numpy as np
+from font_cache import find_font_files, register_font, string_width
+from create_icons import load_icon_atlas
+from calendar_layout import default_holidays, equinoxes_solstices, moon_phases, default_birthdays, month_layout
+from ics_import import load_event_index
 
-# Default holidays (Romanian legal holidays - non-working days)
-default_holidays = {
-    1: [1, 2, 6, 7, 24],  # 1-2 Jan: New Year's Day | 6 Jan: Epiphany | 7 Jan: John the Baptist | 24 Jan: Unification Day
-    2: [],
-    3: [],
-    4: [10, 12, 13],  # Easter 2026: Good Friday (10 Apr), Easter Sunday (12 Apr), Easter Monday (13 Apr)
-    5: [1, 31],  # 1 May: Labour Day | 31 May: Pentecost Sunday
-    6: [1],  # 1 June: Children's Day + Pentecost Monday
-    7: [],
-    8: [15],  # 15 Aug: Assumption of Mary
-    9: [],
-    10: [],
-    11: [30],  # 30 Nov: Saint Andrew's Day
-    12: [1, 25, 26]  # 1 Dec: National Day | 25-26 Dec: Christmas
-}
+# Sidebar icons and their atlas
+ICONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "icons")
 
-# Astronomical events (equinoxes and solstices)
-equinoxes_solstices = {
-    3: [20],  # Spring Equinox
-    6: [21],  # Summer Solstice
-    9: [23],  # Autumn Equinox
-    12: [21]  # Winter Solstice
-}
+# Preview rasterization: a quick draft first, then the full-quality image
+PREVIEW_DRAFT_DPI = 40
 
-# Moon phases for 2026 (main phases)
-moon_phases = {
-    1: [(3, 'new'), (10, 'first'), (18, 'full'), (25, 'last')],  # New, First Q, Full, Last Q
-    2: [(1, 'new'), (9, 'first'), (16, 'full'), (24, 'last')],
-    3: [(3, 'new'), (11, 'first'), (18, 'full'), (25, 'last')],
-    4: [(1, 'new'), (9, 'first'), (16, 'full'), (24, 'last')],
-    5: [(1, 'new'), (9, 'first'), (16, 'full'), (23, 'last'), (30, 'new')],
-    6: [(7, 'first'), (14, 'full'), (22, 'last'), (29, 'new')],
-    7: [(7, 'first'), (14, 'full'), (21, 'last'), (28, 'new')],
-    8: [(5, 'first'), (12, 'full'), (20, 'last'), (27, 'new')],
-    9: [(4, 'first'), (11, 'full'), (18, 'last'), (25, 'new')],
-    10: [(3, 'first'), (10, 'full'), (18, 'last'), (25, 'new')],
-    11: [(2, 'first'), (9, 'full'), (16, 'last'), (23, 'new')],
-    12: [(1, 'first'), (8, 'full'), (16, 'last'), (23, 'new'), (30, 'first')]
-}
+# The full-quality preview is rendered at the width it is shown at, and again
+# when its window is resized by more than this fraction
+PREVIEW_RESIZE_THRESHOLD = 0.15
+# Space around the preview image inside its window, in pixels
+PREVIEW_WINDOW_PADDING = (50, 100)
 
-# Default birthdays (empty by default, user can add custom birthdays)
-default_birthdays = {
-    1: [], 2: [], 3: [], 4: [], 5: [], 6: [],
-    7: [], 8: [], 9: [], 10: [], 11: [], 12: []
-}
+# GPU memory for preview textures, including recent previews kept for comparison (bytes)
+PREVIEW_TEXTURE_BUDGET = 160 * 1024 * 1024
+
+# Pool key of the texture shown in each preview window, and a counter to drop stale renders
+_preview_keys = {}
+_preview_generation = 0
+# Time each preview generation was started, shown in the compare list
+_preview_times = {}
+
+# Shown previews (kept with their PDF for re-rendering on resize): index -> preview tuple
+_preview_pages = {}
+
+# Pixel buffers of raw textures, kept alive while Dear PyGui displays them
+_texture_buffers = {}
 
 def draw_cutting_border(c, x, y, width, height):
     """
@@ -67,13 +58,104 @@ def draw_cutting_border(c, x, y, width, height):
     c.setDash()  # Reset to solid line
     c.setStrokeColorRGB(0, 0, 0)  # Black color
 
-def draw_calendar(c, year, month, x, y, width_offset, height_offset, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8)):
+def draw_centred_text(c, x, y, text, font):
+    """
+    Draws a string centred on x, like drawCentredString, using the cached string width.
+    """
+    c.drawString(x - string_width(text, font[0], font[1]) / 2, y, text)
+
+# Horizontal shift of the weekday columns, in cm
+DAY_COLUMN_OFFSET = -0.1
+
+def day_position(x, y, width_offset, height_offset, row, column):
+    """Baseline centre of a day number for a grid row (0 = first week) and weekday column."""
+    return (x + width_offset + (column + DAY_COLUMN_OFFSET) * cm,
+            y + height_offset + (8 - row) * 0.7 * cm)
+
+def month_days_with_positions(year, month, x, y, width_offset, height_offset):
+    """Yields (day, column, day_x, day_y) for every day of the month."""
+    for row, (week_number, week) in enumerate(month_layout(year, month)):
+        for column, day in enumerate(week):
+            if day != 0:
+                day_x, day_y = day_position(x, y, width_offset, height_offset, row, column)
+                yield day, column, day_x, day_y
+
+def draw_equinox_markers(c, year, month, x, y, width_offset, height_offset, day_font=("Helvetica-Bold", 11), equinox_circle_color=(0, 0.5, 1)):
+    """
+    Draws circles around the equinoxes and solstices of a month.
+    """
+    for day, column, day_x, day_y in month_days_with_positions(year, month, x, y, width_offset, height_offset):
+        if day in equinoxes_solstices(year).get(month, []):
+            circle_y = day_y + 0.15 * cm  # Moved up by 1.5mm
+            circle_radius = (0.35 * cm - 0.07 * cm) * (day_font[1] / 11)  # Reduced by 0.7mm and scale with font size
+            
+            c.setStrokeColorRGB(equinox_circle_color[0], equinox_circle_color[1], equinox_circle_color[2])
+            c.setLineWidth(1.5)
+            c.circle(day_x, circle_y, circle_radius, stroke=1, fill=0)
+
+def draw_moon_phase_markers(c, year, month, x, y, width_offset, height_offset, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10):
+    """
+    Draws the moon phase symbols of a month next to the day numbers.
+    """
+    month_moon_phases = {day: phase_type for day, phase_type in moon_phases(year).get(month, [])}
+    for day, column, day_x, day_y in month_days_with_positions(year, month, x, y, width_offset, height_offset):
+        if day in month_moon_phases:
+            phase_type = month_moon_phases[day]
+            moon_x = day_x + 0.38 * cm + 0.1 * cm
+            moon_y = day_y + 0.25 * cm
+            radius = moon_phase_size / 2.8  # Convert font size to radius
+            
+            c.setStrokeColorRGB(moon_phase_color[0], moon_phase_color[1], moon_phase_color[2])
+            c.setFillColorRGB(moon_phase_color[0], moon_phase_color[1], moon_phase_color[2])
+            c.setLineWidth(1)
+            
+            if phase_type == 'new':  # New moon - filled circle
+                c.circle(moon_x, moon_y, radius, stroke=1, fill=1)
+            elif phase_type == 'full':  # Full moon - empty circle
+                c.circle(moon_x, moon_y, radius, stroke=1, fill=0)
+            elif phase_type == 'first':  # First quarter - right half filled
+                c.circle(moon_x, moon_y, radius, stroke=1, fill=0)
+                # Fill right half
+                path = c.beginPath()
+                path.moveTo(moon_x, moon_y - radius)
+                path.lineTo(moon_x, moon_y + radius)
+                path.arcTo(moon_x - radius, moon_y - radius, moon_x + radius, moon_y + radius, 270, 180)
+                c.drawPath(path, stroke=0, fill=1)
+            elif phase_type == 'last':  # Last quarter - left half filled
+                c.circle(moon_x, moon_y, radius, stroke=1, fill=0)
+                # Fill left half
+                path = c.beginPath()
+                path.moveTo(moon_x, moon_y - radius)
+                path.lineTo(moon_x, moon_y + radius)
+                path.arcTo(moon_x - radius, moon_y - radius, moon_x + radius, moon_y + radius, 90, 180)
+                c.drawPath(path, stroke=0, fill=1)
+
+def draw_birthday_markers(c, year, month, x, y, width_offset, height_offset, month_birthdays, day_font=("Helvetica-Bold", 11), birthday_square_color=(1, 0.75, 0.8)):
+    """
+    Draws squares around the birthdays of a month.
+    """
+    for day, column, day_x, day_y in month_days_with_positions(year, month, x, y, width_offset, height_offset):
+        if day in month_birthdays:
+            square_y = day_y + 0.1 * cm  # Moved 1mm up
+            square_width = (0.35 * cm) * (day_font[1] / 11)  # Scale with font size
+            square_height = (0.28 * cm) * (day_font[1] / 11)  # Slightly shorter height
+            
+            c.setStrokeColorRGB(birthday_square_color[0], birthday_square_color[1], birthday_square_color[2])
+            c.setLineWidth(1.5)
+            c.rect(day_x - square_width, square_y - square_height, 
+                   square_width * 2, square_height * 2, stroke=1, fill=0)
+
+def draw_calendar(c, year, month, x, y, width_offset, height_offset, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8), cell_bg_colors=None):
     """
     Draws the calendar for a specific month.
+    cell_bg_colors ({day: color}) overrides the background of single day cells (e.g. a heatmap).
     """
-    cal = Calendar()
-    month_days = cal.monthdayscalendar(year, month)
+    # Lets a canvas proxy (canvas_stats.CountingCanvas) attribute the drawing to the month
+    if hasattr(c, "begin_month"):
+        c.begin_month(year, month)
+    
     month_name_str = month_name[month]
+    month_holidays = holidays_dict.get(month, [])
     
     # Draw background
     c.setFillColorRGB(bg_color[0], bg_color[1], bg_color[2])
@@ -82,47 +164,41 @@ def draw_calendar(c, year, month, x, y, width_offset, height_offset, holidays_di
     c.setLineWidth(1)
     c.setFont(month_font[0], month_font[1])
     c.setFillColorRGB(normal_text_color[0], normal_text_color[1], normal_text_color[2])
-    c.drawCentredString(x + width_offset + 2.5 * cm, y + height_offset + 7 * cm, month_name_str)
+    draw_centred_text(c, x + width_offset + 2.5 * cm, y + height_offset + 7 * cm, month_name_str, month_font)
     
-    add_y_offset = 10
-    add_x_offset = -0.1
-
     c.setFont(day_font[0], day_font[1])
     day_names = ["Mo", "Tue", "We", "Th", "Fr", "Sat", "Sun"]
     for i, day_name in enumerate(day_names):
         c.setFillColorRGB(0.9, 0.9, 0.9)
         c.setLineWidth(0)
         c.setFillColorRGB(normal_text_color[0], normal_text_color[1], normal_text_color[2])
-        c.drawCentredString(x + width_offset + (i + add_x_offset) * cm, y + (height_offset+10) + 6 * cm, day_name)
+        draw_centred_text(c, x + width_offset + (i + DAY_COLUMN_OFFSET) * cm, y + (height_offset+10) + 6 * cm, day_name, day_font)
 
-    week_num = 1
-    for week in month_days:
-        first_day_of_week = next((day for day in week if day != 0), None)
-        if first_day_of_week:
-            week_number = date(year, month, first_day_of_week).isocalendar()[1]
-        
+    # Day cells scale with the font size
+    cell_width = 0.95 * cm * (day_font[1] / 11)
+    cell_height = 0.65 * cm * (day_font[1] / 11)
+    
+    for row, (week_number, week) in enumerate(month_layout(year, month)):
         # Draw day backgrounds first
         for i, day in enumerate(week):
             if day != 0:
                 # Determine background color and draw it
                 day_bg_color = bg_color  # default
-                if highlight_holidays and day in holidays_dict.get(month, []):
+                if cell_bg_colors and day in cell_bg_colors:
+                    day_bg_color = cell_bg_colors[day]
+                elif highlight_holidays and day in month_holidays:
                     day_bg_color = holiday_bg_color
                 elif i == 5 or i == 6:  # Saturday or Sunday
                     day_bg_color = weekend_bg_color
                 
-                # Draw day background - scale with font size
-                cell_width = 0.95 * cm * (day_font[1] / 11)  # Scale based on font size
-                cell_height = 0.65 * cm * (day_font[1] / 11)
-                cell_x = x + width_offset + (i + add_x_offset) * cm - cell_width / 2
-                cell_y = y + (height_offset) + (9 - week_num) * 0.7 * cm - cell_height / 2
+                day_x, day_y = day_position(x, y, width_offset, height_offset, row, i)
                 c.setFillColorRGB(day_bg_color[0], day_bg_color[1], day_bg_color[2])
-                c.rect(cell_x, cell_y, cell_width, cell_height, fill=1, stroke=0)
+                c.rect(day_x - cell_width / 2, day_y - cell_height / 2, cell_width, cell_height, fill=1, stroke=0)
         
         # Draw week number (after backgrounds so it's not covered)
-        if show_week_numbers and first_day_of_week:
+        if show_week_numbers and week_number:
             week_num_x = x + width_offset - 1.6 * cm  # Moved further left
-            week_num_y = y + (height_offset) + (9 - week_num) * 0.7 * cm
+            week_num_y = day_position(x, y, width_offset, height_offset, row, 0)[1]
             
             # Draw week number background
             c.setFillColorRGB(week_num_bg_color[0], week_num_bg_color[1], week_num_bg_color[2])
@@ -136,7 +212,7 @@ def draw_calendar(c, year, month, x, y, width_offset, height_offset, holidays_di
         for i, day in enumerate(week):
             if day != 0:
                 # Determine text color
-                if highlight_holidays and day in holidays_dict.get(month, []):
+                if highlight_holidays and day in month_holidays:
                     c.setFillColor(red)
                 elif i == 5:  # Saturday
                     c.setFillColor(gray)
@@ -144,478 +220,1082 @@ def draw_calendar(c, year, month, x, y, width_offset, height_offset, holidays_di
                     c.setFillColor(red)
                 else:
                     c.setFillColorRGB(normal_text_color[0], normal_text_color[1], normal_text_color[2])
-                c.drawCentredString(x + width_offset + (i + add_x_offset) * cm, y + (height_offset) + (9 - week_num) * 0.7 * cm, str(day))
-        week_num += 1
+                day_x, day_y = day_position(x, y, width_offset, height_offset, row, i)
+                draw_centred_text(c, day_x, day_y, str(day), day_font)
     
     # Draw circles around equinoxes and solstices (on top of everything)
     if show_equinoxes:
-        week_num = 1
-        for week in month_days:
-            for i, day in enumerate(week):
-                if day != 0 and day in equinoxes_solstices.get(month, []):
-                    circle_x = x + width_offset + (i + add_x_offset) * cm
-                    circle_y = y + (height_offset) + (9 - week_num) * 0.7 * cm + 0.15 * cm  # Moved up by 1.5mm
-                    circle_radius = (0.35 * cm - 0.07 * cm) * (day_font[1] / 11)  # Reduced by 0.7mm and scale with font size
-                    
-                    c.setStrokeColorRGB(equinox_circle_color[0], equinox_circle_color[1], equinox_circle_color[2])
-                    c.setLineWidth(1.5)
-                    c.circle(circle_x, circle_y, circle_radius, stroke=1, fill=0)
-            week_num += 1
+        draw_equinox_markers(c, year, month, x, y, width_offset, height_offset, day_font, equinox_circle_color)
     
     # Draw moon phase symbols (on top of everything)
     if show_moon_phases:
-        month_moon_phases = {day: phase_type for day, phase_type in moon_phases.get(month, [])}
-        week_num = 1
-        for week in month_days:
-            for i, day in enumerate(week):
-                if day != 0 and day in month_moon_phases:
-                    phase_type = month_moon_phases[day]
-                    moon_x = x + width_offset + (i + add_x_offset) * cm + 0.38 * cm + 0.1 * cm
-                    moon_y = y + (height_offset) + (9 - week_num) * 0.7 * cm + 0.25 * cm
-                    radius = moon_phase_size / 2.8  # Convert font size to radius
-                    
-                    c.setStrokeColorRGB(moon_phase_color[0], moon_phase_color[1], moon_phase_color[2])
-                    c.setFillColorRGB(moon_phase_color[0], moon_phase_color[1], moon_phase_color[2])
-                    c.setLineWidth(1)
-                    
-                    if phase_type == 'new':  # New moon - filled circle
-                        c.circle(moon_x, moon_y, radius, stroke=1, fill=1)
-                    elif phase_type == 'full':  # Full moon - empty circle
-                        c.circle(moon_x, moon_y, radius, stroke=1, fill=0)
-                    elif phase_type == 'first':  # First quarter - right half filled
-                        c.circle(moon_x, moon_y, radius, stroke=1, fill=0)
-                        # Fill right half
-                        path = c.beginPath()
-                        path.moveTo(moon_x, moon_y - radius)
-                        path.lineTo(moon_x, moon_y + radius)
-                        path.arcTo(moon_x - radius, moon_y - radius, moon_x + radius, moon_y + radius, 270, 180)
-                        c.drawPath(path, stroke=0, fill=1)
-                    elif phase_type == 'last':  # Last quarter - left half filled
-                        c.circle(moon_x, moon_y, radius, stroke=1, fill=0)
-                        # Fill left half
-                        path = c.beginPath()
-                        path.moveTo(moon_x, moon_y - radius)
-                        path.lineTo(moon_x, moon_y + radius)
-                        path.arcTo(moon_x - radius, moon_y - radius, moon_x + radius, moon_y + radius, 90, 180)
-                        c.drawPath(path, stroke=0, fill=1)
-            week_num += 1
+        draw_moon_phase_markers(c, year, month, x, y, width_offset, height_offset, moon_phase_color, moon_phase_size)
     
     # Draw squares around birthdays (on top of everything)
     if show_birthdays:
-        month_birthdays = birthdays_dict.get(month, [])
-        week_num = 1
-        for week in month_days:
-            for i, day in enumerate(week):
-                if day != 0 and day in month_birthdays:
-                    square_x = x + width_offset + (i + add_x_offset) * cm
-                    square_y = y + (height_offset) + (9 - week_num) * 0.7 * cm + 0.1 * cm  # Moved 1mm up
-                    square_width = (0.35 * cm) * (day_font[1] / 11)  # Scale with font size
-                    square_height = (0.28 * cm) * (day_font[1] / 11)  # Slightly shorter height
-                    
-                    c.setStrokeColorRGB(birthday_square_color[0], birthday_square_color[1], birthday_square_color[2])
-                    c.setLineWidth(1.5)
-                    c.rect(square_x - square_width, square_y - square_height, 
-                           square_width * 2, square_height * 2, stroke=1, fill=0)
-            week_num += 1
+        draw_birthday_markers(c, year, month, x, y, width_offset, height_offset, birthdays_dict.get(month, []), day_font, birthday_square_color)
     
     c.setFillColorRGB(normal_text_color[0], normal_text_color[1], normal_text_color[2])  # Reset color
+    
+    if hasattr(c, "end_month"):
+        c.end_month()
 
-def create_calendar_pdf(filename, year, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8)):
+def draw_year_title(c, year, month_font=("Helvetica-Bold", 12), normal_text_color=(0, 0, 0)):
     """
-    Creates a PDF file with the calendar for a specific year (4 months per page).
+    Draws the year at the top of a landscape A4 sheet.
+    """
+    width, height = landscape(A4)
+    c.setFont(month_font[0], 18)
+    c.setFillColorRGB(normal_text_color[0], normal_text_color[1], normal_text_color[2])
+    draw_centred_text(c, width / 2, height - 0.5 * cm, str(year), (month_font[0], 18))
+
+def office_page_positions(first_month):
+    """
+    Positions of the months on a 4 months/page A4 sheet starting at first_month,
+    as (month, x, y, width_offset, height_offset) tuples.
     """
-    c = canvas.Canvas(filename, pagesize=A4)
     width, height = A4
+    inner_x = (width - 16.5 * cm) / 2
+    inner_y = (height - 1 * cm) / 2
+    
+    # Left column (2 months), then right column (2 months)
+    offsets = [(0, 5.7 * cm), (0, 0), (10 * cm, 5.7 * cm), (10 * cm, 0)]
+    return [(first_month + k, inner_x, inner_y, width_offset, height_offset)
+            for k, (width_offset, height_offset) in enumerate(offsets) if first_month + k <= 12]
+
+def office_cutting_borders():
+    """Cutting borders (x, y, width, height) of a 4 months/page A4 sheet, 10 cm x 13 cm each."""
+    width, height = A4
+    inner_x = (width - 16.5 * cm) / 2
+    inner_y = (height - 1 * cm) / 2
     
-    # Border dimensions: 10 cm x 13 cm
     border_width = 10 * cm
     border_height = 13 * cm
-    
-    for month in range(1, 13, 4):
-        c.setLineWidth(1)
-        inner_x = (width - 16.5 * cm) / 2
-        inner_y = (height - 1 * cm) / 2
-        
-        # Calculate border positions for left column (2 months)
-        left_border_x = inner_x - 2.0 * cm
-        left_border_y = inner_y + 0.7 * cm
-        
-        # Calculate border positions for right column (2 months)
-        right_border_x = inner_x + 10 * cm - 2.0 * cm
-        right_border_y = inner_y + 0.7 * cm
+    return [
+        (inner_x - 2.0 * cm, inner_y + 0.7 * cm, border_width, border_height),  # Left column
+        (inner_x + 10 * cm - 2.0 * cm, inner_y + 0.7 * cm, border_width, border_height),  # Right column
+    ]
 
-        # Draw calendars first
-        draw_calendar(c, year, month, inner_x, inner_y, 0, 5.7 * cm, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-        
-        if month + 1 <= 12:
-            draw_calendar(c, year, month + 1, inner_x, inner_y, 0, 0, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-        
-        if month + 2 <= 12:
-            draw_calendar(c, year, month + 2, inner_x, inner_y, 10 * cm, 5.7 * cm, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-        
-        if month + 3 <= 12:
-            draw_calendar(c, year, month + 3, inner_x, inner_y, 10 * cm, 0, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
+def full_year_positions():
+    """
+    Positions of all 12 months on a landscape A4 sheet, as (month, x, y, width_offset, height_offset) tuples.
+    """
+    width, height = landscape(A4)
+    x_offsets = [2 * cm, 12 * cm, 22 * cm]
+    y_offsets = [height - 8.5 * cm - i * 5 * cm for i in range(4)]
+    return [(row * 3 + column + 1, x_offset, y_offset, 13, 12)
+            for row, y_offset in enumerate(y_offsets) for column, x_offset in enumerate(x_offsets)]
 
-        # Draw cutting borders on top (after all calendars)
-        draw_cutting_border(c, left_border_x, left_border_y, border_width, border_height)
-        draw_cutting_border(c, right_border_x, right_border_y, border_width, border_height)
+def draw_office_page(c, year, first_month, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8)):
+    """
+    Draws one 4 months/page A4 sheet, starting at first_month.
+    """
+    c.setLineWidth(1)
+    
+    # Draw calendars first
+    for page_month, month_x, month_y, width_offset, height_offset in office_page_positions(first_month):
+        draw_calendar(c, year, page_month, month_x, month_y, width_offset, height_offset, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
+    
+    # Draw cutting borders on top (after all calendars)
+    for border_x, border_y, border_width, border_height in office_cutting_borders():
+        draw_cutting_border(c, border_x, border_y, border_width, border_height)
 
+def draw_full_year_page(c, year, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8), cell_bg_colors={}):
+    """
+    Draws all months of a year on one landscape A4 sheet.
+    cell_bg_colors ({month: {day: color}}) overrides day cell backgrounds, see draw_calendar.
+    """
+    draw_year_title(c, year, month_font, normal_text_color)
+    
+    for month, month_x, month_y, width_offset, height_offset in full_year_positions():
+        draw_calendar(c, year, month, month_x, month_y, width_offset, height_offset, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color, cell_bg_colors.get(month))
+
+def create_calendar_pdf(filename, year, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8), canvas_class=canvas.Canvas):
+    """
+    Creates a PDF file with the calendar for a specific year (4 months per page).
+    canvas_class creates the canvas (e.g. a counting proxy, see canvas_stats.py).
+    """
+    c = canvas_class(filename, pagesize=A4)
+    
+    for month in range(1, 13, 4):
+        draw_office_page(c, year, month, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
         c.showPage()
     
     c.save()
 
-def create_full_year_calendar_pdf(filename, year, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8)):
+def create_full_year_calendar_pdf(filename, year, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8), canvas_class=canvas.Canvas):
     """
     Creates a PDF file with all months of a year on a single A4 sheet.
+    canvas_class creates the canvas (e.g. a counting proxy, see canvas_stats.py).
     """
-    c = canvas.Canvas(filename, pagesize=landscape(A4))
-    width, height = landscape(A4)
+    c = canvas_class(filename, pagesize=landscape(A4))
     
-    c.setFont(month_font[0], 18)
-    c.setFillColorRGB(normal_text_color[0], normal_text_color[1], normal_text_color[2])
-    c.drawCentredString(width / 2, height - 0.5 * cm, str(year))
-    
-    x_offsets = [2 * cm, 12 * cm, 22 * cm]
-    y_offsets = [height - 8.5 * cm - i * 5 * cm for i in range(4)]
-
-    month = 1
-    for y_offset in y_offsets:
-        for x_offset in x_offsets:
-            if month <= 12:
-                draw_calendar(c, year, month, x_offset, y_offset, 13, 12, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-                month += 1
+    draw_full_year_page(c, year, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
 
     c.save()
 
-def preview_calendar_callback():
-    """Callback function for previewing calendar."""
-    year = dpg.get_value("year_input")
-    format_type = dpg.get_value("format_combo")
+# Wall planner page sizes (landscape) by name
+PLANNER_PAGE_SIZES = {"A3": landscape(A3), "A2": landscape(A2)}
+
+# Weekday labels in the wall planner cells
+PLANNER_DAY_NAMES = ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
+
+# Cell grids of the wall planner, computed once per page size
+_planner_geometries = {}
+
+def planner_geometry(page_size):
+    """
+    Cell grid of a wall planner page (one row per month, 31 day columns), in points.
+    Sizes scale with the page width, so A2 is A3 enlarged. Returns a dict with
+    the scale, the month label column x, the left x of every day column and the
+    bottom y of every month row.
+    """
+    if page_size not in _planner_geometries:
+        width, height = page_size
+        scale = width / landscape(A3)[0]
+        margin = 1 * cm * scale
+        label_width = 2.4 * cm * scale
+        title_height = 1.4 * cm * scale
+        header_height = 0.7 * cm * scale
+        cell_width = (width - 2 * margin - label_width) / 31
+        cell_height = (height - 2 * margin - title_height - header_height) / 12
+        grid_top = height - margin - title_height - header_height
+        _planner_geometries[page_size] = {
+            "scale": scale,
+            "width": width,
+            "height": height,
+            "label_x": margin,
+            "title_y": height - margin - title_height / 2,
+            "header_y": grid_top + header_height / 3,
+            "cell_width": cell_width,
+            "cell_height": cell_height,
+            "grid_left": margin + label_width,
+            "grid_top": grid_top,
+            "columns": [margin + label_width + i * cell_width for i in range(31)],
+            "rows": [grid_top - (i + 1) * cell_height for i in range(12)],
+        }
+    return _planner_geometries[page_size]
+
+def mix_colors(color, other, amount):
+    """Color blended towards other by amount (0-1)."""
+    return tuple(a + (b - a) * amount for a, b in zip(color, other))
+
+def draw_rect_batch(c, color, rects):
+    """Fills rectangles (x, y, width, height) of one color as a single path."""
+    path = c.beginPath()
+    for rect in rects:
+        path.rect(*rect)
+    c.setFillColorRGB(color[0], color[1], color[2])
+    c.drawPath(path, stroke=0, fill=1)
+
+def draw_text_batch(c, font_name, font_size, color, strings):
+    """Draws strings (x, y, text) of one font and color in a single text object."""
+    text = c.beginText()
+    text.setFont(font_name, font_size)
+    text.setFillColorRGB(color[0], color[1], color[2])
+    for x, y, string in strings:
+        text.setTextOrigin(x, y)
+        text.textOut(string)
+    c.drawText(text)
+
+def draw_wall_planner_page(c, year, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8), page_size=landscape(A3)):
+    """
+    Draws a wall planner: one row per month, one column per day of the month.
+    Weekends, holidays and birthdays are shaded, Mondays carry the week number.
     
-    # Get font settings
-    font_family = dpg.get_value("font_family")
-    font_style = dpg.get_value("font_style")
-    month_font_size = dpg.get_value("month_font_size")
-    day_font_size = dpg.get_value("day_font_size")
+    About 400 cells per page, so nothing is drawn per cell: the cells are first
+    collected by color and font, then every group is emitted as one path or one
+    text object on precomputed coordinates.
+    """
+    grid = planner_geometry(page_size)
+    scale = grid["scale"]
+    cell_width = grid["cell_width"]
+    cell_height = grid["cell_height"]
+    blank_color = mix_colors(bg_color, normal_text_color, 0.2)
+    grid_color = mix_colors(bg_color, normal_text_color, 0.5)
     
-    # Build font names
-    if font_family == "Times-Roman":
-        font_map = {
-            "Normal": "Times-Roman",
-            "Bold": "Times-Bold",
-            "Italic": "Times-Italic",
-            "Bold-Italic": "Times-BoldItalic"
-        }
-        font_name = font_map[font_style]
-    else:
-        style_suffix = {
-            "Normal": "",
-            "Bold": "-Bold",
-            "Italic": "-Oblique",
-            "Bold-Italic": "-BoldOblique"
-        }
-        font_name = font_family + style_suffix[font_style]
+    day_name_font = (day_font[0], day_font[1] * 0.8 * scale)
+    week_font = (day_font[0], day_font[1] * 0.6 * scale)
+    label_font = (month_font[0], month_font[1] * scale)
+    header_font = (day_font[0], day_font[1] * scale)
+    title_font = (month_font[0], 24 * scale)
     
-    month_font = (font_name, month_font_size)
-    day_font = (font_name, day_font_size)
+    fills = {}  # color -> [(x, y, width, height)]
+    texts = {}  # (font name, size, color) -> [(x, y, text)]
+    equinox_circles = []  # (x, y, radius)
+    moons = []  # (x, y, phase type)
     
-    # Get colors with default values if not yet set
-    bg_rgb = dpg.get_value("bg_color") or (255, 255, 255, 255)
-    bg_color = (bg_rgb[0]/255, bg_rgb[1]/255, bg_rgb[2]/255)
+    def add_text(font, color, x, y, string, centred=False):
+        if centred:
+            x -= string_width(string, font[0], font[1]) / 2
+        texts.setdefault((font[0], font[1], tuple(color)), []).append((x, y, string))
     
-    normal_rgb = dpg.get_value("text_color") or (0, 0, 0, 255)
-    normal_text_color = (normal_rgb[0]/255, normal_rgb[1]/255, normal_rgb[2]/255)
+    add_text(title_font, normal_text_color, grid["width"] / 2, grid["title_y"] - title_font[1] / 3, str(year), centred=True)
+    for day in range(1, 32):
+        add_text(header_font, normal_text_color, grid["columns"][day - 1] + cell_width / 2, grid["header_y"], str(day), centred=True)
     
-    weekend_rgb = dpg.get_value("weekend_bg_color") or (240, 240, 240, 255)
-    weekend_bg_color = (weekend_rgb[0]/255, weekend_rgb[1]/255, weekend_rgb[2]/255)
+    radius = moon_phase_size / 2.8 * scale
+    for month in range(1, 13):
+        # Lets a canvas proxy follow the progress month by month (nothing is drawn yet)
+        if hasattr(c, "begin_month"):
+            c.begin_month(year, month)
+        
+        row_y = grid["rows"][month - 1]
+        row_top = row_y + cell_height
+        add_text(label_font, normal_text_color, grid["label_x"], row_y + cell_height / 2 - label_font[1] / 3, month_name[month])
+        
+        month_holidays = holidays_dict.get(month, []) if highlight_holidays else []
+        month_birthdays = birthdays_dict.get(month, []) if show_birthdays else []
+        month_equinoxes = equinoxes_solstices(year).get(month, []) if show_equinoxes else []
+        month_moon_phases = dict(moon_phases(year).get(month, [])) if show_moon_phases else {}
+        first_weekday = date(year, month, 1).weekday()
+        month_days = (date(year + month // 12, month % 12 + 1, 1) - date(year, month, 1)).days
+        
+        for day in range(1, 32):
+            cell_x = grid["columns"][day - 1]
+            if day > month_days:
+                fills.setdefault(blank_color, []).append((cell_x, row_y, cell_width, cell_height))
+                continue
+            
+            weekday = (first_weekday + day - 1) % 7
+            if day in month_holidays:
+                fills.setdefault(tuple(holiday_bg_color), []).append((cell_x, row_y, cell_width, cell_height))
+            elif day in month_birthdays:
+                fills.setdefault(tuple(birthday_square_color), []).append((cell_x, row_y, cell_width, cell_height))
+            elif weekday >= 5:
+                fills.setdefault(tuple(weekend_bg_color), []).append((cell_x, row_y, cell_width, cell_height))
+            
+            # Same text colors as the day numbers of the month grids
+            if day in month_holidays or weekday == 6:
+                text_color = (1, 0, 0)
+            elif weekday == 5:
+                text_color = (0.5, 0.5, 0.5)
+            else:
+                text_color = normal_text_color
+            text_x = cell_x + 0.12 * cm * scale
+            text_y = row_top - 0.12 * cm * scale - day_name_font[1] * 0.75
+            add_text(day_name_font, text_color, text_x, text_y, PLANNER_DAY_NAMES[weekday])
+            
+            if day in month_equinoxes:
+                text_width = string_width(PLANNER_DAY_NAMES[weekday], day_name_font[0], day_name_font[1])
+                equinox_circles.append((text_x + text_width / 2, text_y + day_name_font[1] * 0.35, day_name_font[1] * 0.8))
+            if day in month_moon_phases:
+                moons.append((cell_x + cell_width - radius - 0.1 * cm * scale, row_top - radius - 0.1 * cm * scale, month_moon_phases[day]))
+            if show_week_numbers and weekday == 0:
+                week_number = date(year, month, day).isocalendar()[1]
+                add_text(week_font, week_num_text_color, text_x, row_y + 0.1 * cm * scale, f"W{week_number}")
+        
+        if hasattr(c, "end_month"):
+            c.end_month()
     
-    holiday_rgb = dpg.get_value("holiday_bg_color") or (255, 230, 230, 255)
-    holiday_bg_color = (holiday_rgb[0]/255, holiday_rgb[1]/255, holiday_rgb[2]/255)
+    # Emit the page: background, cell shading, grid lines, markers, then text
+    c.setFillColorRGB(bg_color[0], bg_color[1], bg_color[2])
+    c.rect(0, 0, grid["width"], grid["height"], fill=1, stroke=0)
+    for color, rects in fills.items():
+        draw_rect_batch(c, color, rects)
     
-    week_num_text_rgb = dpg.get_value("week_num_text_color") or (128, 128, 128, 255)
-    week_num_text_color = (week_num_text_rgb[0]/255, week_num_text_rgb[1]/255, week_num_text_rgb[2]/255)
+    grid_bottom = grid["rows"][-1]
+    grid_right = grid["columns"][-1] + cell_width
+    path = c.beginPath()
+    for row_y in [grid["grid_top"]] + grid["rows"]:
+        path.moveTo(grid["label_x"], row_y)
+        path.lineTo(grid_right, row_y)
+    for column_x in grid["columns"] + [grid_right]:
+        path.moveTo(column_x, grid_bottom)
+        path.lineTo(column_x, grid["grid_top"])
+    c.setStrokeColorRGB(grid_color[0], grid_color[1], grid_color[2])
+    c.setLineWidth(0.5 * scale)
+    c.drawPath(path, stroke=1, fill=0)
     
-    week_num_bg_rgb = dpg.get_value("week_num_bg_color") or (255, 255, 255, 255)
-    week_num_bg_color = (week_num_bg_rgb[0]/255, week_num_bg_rgb[1]/255, week_num_bg_rgb[2]/255)
+    if equinox_circles:
+        path = c.beginPath()
+        for circle_x, circle_y, circle_radius in equinox_circles:
+            path.circle(circle_x, circle_y, circle_radius)
+        c.setStrokeColorRGB(equinox_circle_color[0], equinox_circle_color[1], equinox_circle_color[2])
+        c.setLineWidth(1.5)
+        c.drawPath(path, stroke=1, fill=0)
     
-    equinox_rgb = dpg.get_value("equinox_circle_color") or (0, 128, 255, 255)
-    equinox_circle_color = (equinox_rgb[0]/255, equinox_rgb[1]/255, equinox_rgb[2]/255)
+    if moons:
+        # Outlines of all phases in one path, the dark parts in another
+        outlines = c.beginPath()
+        shading = c.beginPath()
+        for moon_x, moon_y, phase_type in moons:
+            outlines.circle(moon_x, moon_y, radius)
+            if phase_type == 'new':
+                shading.circle(moon_x, moon_y, radius)
+            elif phase_type in ('first', 'last'):
+                shading.moveTo(moon_x, moon_y - radius)
+                shading.lineTo(moon_x, moon_y + radius)
+                shading.arcTo(moon_x - radius, moon_y - radius, moon_x + radius, moon_y + radius, 270 if phase_type == 'first' else 90, 180)
+                shading.close()
+        c.setStrokeColorRGB(moon_phase_color[0], moon_phase_color[1], moon_phase_color[2])
+        c.setFillColorRGB(moon_phase_color[0], moon_phase_color[1], moon_phase_color[2])
+        c.setLineWidth(1)
+        c.drawPath(shading, stroke=0, fill=1)
+        c.drawPath(outlines, stroke=1, fill=0)
     
-    moon_phase_rgb = dpg.get_value("moon_phase_color") or (76, 76, 153, 255)
-    moon_phase_color = (moon_phase_rgb[0]/255, moon_phase_rgb[1]/255, moon_phase_rgb[2]/255)
+    for (font_name, font_size, color), strings in texts.items():
+        draw_text_batch(c, font_name, font_size, color, strings)
     
-    show_week_numbers = dpg.get_value("show_week_numbers") if dpg.get_value("show_week_numbers") is not None else True
-    highlight_holidays = dpg.get_value("highlight_holidays") if dpg.get_value("highlight_holidays") is not None else True
-    show_equinoxes = dpg.get_value("show_equinoxes") if dpg.get_value("show_equinoxes") is not None else False
-    show_moon_phases = dpg.get_value("show_moon_phases") if dpg.get_value("show_moon_phases") is not None else False
-    moon_phase_size = dpg.get_value("moon_phase_size") or 10
+    c.setFillColorRGB(normal_text_color[0], normal_text_color[1], normal_text_color[2])  # Reset color
+
+def create_wall_planner_pdf(filename, year, holidays_dict, month_font=("Helvetica-Bold", 12), day_font=("Helvetica-Bold", 11), bg_color=(1, 1, 1), normal_text_color=(0, 0, 0), weekend_bg_color=(0.94, 0.94, 0.94), holiday_bg_color=(1, 0.9, 0.9), week_num_text_color=(0.5, 0.5, 0.5), week_num_bg_color=(1, 1, 1), show_week_numbers=True, highlight_holidays=True, show_equinoxes=False, equinox_circle_color=(0, 0.5, 1), show_moon_phases=False, moon_phase_color=(0.3, 0.3, 0.6), moon_phase_size=10, show_birthdays=False, birthdays_dict={}, birthday_square_color=(1, 0.75, 0.8), page_size=landscape(A3), canvas_class=canvas.Canvas):
+    """
+    Creates a PDF file with a one-page wall planner of a year (A3 landscape, or another page size).
+    canvas_class creates the canvas (e.g. a counting proxy, see canvas_stats.py).
+    """
+    c = canvas_class(filename, pagesize=page_size)
     
-    show_birthdays = dpg.get_value("show_birthdays") if dpg.get_value("show_birthdays") is not None else False
-    birthday_square_rgb = dpg.get_value("birthday_square_color") or (255, 191, 204, 255)
-    birthday_square_color = (birthday_square_rgb[0]/255, birthday_square_rgb[1]/255, birthday_square_rgb[2]/255)
+    draw_wall_planner_page(c, year, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color, page_size)
     
-    # Get birthdays
-    birthdays_dict = {}
-    for month in range(1, 13):
-        birthdays_input = dpg.get_value(f"birthdays_{month}")
-        if birthdays_input:
-            try:
-                birthday_days = [int(d.strip()) for d in birthdays_input.split(',') if d.strip()]
-                birthdays_dict[month] = [d for d in birthday_days if 1 <= d <= 31]
-            except ValueError:
-                birthdays_dict[month] = []
-        else:
-            birthdays_dict[month] = []
+    c.save()
+
+# Font names for each font family and style
+TIMES_FONT_NAMES = {
+    "Normal": "Times-Roman",
+    "Bold": "Times-Bold",
+    "Italic": "Times-Italic",
+    "Bold-Italic": "Times-BoldItalic"
+}
+FONT_STYLE_SUFFIXES = {
+    "Normal": "",
+    "Bold": "-Bold",
+    "Italic": "-Oblique",
+    "Bold-Italic": "-BoldOblique"
+}
+
+# Font file choice meaning "use the font family and style above"
+BUILTIN_FONT = "(Built-in)"
+
+def font_name_for(font_family, font_style):
+    """Build the ReportLab font name for a font family and style."""
+    if font_family == "Times-Roman":
+        return TIMES_FONT_NAMES[font_style]
+    return font_family + FONT_STYLE_SUFFIXES[font_style]
+
+def parse_day_list(text):
+    """
+    Parses comma-separated day numbers (e.g. "5,12,25"), keeping days 1-31.
+    Returns an empty list for empty or invalid input.
+    """
+    if not text:
+        return []
+    try:
+        days = [int(d.strip()) for d in text.split(',') if d.strip()]
+    except ValueError:
+        return []
+    return [d for d in days if 1 <= d <= 31]
+
+# Settings widgets and their default values (as the widgets report them), keyed by Dear PyGui tag
+DEFAULT_SETTINGS = {
+    "year_input": datetime.now().year,
+    "format_combo": "Both",
+    "font_family": "Helvetica",
+    "font_style": "Bold",
+    "month_font_file": BUILTIN_FONT,
+    "day_font_file": BUILTIN_FONT,
+    "month_font_size": 12,
+    "day_font_size": 11,
+    "bg_color": (255, 255, 255, 255),
+    "normal_text_color": (0, 0, 0, 255),
+    "weekend_bg_color": (240, 240, 240, 255),
+    "holiday_bg_color": (255, 230, 230, 255),
+    "week_num_text_color": (128, 128, 128, 255),
+    "week_num_bg_color": (255, 255, 255, 255),
+    "show_week_numbers": True,
+    "highlight_holidays": True,
+    "show_equinoxes": False,
+    "equinox_circle_color": (0, 128, 255, 255),
+    "show_moon_phases": False,
+    "moon_phase_color": (76, 76, 153, 255),
+    "moon_phase_size": 10,
+    "show_birthdays": False,
+    "birthday_square_color": (255, 191, 204, 255),
+    "holiday_ics_file": "",
+    "birthday_ics_file": "",
+}
+for month in range(1, 13):
+    for day in default_holidays.get(month, []):
+        DEFAULT_SETTINGS[f"holiday_{month}_{day}"] = True
+    DEFAULT_SETTINGS[f"custom_{month}"] = ""
+    DEFAULT_SETTINGS[f"birthdays_{month}"] = ""
+
+# Color settings, converted from 0-255 to the 0-1 range used by ReportLab
+COLOR_SETTINGS = {"bg_color", "normal_text_color", "weekend_bg_color", "holiday_bg_color", "week_num_text_color", "week_num_bg_color", "equinox_circle_color", "moon_phase_color", "birthday_square_color"}
+
+# Settings holding the path of an imported .ics file
+ICS_SETTINGS = {"holiday_ics_file", "birthday_ics_file"}
+
+# Settings that do not change what the preview shows
+PREVIEW_INDEPENDENT_SETTINGS = {"format_combo"}
+
+class CalendarSettings:
+    """
+    Calendar settings, updated one widget at a time.
+    Values are parsed when a widget changes (not on every render) and the
+    changed fields are tracked as dirty until taken by a renderer.
+    """
     
-    # Get holidays
-    holidays_dict = {}
-    for month in range(1, 13):
-        holidays_dict[month] = []
-        for day in default_holidays.get(month, []):
-            if dpg.get_value(f"holiday_{month}_{day}"):
-                holidays_dict[month].append(day)
+    def __init__(self, values=None):
+        self.values = {}
+        self.dirty = set()
+        self._render_options = None
+        self._event_indexes = {}
+        for tag, value in DEFAULT_SETTINGS.items():
+            self.update(tag, value)
+        for tag, value in (values or {}).items():
+            self.update(tag, value)
     
-    for month in range(1, 13):
-        custom_input = dpg.get_value(f"custom_{month}")
-        if custom_input:
-            try:
-                custom_days = [int(d.strip()) for d in custom_input.split(',') if d.strip()]
-                holidays_dict[month].extend([d for d in custom_days if 1 <= d <= 31 and d not in holidays_dict[month]])
-            except ValueError:
-                pass
+    def update(self, tag, value):
+        """Store a widget value. Returns True if the parsed value changed."""
+        if value is None:
+            value = DEFAULT_SETTINGS.get(tag)
+        if tag in COLOR_SETTINGS:
+            value = (value[0] / 255, value[1] / 255, value[2] / 255)
+        elif tag.startswith("custom_") or tag.startswith("birthdays_"):
+            value = parse_day_list(value)
+        
+        if tag in self.values and self.values[tag] == value:
+            return False
+        if tag in ICS_SETTINGS:
+            # Raises OSError for a file that cannot be read
+            self._event_indexes[tag] = load_event_index(value) if value else None
+        self.values[tag] = value
+        self.dirty.add(tag)
+        self._render_options = None
+        return True
+    
+    def take_dirty(self):
+        """Return the fields changed since the last call and mark them clean."""
+        dirty = self.dirty
+        self.dirty = set()
+        return dirty
+    
+    @property
+    def year(self):
+        return self.values["year_input"]
+    
+    def imported_days(self, tag, year=None):
+        """Days of the .ics file of an ICS_SETTINGS tag in a year (default: the settings year), per month."""
+        index = self._event_indexes.get(tag)
+        return index.month_days(year or self.year) if index else {}
+    
+    def holidays_dict(self, year=None, imported=True):
+        """Checked default holidays plus custom and (unless imported=False) imported holidays, per month."""
+        imported_holidays = self.imported_days("holiday_ics_file", year) if imported else {}
+        holidays_dict = {}
+        for month in range(1, 13):
+            holidays_dict[month] = [day for day in default_holidays.get(month, []) if self.values[f"holiday_{month}_{day}"]]
+            holidays_dict[month].extend([d for d in self.values[f"custom_{month}"] if d not in holidays_dict[month]])
+            holidays_dict[month].extend([d for d in imported_holidays.get(month, []) if d not in holidays_dict[month]])
+        return holidays_dict
+    
+    def birthdays_dict(self, year=None, imported=True):
+        """Typed plus (unless imported=False) imported birthdays, per month."""
+        imported_birthdays = self.imported_days("birthday_ics_file", year) if imported else {}
+        birthdays_dict = {}
+        for month in range(1, 13):
+            birthdays_dict[month] = list(self.values[f"birthdays_{month}"])
+            birthdays_dict[month].extend([d for d in imported_birthdays.get(month, []) if d not in birthdays_dict[month]])
+        return birthdays_dict
+    
+    def render_options(self):
+        """
+        Keyword arguments for create_calendar_pdf() and create_full_year_calendar_pdf().
+        Rebuilt only after a setting changed. Custom font files are registered
+        here, so this raises TTFError for fonts that cannot be embedded.
+        """
+        if self._render_options is None:
+            v = self.values
+            font_name = font_name_for(v["font_family"], v["font_style"])
+            month_font_name = font_name if v["month_font_file"] == BUILTIN_FONT else register_font(v["month_font_file"])
+            day_font_name = font_name if v["day_font_file"] == BUILTIN_FONT else register_font(v["day_font_file"])
+            self._render_options = {
+                "holidays_dict": self.holidays_dict(),
+                "month_font": (month_font_name, v["month_font_size"]),
+                "day_font": (day_font_name, v["day_font_size"]),
+                "bg_color": v["bg_color"],
+                "normal_text_color": v["normal_text_color"],
+                "weekend_bg_color": v["weekend_bg_color"],
+                "holiday_bg_color": v["holiday_bg_color"],
+                "week_num_text_color": v["week_num_text_color"],
+                "week_num_bg_color": v["week_num_bg_color"],
+                "show_week_numbers": v["show_week_numbers"],
+                "highlight_holidays": v["highlight_holidays"],
+                "show_equinoxes": v["show_equinoxes"],
+                "equinox_circle_color": v["equinox_circle_color"],
+                "show_moon_phases": v["show_moon_phases"],
+                "moon_phase_color": v["moon_phase_color"],
+                "moon_phase_size": v["moon_phase_size"],
+                "show_birthdays": v["show_birthdays"],
+                "birthdays_dict": self.birthdays_dict(),
+                "birthday_square_color": v["birthday_square_color"],
+            }
+        return self._render_options
+
+# Settings model shared by the preview and generate callbacks
+gui_settings = CalendarSettings()
+
+# Live preview waits this long after the last edit before rendering (seconds)
+LIVE_PREVIEW_DELAY = 0.3
+_live_preview_timer = None
+
+def setting_changed(sender, app_data):
+    """Per-widget callback: update the settings model and schedule a live preview."""
+    # color_edit callbacks pass 0-1 floats; the model stores widget values (0-255) as read by get_value
+    if sender in COLOR_SETTINGS:
+        app_data = dpg.get_value(sender)
+    if gui_settings.update(sender, app_data) and sender not in PREVIEW_INDEPENDENT_SETTINGS:
+        schedule_live_preview()
+
+def schedule_live_preview():
+    """
+    Restart the debounce timer, so a burst of edits (such as dragging a
+    color picker) results in a single preview render.
+    """
+    global _live_preview_timer
+    
+    if not dpg.get_value("live_preview"):
+        return
+    if _live_preview_timer is not None:
+        _live_preview_timer.cancel()
+    _live_preview_timer = threading.Timer(LIVE_PREVIEW_DELAY, live_preview)
+    _live_preview_timer.daemon = True
+    _live_preview_timer.start()
+
+def live_preview():
+    """Refresh open preview windows if a setting they depend on changed."""
+    if not (dpg.does_item_exist("preview_window_1") or dpg.does_item_exist("preview_window_2")):
+        return
+    if gui_settings.dirty - PREVIEW_INDEPENDENT_SETTINGS:
+        preview_calendar_callback()
+
+def preview_calendar_callback():
+    """Callback function for previewing calendar."""
+    global _preview_generation
+    
+    year = gui_settings.year
+    # Temporary PDFs not yet handed over to the preview windows, removed on errors
+    tmp_paths = []
     
     try:
-        # Generate temporary PDFs for both formats
+        options = gui_settings.render_options()
+        gui_settings.take_dirty()
+        
+        # Generate temporary PDFs for both formats (the layout work shared by draft and final renders)
         with tempfile.NamedTemporaryFile(suffix='_4months.pdf', delete=False) as tmp_pdf1:
             tmp_pdf1_path = tmp_pdf1.name
+        tmp_paths.append(tmp_pdf1_path)
         with tempfile.NamedTemporaryFile(suffix='_12months.pdf', delete=False) as tmp_pdf2:
             tmp_pdf2_path = tmp_pdf2.name
+        tmp_paths.append(tmp_pdf2_path)
         
         # Generate 4 months/page calendar
-        create_calendar_pdf(tmp_pdf1_path, year, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
+        create_calendar_pdf(tmp_pdf1_path, year, **options)
         
         # Generate 12 months/page calendar
-        create_full_year_calendar_pdf(tmp_pdf2_path, year, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
+        create_full_year_calendar_pdf(tmp_pdf2_path, year, **options)
+        
+        previews = [
+            (1, tmp_pdf1_path, "Preview: 4 Months/Page", A4, preview_display_width(1, 700), [50, 50]),
+            (2, tmp_pdf2_path, "Preview: 12 Months/Page", landscape(A4), preview_display_width(2, 900), [800, 50]),  # Offset to the right
+        ]
+        
+        # The PDFs of the previous previews are no longer needed
+        remove_temp_files([preview[1] for preview in _preview_pages.values()])
+        _preview_pages.update((preview[0], preview) for preview in previews)
+        tmp_paths = []
         
-        # Convert PDFs to images using pdf2image
+        _preview_generation += 1
+        generation = _preview_generation
+        _preview_times[generation] = datetime.now().strftime("%H:%M:%S")
+        
+        # Show a low-DPI draft right away
         try:
-            from pdf2image import convert_from_path
-            
-            # Convert first format (4 months/page)
-            images1 = convert_from_path(tmp_pdf1_path, dpi=150, first_page=1, last_page=1)
-            
-            # Convert second format (12 months/page)
-            images2 = convert_from_path(tmp_pdf2_path, dpi=150, first_page=1, last_page=1)
-            
-            # Create preview windows for both formats
-            if images1:
-                # Save first page as temporary PNG
-                with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_png:
-                    tmp_png1_path = tmp_png.name
-                
-                images1[0].save(tmp_png1_path, 'PNG')
-                
-                # Load and display in Dear PyGui window
-                width1, height1, channels1, data1 = dpg.load_image(tmp_png1_path)
-                
-                # Scale image to fit window (max 700px width)
-                scale1 = min(1.0, 700 / width1)
-                display_width1 = int(width1 * scale1)
-                display_height1 = int(height1 * scale1)
-                
-                # Create or update first preview window
-                if dpg.does_item_exist("preview_window_1"):
-                    dpg.delete_item("preview_window_1")
-                
-                with dpg.window(label="Preview: 4 Months/Page", tag="preview_window_1", width=display_width1 + 50, height=display_height1 + 100, pos=[50, 50]):
-                    if dpg.does_item_exist("preview_texture_1"):
-                        dpg.delete_item("preview_texture_1")
-                    
-                    with dpg.texture_registry():
-                        dpg.add_static_texture(width1, height1, data1, tag="preview_texture_1")
-                    
-                    dpg.add_image("preview_texture_1", width=display_width1, height=display_height1)
-                    dpg.add_button(label="Close Preview", callback=lambda: dpg.delete_item("preview_window_1"), width=200)
-                
-                # Clean up temp files
-                try:
-                    os.unlink(tmp_png1_path)
-                except:
-                    pass
-            
-            if images2:
-                # Save second page as temporary PNG
-                with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_png:
-                    tmp_png2_path = tmp_png.name
-                
-                images2[0].save(tmp_png2_path, 'PNG')
-                
-                # Load and display in Dear PyGui window
-                width2, height2, channels2, data2 = dpg.load_image(tmp_png2_path)
-                
-                # Scale image to fit window (max 900px width for landscape)
-                scale2 = min(1.0, 900 / width2)
-                display_width2 = int(width2 * scale2)
-                display_height2 = int(height2 * scale2)
-                
-                # Create or update second preview window (offset to the right)
-                if dpg.does_item_exist("preview_window_2"):
-                    dpg.delete_item("preview_window_2")
-                
-                with dpg.window(label="Preview: 12 Months/Page", tag="preview_window_2", width=display_width2 + 50, height=display_height2 + 100, pos=[display_width1 + 100, 50]):
-                    if dpg.does_item_exist("preview_texture_2"):
-                        dpg.delete_item("preview_texture_2")
-                    
-                    with dpg.texture_registry():
-                        dpg.add_static_texture(width2, height2, data2, tag="preview_texture_2")
-                    
-                    dpg.add_image("preview_texture_2", width=display_width2, height=display_height2)
-                    dpg.add_button(label="Close Preview", callback=lambda: dpg.delete_item("preview_window_2"), width=200)
-                
-                # Clean up temp files
-                try:
-                    os.unlink(tmp_png2_path)
-                except:
-                    pass
-            
+            rasterize_previews(previews, generation, draft=True)
         except ImportError:
             dpg.set_value("status_text", "Error: pdf2image not installed. Install with: pip install pdf2image")
             dpg.configure_item("status_text", color=(255, 100, 100))
+            close_preview(1)
+            close_preview(2)
+            return
         except Exception as e:
             dpg.set_value("status_text", f"Preview error: {str(e)}")
             dpg.configure_item("status_text", color=(255, 100, 100))
+            close_preview(1)
+            close_preview(2)
+            return
         
-        # Clean up temp PDFs
-        try:
-            os.unlink(tmp_pdf1_path)
-            os.unlink(tmp_pdf2_path)
-        except:
-            pass
-            
+        # Swap in the full-quality images from a background thread
+        threading.Thread(target=finish_previews, args=(previews, generation), daemon=True).start()
+    
     except Exception as e:
+        remove_temp_files(tmp_paths)
         dpg.set_value("status_text", f"Error: {str(e)}")
         dpg.configure_item("status_text", color=(255, 100, 100))
 
-def generate_calendar_callback():
-    """Callback function for generating calendar PDFs."""
-    year = dpg.get_value("year_input")
-    format_type = dpg.get_value("format_combo")
+def remove_temp_files(paths):
+    """Delete temporary files, ignoring the ones already gone."""
+    for path in paths:
+        try:
+            os.unlink(path)
+        except:
+            pass
+
+def image_texture_data(image, alpha=False):
+    """
+    Convert a PIL image to (width, height, data) for a raw RGB (or RGBA) float texture.
+    data is one contiguous float32 NumPy array that Dear PyGui uses without copying.
+    """
+    data = np.asarray(image.convert('RGBA' if alpha else 'RGB'), dtype=np.float32).reshape(-1)
+    data *= 1 / 255
+    return image.width, image.height, data
+
+def add_image_texture(image, alpha=False):
+    """
+    Upload a PIL image as a raw float RGB (or RGBA) texture and return its id.
+    The pixel buffer is kept alive until release_texture() is called.
+    """
+    width, height, data = image_texture_data(image, alpha)
+    with dpg.texture_registry():
+        texture_tag = dpg.add_raw_texture(width, height, data, format=dpg.mvFormat_Float_rgba if alpha else dpg.mvFormat_Float_rgb)
+    _texture_buffers[texture_tag] = data
+    return texture_tag
+
+def release_texture(texture_tag):
+    """Delete a texture created by add_image_texture() and free its pixel buffer."""
+    if dpg.does_item_exist(texture_tag):
+        dpg.delete_item(texture_tag)
+    _texture_buffers.pop(texture_tag, None)
+
+class TexturePool:
+    """
+    Raw float textures kept under a memory budget.
+    Textures are stored by key and marked as recently used when shown or fetched.
+    Adding a texture beyond the budget evicts the least recently used textures
+    that are not on screen (keys in shown); an evicted or replaced texture of
+    the same size is refilled in place instead of creating a new one.
+    """
     
-    # Get font settings
-    font_family = dpg.get_value("font_family")
-    font_style = dpg.get_value("font_style")
-    month_font_size = dpg.get_value("month_font_size")
-    day_font_size = dpg.get_value("day_font_size")
+    def __init__(self, budget):
+        self.budget = budget
+        self.shown = set()
+        self._entries = OrderedDict()  # key -> (texture tag, (width, height, alpha), bytes), least recently used first
     
-    # Build font names based on family
-    if font_family == "Times-Roman":
-        font_map = {
-            "Normal": "Times-Roman",
-            "Bold": "Times-Bold",
-            "Italic": "Times-Italic",
-            "Bold-Italic": "Times-BoldItalic"
-        }
-        font_name = font_map[font_style]
-    else:  # Helvetica or Courier
-        style_suffix = {
-            "Normal": "",
-            "Bold": "-Bold",
-            "Italic": "-Oblique",
-            "Bold-Italic": "-BoldOblique"
-        }
-        font_name = font_family + style_suffix[font_style]
+    @property
+    def used(self):
+        """Bytes of pixel data held by the pool."""
+        return sum(entry[2] for entry in self._entries.values())
     
-    month_font = (font_name, month_font_size)
-    day_font = (font_name, day_font_size)
+    def keys(self):
+        """Keys in the pool, least recently used first."""
+        return list(self._entries)
     
-    # Get color settings (convert from 0-255 to 0-1 range for ReportLab)
-    bg_color_rgb = dpg.get_value("bg_color")
-    bg_color = (bg_color_rgb[0]/255, bg_color_rgb[1]/255, bg_color_rgb[2]/255)
+    def get(self, key):
+        """Texture tag of a key (None if evicted), marked as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
     
-    normal_text_rgb = dpg.get_value("normal_text_color")
-    normal_text_color = (normal_text_rgb[0]/255, normal_text_rgb[1]/255, normal_text_rgb[2]/255)
+    def put(self, image, key, alpha=False):
+        """Upload a PIL image under a key, replacing the key's previous texture. Returns the texture tag."""
+        width, height, data = image_texture_data(image, alpha)
+        size_key = (width, height, alpha)
+        
+        replaced = self._entries.pop(key, None)
+        reusable = ([replaced] if replaced else []) + self._evict(self.budget - data.nbytes)
+        texture_tag = None
+        for entry in reusable:
+            if texture_tag is None and entry[1] == size_key:
+                texture_tag = entry[0]
+                dpg.set_value(texture_tag, data)
+            else:
+                release_texture(entry[0])
+        if texture_tag is None:
+            with dpg.texture_registry():
+                texture_tag = dpg.add_raw_texture(width, height, data, format=dpg.mvFormat_Float_rgba if alpha else dpg.mvFormat_Float_rgb)
+        
+        _texture_buffers[texture_tag] = data
+        self._entries[key] = (texture_tag, size_key, data.nbytes)
+        return texture_tag
     
-    weekend_bg_rgb = dpg.get_value("weekend_bg_color")
-    weekend_bg_color = (weekend_bg_rgb[0]/255, weekend_bg_rgb[1]/255, weekend_bg_rgb[2]/255)
+    def _evict(self, limit):
+        """Remove least recently used entries not on screen until at most limit bytes are used. Returns them."""
+        evicted = []
+        for key in list(self._entries):
+            if self.used <= limit:
+                break
+            if key not in self.shown:
+                evicted.append(self._entries.pop(key))
+        return evicted
     
-    holiday_bg_rgb = dpg.get_value("holiday_bg_color")
-    holiday_bg_color = (holiday_bg_rgb[0]/255, holiday_bg_rgb[1]/255, holiday_bg_rgb[2]/255)
+    def discard(self, key):
+        """Release the texture of a key, if present."""
+        self.shown.discard(key)
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            release_texture(entry[0])
     
-    week_num_text_rgb = dpg.get_value("week_num_text_color")
-    week_num_text_color = (week_num_text_rgb[0]/255, week_num_text_rgb[1]/255, week_num_text_rgb[2]/255)
+    def clear(self):
+        """Release every texture."""
+        for key in self.keys():
+            self.discard(key)
+
+# Preview textures: (window index, "draft") for drafts, (window index, generation) for final renders
+preview_textures = TexturePool(PREVIEW_TEXTURE_BUDGET)
+
+def preview_display_width(index, default_width):
+    """Width at which a preview image is shown: what its open window has room for, or the default."""
+    window_tag = f"preview_window_{index}"
+    if dpg.does_item_exist(window_tag):
+        return max(100, dpg.get_item_width(window_tag) - PREVIEW_WINDOW_PADDING[0])
+    return default_width
+
+def show_preview_image(index, image, label, page_size, display_width, pos, key):
+    """
+    Show a rasterized preview page in its preview window, storing it in the texture pool under key.
+    The on-screen size is derived from the page size so a draft and the final
+    image occupy the same area; an open window only gets its texture swapped.
+    """
+    display_height = int(round(display_width * page_size[1] / page_size[0]))
     
-    week_num_bg_rgb = dpg.get_value("week_num_bg_color")
-    week_num_bg_color = (week_num_bg_rgb[0]/255, week_num_bg_rgb[1]/255, week_num_bg_rgb[2]/255)
+    texture_tag = preview_textures.put(image, key)
     
-    show_week_numbers = dpg.get_value("show_week_numbers")
-    highlight_holidays = dpg.get_value("highlight_holidays")
-    show_equinoxes = dpg.get_value("show_equinoxes")
+    window_tag = f"preview_window_{index}"
+    image_tag = f"preview_image_{index}"
+    if dpg.does_item_exist(image_tag):
+        dpg.configure_item(image_tag, texture_tag=texture_tag, width=display_width, height=display_height)
+    else:
+        if dpg.does_item_exist(window_tag):
+            dpg.delete_item(window_tag)
+        
+        with dpg.window(label=label, tag=window_tag, width=display_width + PREVIEW_WINDOW_PADDING[0],
+                        height=display_height + PREVIEW_WINDOW_PADDING[1], pos=pos,
+                        on_close=lambda: close_preview(index)):
+            dpg.add_image(texture_tag, width=display_width, height=display_height, tag=image_tag)
+            with dpg.group(horizontal=True):
+                dpg.add_button(label="Close Preview", callback=lambda: close_preview(index), width=200)
+                # Recent previews still in the texture pool, for A/B comparison
+                dpg.add_combo([], tag=f"preview_versions_{index}", width=200, callback=select_preview_version, user_data=index)
+        
+        # Render again at the new size when the window is resized (one registry per window, kept across reopens)
+        handler_tag = f"preview_resize_handler_{index}"
+        if not dpg.does_item_exist(handler_tag):
+            with dpg.item_handler_registry(tag=handler_tag):
+                dpg.add_item_resize_handler(callback=preview_window_resized, user_data=index)
+        dpg.bind_item_handler_registry(window_tag, handler_tag)
     
-    equinox_circle_rgb = dpg.get_value("equinox_circle_color")
-    equinox_circle_color = (equinox_circle_rgb[0]/255, equinox_circle_rgb[1]/255, equinox_circle_rgb[2]/255)
+    set_shown_preview(index, key)
+
+def preview_version_label(generation):
+    """Compare list entry of a preview generation."""
+    return f"{_preview_times.get(generation, '')} (#{generation})"
+
+def set_shown_preview(index, key):
+    """Record the pool key shown in a preview window and refresh its compare list."""
+    old_key = _preview_keys.get(index)
+    if old_key is not None:
+        preview_textures.shown.discard(old_key)
+    preview_textures.shown.add(key)
+    _preview_keys[index] = key
     
-    show_moon_phases = dpg.get_value("show_moon_phases")
+    versions = sorted((pool_key[1] for pool_key in preview_textures.keys()
+                       if pool_key[0] == index and pool_key[1] != "draft"), reverse=True)
+    combo_tag = f"preview_versions_{index}"
+    if dpg.does_item_exist(combo_tag):
+        dpg.configure_item(combo_tag, items=[preview_version_label(generation) for generation in versions])
+        if key[1] != "draft":
+            dpg.set_value(combo_tag, preview_version_label(key[1]))
+
+def select_preview_version(sender, app_data, user_data):
+    """Show a recent preview from the texture pool instead of the current one."""
+    index = user_data
+    for key in preview_textures.keys():
+        if key[0] == index and key[1] != "draft" and preview_version_label(key[1]) == app_data:
+            texture_tag = preview_textures.get(key)
+            dpg.configure_item(f"preview_image_{index}", texture_tag=texture_tag)
+            set_shown_preview(index, key)
+            return
+
+def close_preview(index):
+    """Close a preview window and free its textures and PDF."""
+    window_tag = f"preview_window_{index}"
+    if dpg.does_item_exist(window_tag):
+        dpg.delete_item(window_tag)
+    _preview_keys.pop(index, None)
+    for key in preview_textures.keys():
+        if key[0] == index:
+            preview_textures.discard(key)
+    preview = _preview_pages.pop(index, None)
+    if preview is not None:
+        remove_temp_files([preview[1]])
+
+def preview_window_resized(sender, app_data, user_data):
+    """Render a preview again when its window width changed by more than the threshold."""
+    index = user_data
+    preview = _preview_pages.get(index)
+    if preview is None:
+        return
     
-    moon_phase_rgb = dpg.get_value("moon_phase_color")
-    moon_phase_color = (moon_phase_rgb[0]/255, moon_phase_rgb[1]/255, moon_phase_rgb[2]/255)
+    display_width = preview_display_width(index, preview[4])
+    if abs(display_width - preview[4]) <= PREVIEW_RESIZE_THRESHOLD * preview[4]:
+        return
     
-    moon_phase_size = dpg.get_value("moon_phase_size")
+    preview = preview[:4] + (display_width,) + preview[5:]
+    _preview_pages[index] = preview
+    threading.Thread(target=finish_previews, args=([preview], _preview_generation), daemon=True).start()
+
+def rasterize_previews(previews, generation, draft=False):
+    """
+    Rasterize page 1 of each preview PDF and display it, unless a newer preview started.
+    Drafts use a low fixed dpi; final images are rendered at exactly their display width.
+    """
+    from pdf2image import convert_from_path
     
-    show_birthdays = dpg.get_value("show_birthdays")
+    for preview in previews:
+        index, pdf_path, label, page_size, display_width, pos = preview
+        if draft:
+            images = convert_from_path(pdf_path, dpi=PREVIEW_DRAFT_DPI, first_page=1, last_page=1)
+        else:
+            images = convert_from_path(pdf_path, size=(display_width, None), first_page=1, last_page=1)
+        with dpg.mutex():
+            if images and generation == _preview_generation and _preview_pages.get(index) is preview:
+                key = (index, "draft") if draft else (index, generation)
+                show_preview_image(index, images[0], label, page_size, display_width, pos, key)
+
+def finish_previews(previews, generation):
+    """Replace the draft previews with full-quality renders at their display size."""
+    try:
+        if generation == _preview_generation:
+            rasterize_previews(previews, generation)
+    except Exception as e:
+        # A newer preview may have removed the PDF; only report errors of the current one
+        if generation == _preview_generation:
+            dpg.set_value("status_text", f"Preview error: {str(e)}")
+            dpg.configure_item("status_text", color=(255, 100, 100))
+
+# Year gallery: thumbnails per row and their width in pixels
+GALLERY_COLUMNS = 4
+GALLERY_THUMBNAIL_WIDTH = 240
+
+# Textures shown in the gallery, and a counter to drop thumbnails of an older run
+_gallery_textures = []
+_gallery_generation = 0
+
+def show_gallery_callback():
+    """Open the year gallery, with a range of years around the selected one."""
+    if dpg.does_item_exist("gallery_window"):
+        dpg.focus_item("gallery_window")
+    else:
+        with dpg.window(label="Year Gallery", tag="gallery_window", width=GALLERY_COLUMNS * (GALLERY_THUMBNAIL_WIDTH + 16) + 30,
+                        height=700, pos=[100, 80], on_close=close_gallery):
+            with dpg.group(horizontal=True):
+                dpg.add_text("Years:")
+                dpg.add_input_int(tag="gallery_first_year", default_value=gui_settings.year - 1, width=100, min_value=1900, max_value=2100, min_clamped=True, max_clamped=True)
+                dpg.add_text("to")
+                dpg.add_input_int(tag="gallery_last_year", default_value=gui_settings.year + 9, width=100, min_value=1900, max_value=2100, min_clamped=True, max_clamped=True)
+                dpg.add_button(label="Show", callback=fill_gallery, width=80)
+            dpg.add_text("Click a year to select it.", color=(150, 150, 150))
+            dpg.add_group(tag="gallery_grid")
+    fill_gallery()
+
+def fill_gallery():
+    """Lay out a slot per year and render the thumbnails in the background."""
+    global _gallery_generation
+    from year_gallery import thumbnail_theme
     
-    birthday_square_rgb = dpg.get_value("birthday_square_color")
-    birthday_square_color = (birthday_square_rgb[0]/255, birthday_square_rgb[1]/255, birthday_square_rgb[2]/255)
+    first_year = dpg.get_value("gallery_first_year")
+    last_year = max(first_year, dpg.get_value("gallery_last_year"))
+    years = list(range(first_year, last_year + 1))
     
-    # Get birthdays from input fields
-    birthdays_dict = {}
-    for month in range(1, 13):
-        birthdays_input = dpg.get_value(f"birthdays_{month}")
-        if birthdays_input:
-            try:
-                birthday_days = [int(d.strip()) for d in birthdays_input.split(',') if d.strip()]
-                birthdays_dict[month] = [d for d in birthday_days if 1 <= d <= 31]
-            except ValueError:
-                birthdays_dict[month] = []
-        else:
-            birthdays_dict[month] = []
+    _gallery_generation += 1
+    release_gallery_textures()
+    dpg.delete_item("gallery_grid", children_only=True)
+    for row_start in range(0, len(years), GALLERY_COLUMNS):
+        with dpg.group(horizontal=True, parent="gallery_grid"):
+            for year in years[row_start:row_start + GALLERY_COLUMNS]:
+                with dpg.group(tag=f"gallery_slot_{year}", width=GALLERY_THUMBNAIL_WIDTH + 8):
+                    dpg.add_text(f"{year}: rendering...", color=(150, 150, 150))
     
-    # Get holidays from checkboxes
-    holidays_dict = {}
-    for month in range(1, 13):
-        holidays_dict[month] = []
-        for day in default_holidays.get(month, []):
-            if dpg.get_value(f"holiday_{month}_{day}"):
-                holidays_dict[month].append(day)
+    theme = thumbnail_theme(gui_settings)
+    threading.Thread(target=load_gallery_thumbnails, args=(years, theme, _gallery_generation), daemon=True).start()
+
+def load_gallery_thumbnails(years, theme, generation):
+    """Fill the gallery slots in the order the thumbnails finish."""
+    from year_gallery import iter_thumbnails
     
-    # Get custom holidays from input fields
-    for month in range(1, 13):
-        custom_input = dpg.get_value(f"custom_{month}")
-        if custom_input:
-            try:
-                custom_days = [int(d.strip()) for d in custom_input.split(',') if d.strip()]
-                holidays_dict[month].extend([d for d in custom_days if 1 <= d <= 31 and d not in holidays_dict[month]])
-            except ValueError:
-                pass
+    try:
+        for year, path in iter_thumbnails(years, theme, GALLERY_THUMBNAIL_WIDTH):
+            if generation != _gallery_generation:
+                return
+            image = Image.open(path)
+            with dpg.mutex():
+                slot = f"gallery_slot_{year}"
+                if generation != _gallery_generation or not dpg.does_item_exist(slot):
+                    return
+                texture_tag = add_image_texture(image)
+                _gallery_textures.append(texture_tag)
+                dpg.delete_item(slot, children_only=True)
+                dpg.add_image_button(texture_tag, width=image.width, height=image.height, parent=slot,
+                                     callback=select_gallery_year, user_data=year)
+    except Exception as e:
+        dpg.set_value("status_text", f"Gallery error: {str(e)}")
+        dpg.configure_item("status_text", color=(255, 100, 100))
+
+def select_gallery_year(sender, app_data, user_data):
+    """Make a gallery year the calendar year."""
+    dpg.set_value("year_input", user_data)
+    setting_changed("year_input", user_data)
+    dpg.set_value("status_text", f"Selected year {user_data}")
+    dpg.configure_item("status_text", color=(100, 255, 100))
+
+def release_gallery_textures():
+    """Free the textures of the thumbnails shown so far."""
+    for texture_tag in _gallery_textures:
+        release_texture(texture_tag)
+    _gallery_textures.clear()
+
+def close_gallery():
+    """Close the gallery window and free its textures."""
+    global _gallery_generation
     
+    _gallery_generation += 1
+    release_gallery_textures()
+    if dpg.does_item_exist("gallery_window"):
+        dpg.delete_item("gallery_window")
+
+# Output PDFs of each format choice, and how each one is made: job -> (file name, PDF function)
+GENERATE_JOBS = {
+    "4 months/page (A4)": ["office"],
+    "12 months/page (A4 landscape)": ["full"],
+    "Both": ["office", "full"],
+    "Wall planner (A3 landscape)": ["planner_a3"],
+    "Wall planner (A2 landscape)": ["planner_a2"],
+}
+CALENDAR_OUTPUTS = {
+    "office": ("calendar_{year}_office.pdf", create_calendar_pdf),
+    "full": ("calendar_{year}_full.pdf", create_full_year_calendar_pdf),
+    "planner_a3": ("calendar_{year}_planner_a3.pdf", partial(create_wall_planner_pdf, page_size=PLANNER_PAGE_SIZES["A3"])),
+    "planner_a2": ("calendar_{year}_planner_a2.pdf", partial(create_wall_planner_pdf, page_size=PLANNER_PAGE_SIZES["A2"])),
+}
+
+# Cancel event of the running generation (None when idle)
+_generation_cancel = None
+
+class GenerationCancelled(Exception):
+    """Raised inside a generation worker when the user cancelled it."""
+
+class ProgressCanvas:
+    """Canvas proxy that reports every finished month to a queue and stops drawing once cancelled."""
+    
+    def __init__(self, c, job, progress_queue, cancel_event):
+        self._canvas = c
+        self._job = job
+        self._progress_queue = progress_queue
+        self._cancel_event = cancel_event
+    
+    def __getattr__(self, name):
+        return getattr(self._canvas, name)
+    
+    def end_month(self):
+        """Called by draw_calendar when a month is done."""
+        if self._cancel_event.is_set():
+            raise GenerationCancelled()
+        self._progress_queue.put(("month", self._job, None))
+
+def generate_calendar_file(job, year, settings_values, progress_queue, cancel_event):
+    """
+    Worker process: render one output PDF. Reports ("month", job, None) per finished
+    month, then ("done", job, filename), ("cancelled", job, None) or ("error", job, message).
+    The PDF is only written when complete, so a cancelled job leaves no partial file.
+    """
+    filename_pattern, create = CALENDAR_OUTPUTS[job]
+    filename = filename_pattern.format(year=year)
     try:
-        if format_type == "4 months/page (A4)":
-            filename = f"calendar_{year}_office.pdf"
-            create_calendar_pdf(filename, year, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-        elif format_type == "12 months/page (A4 landscape)":
-            filename = f"calendar_{year}_full.pdf"
-            create_full_year_calendar_pdf(filename, year, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-        else:  # Both
-            filename1 = f"calendar_{year}_office.pdf"
-            filename2 = f"calendar_{year}_full.pdf"
-            create_calendar_pdf(filename1, year, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-            create_full_year_calendar_pdf(filename2, year, holidays_dict, month_font, day_font, bg_color, normal_text_color, weekend_bg_color, holiday_bg_color, week_num_text_color, week_num_bg_color, show_week_numbers, highlight_holidays, show_equinoxes, equinox_circle_color, show_moon_phases, moon_phase_color, moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-            filename = f"{filename1} and {filename2}"
-        
-        dpg.set_value("status_text", f"✓ Successfully generated: {filename}")
-        dpg.configure_item("status_text", color=(0, 255, 0))
+        options = CalendarSettings(settings_values).render_options()
+        create(filename, year, canvas_class=lambda *args, **kwargs: ProgressCanvas(canvas.Canvas(*args, **kwargs), job, progress_queue, cancel_event), **options)
+    except GenerationCancelled:
+        progress_queue.put(("cancelled", job, None))
+        return
     except Exception as e:
-        dpg.set_value("status_text", f"✗ Error: {str(e)}")
+        progress_queue.put(("error", job, str(e)))
+        return
+    progress_queue.put(("done", job, filename))
+
+def generate_calendar_callback():
+    """Callback function for generating calendar PDFs, one worker process per output file."""
+    global _generation_cancel
+    
+    if _generation_cancel is not None:
+        return
+    year = gui_settings.year
+    jobs = GENERATE_JOBS[gui_settings.values["format_combo"]]
+    # Workers rebuild the settings from the widget values (and register custom fonts themselves)
+    settings_values = {tag: dpg.get_value(tag) for tag in DEFAULT_SETTINGS if dpg.does_item_exist(tag)}
+    
+    progress_queue = multiprocessing.Queue()
+    _generation_cancel = multiprocessing.Event()
+    processes = [multiprocessing.Process(target=generate_calendar_file, args=(job, year, settings_values, progress_queue, _generation_cancel), daemon=True)
+                 for job in jobs]
+    for process in processes:
+        process.start()
+    
+    dpg.set_value("generate_progress", 0)
+    dpg.configure_item("generate_progress", overlay=f"0/{12 * len(jobs)} months")
+    dpg.show_item("generate_progress_group")
+    dpg.configure_item("generate_button", enabled=False)
+    dpg.set_value("status_text", "Generating...")
+    dpg.configure_item("status_text", color=(255, 255, 255))
+    threading.Thread(target=watch_generation, args=(processes, jobs, progress_queue), daemon=True).start()
+
+def watch_generation(processes, jobs, progress_queue):
+    """Background thread: drive the progress bar from worker messages and report the result."""
+    global _generation_cancel
+    
+    total_months = 12 * len(jobs)
+    done_months = 0
+    results = {}
+    while len(results) < len(jobs):
+        try:
+            kind, job, detail = progress_queue.get(timeout=0.5)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes) and progress_queue.empty():
+                # A worker exited without reporting (e.g. it was killed)
+                for job in jobs:
+                    results.setdefault(job, ("error", "worker process stopped"))
+            continue
+        if kind == "month":
+            done_months += 1
+            dpg.set_value("generate_progress", done_months / total_months)
+            dpg.configure_item("generate_progress", overlay=f"{done_months}/{total_months} months")
+        else:
+            results[job] = (kind, detail)
+    for process in processes:
+        process.join()
+    
+    errors = [detail for kind, detail in results.values() if kind == "error"]
+    if errors:
+        dpg.set_value("status_text", f"✗ Error: {errors[0]}")
         dpg.configure_item("status_text", color=(255, 0, 0))
+    elif any(kind == "cancelled" for kind, detail in results.values()):
+        dpg.set_value("status_text", "Generation cancelled")
+        dpg.configure_item("status_text", color=(255, 200, 100))
+    else:
+        filenames = " and ".join(results[job][1] for job in jobs)
+        dpg.set_value("status_text", f"✓ Successfully generated: {filenames}")
+        dpg.configure_item("status_text", color=(0, 255, 0))
+    
+    dpg.hide_item("generate_progress_group")
+    dpg.configure_item("generate_button", enabled=True)
+    _generation_cancel = None
+
+def cancel_generation():
+    """Ask the running generation workers to stop after their current month."""
+    if _generation_cancel is not None:
+        _generation_cancel.set()
+        dpg.set_value("status_text", "Cancelling...")
 
 def switch_section(sender, app_data, user_data):
     """Callback to switch between sections."""
@@ -624,6 +1304,26 @@ def switch_section(sender, app_data, user_data):
         dpg.hide_item(section)
     dpg.show_item(user_data)
 
+def import_ics_file(tag, path):
+    """Set an .ics import setting (empty path to clear it) and report the result."""
+    try:
+        changed = gui_settings.update(tag, path)
+    except (OSError, UnicodeError) as e:
+        dpg.set_value("status_text", f"✗ Could not read {path}: {e}")
+        dpg.configure_item("status_text", color=(255, 0, 0))
+        return
+    dpg.set_value(tag, path)
+    if path:
+        index = load_event_index(path)
+        dpg.set_value("status_text", f"✓ Imported {index.event_count} events ({index.yearly_count} yearly) from {os.path.basename(path)}")
+        dpg.configure_item("status_text", color=(0, 255, 0))
+    if changed:
+        schedule_live_preview()
+
+def ics_file_selected(sender, app_data, user_data):
+    """File dialog callback: import the chosen .ics file into the setting in user_data."""
+    import_ics_file(user_data, app_data["file_path_name"])
+
 def create_gui():
     """Creates the Dear PyGui interface."""
     dpg.create_context()
@@ -640,35 +1340,47 @@ def create_gui():
         else:
             default_font = None
     
-    # Load icons as textures
-    icon_textures = {}
-    icon_names = ["basic", "fonts", "colors", "features", "holidays", "birthdays"]
-    for icon_name in icon_names:
-        icon_path = f"icons/{icon_name}.png"
-        if os.path.exists(icon_path):
-            width, height, channels, data = dpg.load_image(icon_path)
-            
-            with dpg.texture_registry():
-                icon_textures[icon_name] = dpg.add_static_texture(width, height, data, tag=f"{icon_name}_texture")
+    # Load all icons as one atlas texture (drawn and cached on first launch)
+    try:
+        icon_atlas, icon_uvs = load_icon_atlas(ICONS_DIR)
+        icon_texture = add_image_texture(icon_atlas, alpha=True)
+    except Exception:
+        icon_uvs = {}
     
     # Bind the font if it was loaded
     if default_font:
         dpg.bind_font(default_font)
     
+    # File dialogs for importing holidays and birthdays from iCalendar files
+    for tag in ICS_SETTINGS:
+        with dpg.file_dialog(directory_selector=False, show=False, callback=ics_file_selected, user_data=tag,
+                             tag=f"{tag}_dialog", width=600, height=400):
+            dpg.add_file_extension(".ics")
+            dpg.add_file_extension(".*")
+    
     with dpg.window(label="Calendar Generator", tag="primary_window", width=1000, height=750, no_close=True):
         # Top bar with title and buttons
         with dpg.group(horizontal=True):
             dpg.add_text("PDF Calendar Generator", color=(100, 200, 255))
-            dpg.add_spacer(width=250)
+            dpg.add_spacer(width=120)
             dpg.add_button(label="Preview Calendar", callback=preview_calendar_callback, width=200, height=35)
             dpg.add_spacer(width=10)
-            dpg.add_button(label="Generate Calendar", callback=generate_calendar_callback, width=200, height=35)
+            dpg.add_button(label="Generate Calendar", tag="generate_button", callback=generate_calendar_callback, width=200, height=35)
+            dpg.add_spacer(width=10)
+            dpg.add_button(label="Year Gallery", callback=show_gallery_callback, width=120, height=35)
+            dpg.add_spacer(width=10)
+            dpg.add_checkbox(label="Live preview", tag="live_preview", default_value=True)
         
         dpg.add_separator()
         dpg.add_spacer(height=10)
         
         # Status text
         dpg.add_text("", tag="status_text", color=(255, 255, 255))
+        
+        # Progress of a running generation
+        with dpg.group(horizontal=True, tag="generate_progress_group", show=False):
+            dpg.add_progress_bar(tag="generate_progress", width=400)
+            dpg.add_button(label="Cancel", callback=cancel_generation, width=100)
         dpg.add_spacer(height=5)
         
         # Main layout: sidebar on left, content on right
@@ -688,9 +1400,10 @@ def create_gui():
                     ("holidays", "Holidays", "holidays_section"),
                     ("birthdays", "Birthdays", "birthdays_section")
                 ]:
-                    if icon_name in icon_textures:
+                    if icon_name in icon_uvs:
+                        uv = icon_uvs[icon_name]
                         with dpg.group(horizontal=True):
-                            dpg.add_image(f"{icon_name}_texture", width=32, height=32)
+                            dpg.add_image(icon_texture, width=32, height=32, uv_min=uv[:2], uv_max=uv[2:])
                             dpg.add_button(label=label, width=120, height=32, callback=switch_section, user_data=section)
                     else:
                         dpg.add_button(label=label, width=160, height=40, callback=switch_section, user_data=section)
@@ -715,7 +1428,7 @@ def create_gui():
                     with dpg.group(horizontal=True):
                         dpg.add_text("Format:")
                         dpg.add_spacer(width=72)
-                        dpg.add_combo(["4 months/page (A4)", "12 months/page (A4 landscape)", "Both"], 
+                        dpg.add_combo(list(GENERATE_JOBS), 
                                      default_value="Both", tag="format_combo", width=300)
                 
                 # Font Settings Section
@@ -741,6 +1454,22 @@ def create_gui():
                     
                     dpg.add_spacer(height=15)
                     
+                    # Custom TrueType/OpenType fonts override the family and style above
+                    font_files = [BUILTIN_FONT] + find_font_files()
+                    with dpg.group(horizontal=True):
+                        dpg.add_text("Month font file:")
+                        dpg.add_spacer(width=28)
+                        dpg.add_combo(font_files, default_value=BUILTIN_FONT, tag="month_font_file", width=450)
+                    
+                    dpg.add_spacer(height=15)
+                    
+                    with dpg.group(horizontal=True):
+                        dpg.add_text("Day font file:")
+                        dpg.add_spacer(width=44)
+                        dpg.add_combo(font_files, default_value=BUILTIN_FONT, tag="day_font_file", width=450)
+                    
+                    dpg.add_spacer(height=15)
+                    
                     with dpg.group(horizontal=True):
                         dpg.add_text("Month name size:")
                         dpg.add_spacer(width=20)
@@ -842,6 +1571,13 @@ def create_gui():
                     dpg.add_separator()
                     dpg.add_spacer(height=10)
                     
+                    with dpg.group(horizontal=True):
+                        dpg.add_text("Import .ics:")
+                        dpg.add_input_text(tag="holiday_ics_file", hint="company or public holiday calendar", width=400, readonly=True)
+                        dpg.add_button(label="Browse...", callback=lambda: dpg.show_item("holiday_ics_file_dialog"))
+                        dpg.add_button(label="Clear", callback=lambda: import_ics_file("holiday_ics_file", ""))
+                    dpg.add_spacer(height=10)
+                    
                     # Holidays selection in columns
                     with dpg.group(horizontal=True):
                         # Column 1 (Jan-Apr)
@@ -891,6 +1627,14 @@ def create_gui():
                         dpg.add_spacer(width=20)
                         dpg.add_color_edit(tag="birthday_square_color", default_value=(255, 191, 204, 255), width=150, no_alpha=True, input_mode=dpg.mvColorEdit_input_rgb)
                     
+                    dpg.add_spacer(height=15)
+                    
+                    with dpg.group(horizontal=True):
+                        dpg.add_text("Import .ics:")
+                        dpg.add_input_text(tag="birthday_ics_file", hint="birthday export from a contacts app", width=400, readonly=True)
+                        dpg.add_button(label="Browse...", callback=lambda: dpg.show_item("birthday_ics_file_dialog"))
+                        dpg.add_button(label="Clear", callback=lambda: import_ics_file("birthday_ics_file", ""))
+                    
                     dpg.add_spacer(height=15)
                     dpg.add_text("Enter birthday days for each month (comma-separated):", color=(180, 180, 180))
                     dpg.add_spacer(height=10)
@@ -920,10 +1664,20 @@ def create_gui():
                                 dpg.add_input_text(tag=f"birthdays_{month}", hint="e.g., 5,12,25", width=200)
                                 dpg.add_spacer(height=10)
     
+    # Route every settings widget through the settings model
+    for tag in DEFAULT_SETTINGS:
+        if dpg.does_item_exist(tag):
+            dpg.set_item_callback(tag, setting_changed)
+            gui_settings.update(tag, dpg.get_value(tag))
+    
     dpg.setup_dearpygui()
     dpg.show_viewport()
     dpg.set_primary_window("primary_window", True)
     dpg.start_dearpygui()
+    
+    # Clean up the PDFs and textures of open previews
+    remove_temp_files([preview[1] for preview in _preview_pages.values()])
+    preview_textures.clear()
     dpg.destroy_context()
 
 if __name__ == "__main__":
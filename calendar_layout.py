@@ -0,0 +1,49 @@
+"""
+Calendar data and month layout shared by the PDF, image and text renderers.
+Kept free of GUI and PDF imports so lightweight tools can load it quickly.
+"""
+from calendar import Calendar
+from datetime import date
+
+# Astronomical events: moon_phases(year) and equinoxes_solstices(year), from the 1900-2100 table
+from astro_table import equinoxes_solstices, moon_phases
+
+# Default holidays (Romanian legal holidays - non-working days)
+default_holidays = {
+    1: [1, 2, 6, 7, 24],  # 1-2 Jan: New Year's Day | 6 Jan: Epiphany | 7 Jan: John the Baptist | 24 Jan: Unification Day
+    2: [],
+    3: [],
+    4: [10, 12, 13],  # Easter 2026: Good Friday (10 Apr), Easter Sunday (12 Apr), Easter Monday (13 Apr)
+    5: [1, 31],  # 1 May: Labour Day | 31 May: Pentecost Sunday
+    6: [1],  # 1 June: Children's Day + Pentecost Monday
+    7: [],
+    8: [15],  # 15 Aug: Assumption of Mary
+    9: [],
+    10: [],
+    11: [30],  # 30 Nov: Saint Andrew's Day
+    12: [1, 25, 26]  # 1 Dec: National Day | 25-26 Dec: Christmas
+}
+
+# Default birthdays (empty by default, user can add custom birthdays)
+default_birthdays = {
+    1: [], 2: [], 3: [], 4: [], 5: [], 6: [],
+    7: [], 8: [], 9: [], 10: [], 11: [], 12: []
+}
+
+_calendar = Calendar()
+_month_layouts = {}
+
+def month_layout(year, month):
+    """
+    Returns the weeks of a month as (week_number, days) rows.
+    days holds the 7 day numbers Monday to Sunday, 0 for days outside the month.
+    """
+    key = (year, month)
+    if key not in _month_layouts:
+        rows = []
+        for week in _calendar.monthdayscalendar(year, month):
+            first_day_of_week = next((day for day in week if day != 0), None)
+            week_number = date(year, month, first_day_of_week).isocalendar()[1] if first_day_of_week else None
+            rows.append((week_number, tuple(week)))
+        _month_layouts[key] = tuple(rows)
+    return _month_layouts[key]
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Count what drawing a calendar costs.
+
+CountingCanvas wraps a ReportLab canvas and counts every drawing call
+(rectangles, strings, circles, paths, colour and font changes) together
+with the page content bytes it produces, per page and per month.
+It works with draw_calendar() and the page functions directly, and with
+create_calendar_pdf() / create_full_year_calendar_pdf() through their
+canvas_class argument.
+"""
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from collections import Counter
+from reportlab.pdfgen import canvas
+
+sys.path.append(os.path.dirname(__file__))
+from calendar_gui import CalendarSettings, create_calendar_pdf, create_full_year_calendar_pdf
+
+# Counted canvas methods and the group they are reported under
+CALL_GROUPS = {
+    "rect": "rects", "roundRect": "rects",
+    "drawString": "strings", "drawCentredString": "strings", "drawRightString": "strings", "drawText": "strings",
+    "circle": "circles", "ellipse": "circles",
+    "drawPath": "paths", "line": "lines", "lines": "lines",
+    "setFillColorRGB": "colours", "setStrokeColorRGB": "colours", "setFillColor": "colours", "setStrokeColor": "colours",
+    "setFont": "fonts", "setLineWidth": "line styles", "setDash": "line styles",
+    "doForm": "forms", "drawImage": "images",
+}
+
+# Optional features compared by --features: setting -> label
+FEATURES = {
+    "show_week_numbers": "week numbers",
+    "highlight_holidays": "holiday highlighting",
+    "show_equinoxes": "equinoxes",
+    "show_moon_phases": "moon phases",
+    "show_birthdays": "birthdays",
+}
+
+def code_bytes(code):
+    """Bytes of page content-stream operators (uncompressed), as ReportLab joins them."""
+    return sum(len(op) + 1 for op in code)
+
+class RenderStats:
+    """
+    Drawing calls and content bytes of a rendered document: in total
+    (calls, content_bytes), per page (pages) and per month drawn (months).
+    """
+
+    def __init__(self):
+        self.calls = Counter()
+        self.content_bytes = 0
+        self.pdf_bytes = 0
+        self.pages = []  # {"calls": Counter, "bytes": int} per page
+        self.months = []  # {"page", "year", "month", "calls": Counter, "bytes", "seconds"} per drawn month
+        self._page_calls = Counter()
+        self._month = None
+
+    def canvas(self, *args, **kwargs):
+        """Canvas factory for canvas_class: a counting proxy around a new ReportLab canvas."""
+        return CountingCanvas(canvas.Canvas(*args, **kwargs), self)
+
+    def count(self, name):
+        self.calls[name] += 1
+        self._page_calls[name] += 1
+        if self._month is not None:
+            self._month["calls"][name] += 1
+
+    def groups(self, calls=None):
+        """Call counts rolled up into CALL_GROUPS."""
+        grouped = Counter()
+        for name, count in (calls if calls is not None else self.calls).items():
+            grouped[CALL_GROUPS[name]] += count
+        return grouped
+
+    def to_dict(self):
+        """The statistics as plain data (JSON serializable)."""
+        return {
+            "calls": dict(self.calls),
+            "groups": dict(self.groups()),
+            "content_bytes": self.content_bytes,
+            "pdf_bytes": self.pdf_bytes,
+            "pages": [{"calls": sum(page["calls"].values()), "bytes": page["bytes"]} for page in self.pages],
+            "months": [{"page": month["page"], "year": month["year"], "month": month["month"],
+                        "calls": sum(month["calls"].values()), "bytes": month["bytes"], "seconds": month["seconds"]}
+                       for month in self.months],
+        }
+
+class CountingCanvas:
+    """
+    Drop-in proxy for a ReportLab canvas that records calls and content bytes into a RenderStats.
+    Everything else is passed through to the wrapped canvas.
+    """
+
+    def __init__(self, c, stats=None):
+        self._canvas = c
+        self.stats = stats if stats is not None else RenderStats()
+
+    def __getattr__(self, name):
+        attr = getattr(self._canvas, name)
+        if name not in CALL_GROUPS:
+            return attr
+
+        def counted(*args, **kwargs):
+            self.stats.count(name)
+            return attr(*args, **kwargs)
+        return counted
+
+    def begin_month(self, year, month):
+        """Called by draw_calendar: following calls belong to this month."""
+        self.stats._month = {"page": len(self.stats.pages), "year": year, "month": month, "calls": Counter(),
+                             "bytes": 0, "seconds": 0.0, "_code_start": len(self._canvas._code),
+                             "_start_time": time.perf_counter()}
+
+    def end_month(self):
+        """Called by draw_calendar when the month is done."""
+        month = self.stats._month
+        if month is None:
+            return
+        month["bytes"] = code_bytes(self._canvas._code[month.pop("_code_start"):])
+        month["seconds"] = time.perf_counter() - month.pop("_start_time")
+        self.stats.months.append(month)
+        self.stats._month = None
+
+    def _end_page(self):
+        page_bytes = code_bytes(self._canvas._code)
+        self.stats.pages.append({"calls": self.stats._page_calls, "bytes": page_bytes})
+        self.stats.content_bytes += page_bytes
+        self.stats._page_calls = Counter()
+
+    def showPage(self):
+        self._end_page()
+        self._canvas.showPage()
+
+    def save(self):
+        # A page with content and no closing showPage is still written by save()
+        if self._canvas._code:
+            self._end_page()
+        self._canvas.save()
+
+def count_calendar_pdf(year, layout="office", **options):
+    """
+    Render a calendar into memory through a CountingCanvas.
+    layout is "office" (4 months/page) or "full" (12 months/page). Returns the RenderStats.
+    """
+    stats = RenderStats()
+    output = io.BytesIO()
+    create = create_calendar_pdf if layout == "office" else create_full_year_calendar_pdf
+    create(output, year, canvas_class=stats.canvas, **options)
+    stats.pdf_bytes = len(output.getvalue())
+    return stats
+
+def feature_costs(year, layout, settings_values):
+    """
+    Cost of each optional feature: (label, extra calls, extra content bytes) between
+    rendering with the feature on and off, all other settings unchanged.
+    """
+    costs = []
+    for tag, label in FEATURES.items():
+        totals = []
+        for enabled in (False, True):
+            options = CalendarSettings(dict(settings_values, **{tag: enabled})).render_options()
+            stats = count_calendar_pdf(year, layout, **options)
+            totals.append((sum(stats.calls.values()), stats.content_bytes))
+        costs.append((label, totals[1][0] - totals[0][0], totals[1][1] - totals[0][1]))
+    return costs
+
+def print_report(stats):
+    """Print totals, per-page and per-month statistics."""
+    print(f"Calls: {sum(stats.calls.values())}  content: {stats.content_bytes / 1024:.1f} KiB  PDF: {stats.pdf_bytes / 1024:.1f} KiB")
+    for group, count in stats.groups().most_common():
+        print(f"  {group:<12} {count:>7}")
+    print()
+    print("Page  calls  content KiB")
+    for index, page in enumerate(stats.pages, 1):
+        print(f"{index:>4}  {sum(page['calls'].values()):>5}  {page['bytes'] / 1024:>11.1f}")
+    print()
+    print("Page  Month     calls  content KiB     ms")
+    for month in stats.months:
+        print(f"{month['page'] + 1:>4}  {month['year']}-{month['month']:02d}  {sum(month['calls'].values()):>5}  "
+              f"{month['bytes'] / 1024:>11.1f}  {month['seconds'] * 1000:>5.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the drawing calls and content bytes of a calendar PDF.")
+    parser.add_argument("--year", type=int, default=CalendarSettings().year, help="calendar year (default: current year)")
+    parser.add_argument("--layout", choices=["office", "full"], default="office", help="4 months/page (office) or 12 months/page (full)")
+    parser.add_argument("--settings", help="JSON file with calendar settings keyed by GUI field name")
+    parser.add_argument("--features", action="store_true", help="also report what each optional feature adds")
+    parser.add_argument("--json", action="store_true", help="print the statistics as JSON")
+    args = parser.parse_args()
+
+    settings_values = {}
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as f:
+            settings_values = json.load(f)
+
+    stats = count_calendar_pdf(args.year, args.layout, **CalendarSettings(settings_values).render_options())
+    features = feature_costs(args.year, args.layout, settings_values) if args.features else []
+    if args.json:
+        data = stats.to_dict()
+        if args.features:
+            data["features"] = [{"feature": label, "calls": calls, "content_bytes": content_bytes}
+                                for label, calls, content_bytes in features]
+        print(json.dumps(data, indent=2))
+        return
+
+    print_report(stats)
+    if args.features:
+        print()
+        print("Feature                calls  content KiB")
+        for label, calls, content_bytes in features:
+            print(f"{label:<21} {calls:>+6}  {content_bytes / 1024:>+11.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,28 @@
 Script to generate simple icons for the Calendar Generator application.
 """
 from PIL import Image, ImageDraw
+import json
 import os
 
-def create_icon(filename, draw_func, size=64):
-    """Create an icon with the given drawing function."""
-    # Create image with transparent background
+# Icons are packed side by side into one atlas image, with a transparent gap
+# between them so texture filtering does not bleed into the neighbours
+ICON_SIZE = 64
+ATLAS_GAP = 2
+ATLAS_IMAGE = "atlas.png"
+ATLAS_INDEX = "atlas.json"
+
+def render_icon(draw_func, size=64):
+    """Draw an icon with the given drawing function on a transparent image."""
     img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
     draw = ImageDraw.Draw(img)
     
     # Call the drawing function
     draw_func(draw, size)
+    return img
+
+def create_icon(filename, draw_func, size=64):
+    """Create an icon with the given drawing function."""
+    img = render_icon(draw_func, size)
     
     # Save the image
     img.save(filename, 'PNG')
@@ -157,20 +169,72 @@ def draw_birthdays_icon(draw, size):
         fill=(255, 150, 200, 255)
     )
 
+# Sidebar icons in atlas order
+ICONS = [
+    ("basic", draw_basic_icon),
+    ("fonts", draw_fonts_icon),
+    ("colors", draw_colors_icon),
+    ("features", draw_features_icon),
+    ("holidays", draw_holidays_icon),
+    ("birthdays", draw_birthdays_icon),
+]
+
+def build_icon_atlas(size=ICON_SIZE):
+    """
+    Draw all icons into one atlas image.
+    Returns (atlas image, {icon name: [u_min, v_min, u_max, v_max]}).
+    """
+    step = size + ATLAS_GAP
+    atlas = Image.new('RGBA', (step * len(ICONS) - ATLAS_GAP, size), (0, 0, 0, 0))
+    uvs = {}
+    for index, (icon_name, draw_func) in enumerate(ICONS):
+        atlas.paste(render_icon(draw_func, size), (index * step, 0))
+        uvs[icon_name] = [index * step / atlas.width, 0.0, (index * step + size) / atlas.width, 1.0]
+    return atlas, uvs
+
+def save_icon_atlas(icons_dir, atlas, uvs):
+    """Write the atlas image and its UV index into icons_dir."""
+    atlas.save(os.path.join(icons_dir, ATLAS_IMAGE), 'PNG')
+    with open(os.path.join(icons_dir, ATLAS_INDEX), "w", encoding="utf-8") as f:
+        json.dump(uvs, f, indent=2)
+
+def load_icon_atlas(icons_dir="icons"):
+    """
+    Return (atlas image, UV index), reading the cached atlas from icons_dir.
+    On first launch (or if the cache is unreadable) the atlas is drawn and saved.
+    """
+    try:
+        with open(os.path.join(icons_dir, ATLAS_INDEX), encoding="utf-8") as f:
+            uvs = json.load(f)
+        atlas = Image.open(os.path.join(icons_dir, ATLAS_IMAGE))
+        atlas.load()
+        if all(icon_name in uvs for icon_name, draw_func in ICONS):
+            return atlas, uvs
+    except (OSError, ValueError):
+        pass
+    
+    atlas, uvs = build_icon_atlas()
+    try:
+        os.makedirs(icons_dir, exist_ok=True)
+        save_icon_atlas(icons_dir, atlas, uvs)
+    except OSError:
+        pass
+    return atlas, uvs
+
 def main():
-    """Generate all icons."""
+    """Generate all icons and the icon atlas."""
     # Create icons directory if it doesn't exist
     icons_dir = "icons"
     os.makedirs(icons_dir, exist_ok=True)
     
     print("Generating icons...")
     
-    create_icon(os.path.join(icons_dir, "basic.png"), draw_basic_icon, 64)
-    create_icon(os.path.join(icons_dir, "fonts.png"), draw_fonts_icon, 64)
-    create_icon(os.path.join(icons_dir, "colors.png"), draw_colors_icon, 64)
-    create_icon(os.path.join(icons_dir, "features.png"), draw_features_icon, 64)
-    create_icon(os.path.join(icons_dir, "holidays.png"), draw_holidays_icon, 64)
-    create_icon(os.path.join(icons_dir, "birthdays.png"), draw_birthdays_icon, 64)
+    for icon_name, draw_func in ICONS:
+        create_icon(os.path.join(icons_dir, f"{icon_name}.png"), draw_func, ICON_SIZE)
+    
+    atlas, uvs = build_icon_atlas()
+    save_icon_atlas(icons_dir, atlas, uvs)
+    print(f"Created: {os.path.join(icons_dir, ATLAS_IMAGE)} and {ATLAS_INDEX}")
     
     print("\nAll icons created successfully in 'icons/' directory!")
     print("You can now use these icons in the calendar_gui.py application.")
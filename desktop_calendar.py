@@ -3,99 +3,361 @@
 Desktop Calendar Widget - A transparent, draggable calendar for your desktop
 """
 import dearpygui.dearpygui as dpg
-from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import cm
-from reportlab.pdfgen import canvas
-from PIL import Image
+import argparse
 import tempfile
 import os
-from datetime import datetime
-from pdf2image import convert_from_path
+import math
+import time
+from datetime import date, datetime
 
 # Import the calendar generation functions from calendar_gui
 import sys
 sys.path.append(os.path.dirname(__file__))
-from calendar_gui import draw_calendar, default_holidays, equinoxes_solstices, moon_phases, default_birthdays
+from calendar import month_name
+from calendar_gui import (default_holidays, equinoxes_solstices, moon_phases, default_birthdays,
+                          month_layout, day_position, DAY_COLUMN_OFFSET, add_image_texture, release_texture)
+from font_cache import string_width
+from tile_store import DESKTOP_STRIP, compose_strip, strip_month_positions
 
-def generate_desktop_calendar_image(year, num_months=6):
+# Rasterization levels (dpi) of the widget image pyramid, smallest first
+PYRAMID_DPI_LEVELS = [100, 150, 200, 300, 400]
+
+# Page geometry of the vertical desktop layout
+DESKTOP_PAGE_WIDTH = DESKTOP_STRIP["page_width"]
+DESKTOP_MONTH_HEIGHT = DESKTOP_STRIP["month_height"]
+DESKTOP_TOP_MARGIN = DESKTOP_STRIP["top_margin"]
+
+# Styling of the desktop calendar (draw_calendar keyword arguments)
+DESKTOP_STYLE = {
+    "month_font": ("Helvetica-Bold", 12),
+    "day_font": ("Helvetica", 10),
+    "bg_color": (0.98, 0.98, 0.98),  # Almost white background that blends better
+    "normal_text_color": (0, 0, 0),
+    "weekend_bg_color": (0.93, 0.93, 0.93),  # Light gray
+    "holiday_bg_color": (1, 0.85, 0.85),  # Light red
+    "week_num_text_color": (0.5, 0.5, 0.5),
+    "week_num_bg_color": (0.98, 0.98, 0.98),
+    "show_week_numbers": True,
+    "highlight_holidays": True,
+    "show_equinoxes": True,
+    "equinox_circle_color": (0.8, 0.2, 0.2),  # Red for visibility
+    "show_moon_phases": True,
+    "moon_phase_color": (0.2, 0.2, 0.5),
+    "moon_phase_size": 8,
+    "show_birthdays": False,
+    "birthdays_dict": default_birthdays,
+    "birthday_square_color": (1, 0.75, 0.8),
+}
+
+# Cached pyramid levels: dpi -> (width, height, texture tag)
+_pyramid_levels = {}
+# dpi of the level shown in the widget (None before the first one)
+_shown_level = None
+
+def desktop_month_positions(year, first_month, num_months=6):
+    """
+    Returns (year, month, x, y) for each month of the vertical layout, in PDF points.
+    Months after December continue in the next year.
+    """
+    return [(month_year, month, DESKTOP_STRIP["x"], y)
+            for month_year, month, y in strip_month_positions(DESKTOP_STRIP, year, first_month, num_months)]
+
+def render_desktop_calendar_image(year, num_months, dpi):
+    """
+    Compose the desktop calendar, starting from the current month, at the given dpi,
+    with today outlined. Months are taken from the tile store, so only months not
+    seen before are rendered.
+    """
+    image = compose_strip(year, datetime.now().month, num_months, DESKTOP_STYLE, DESKTOP_STRIP,
+                          default_holidays, dpi, background=DESKTOP_STYLE["bg_color"])
+    # Opaque output (DearPyGUI doesn't support window transparency well on Linux)
+    return image.convert('RGB')
+
+def generate_desktop_calendar_image(year, num_months=6, dpi=200):
     """
     Generate a vertical calendar image for desktop display.
     Returns the path to the generated PNG file.
     """
-    # Create temporary PDF
-    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_pdf:
-        tmp_pdf_path = tmp_pdf.name
-    
-    # Generate vertical layout calendar - one column
-    page_width = 8 * cm  # Wider width for better visibility
-    month_height = 5.5 * cm  # Height per month
-    top_margin = 0.8 * cm  # Extra space at top for first month
-    page_height = month_height * num_months + top_margin  # Total height
-    
-    c = canvas.Canvas(tmp_pdf_path, pagesize=(page_width, page_height))
-    
-    # Very light background that blends better
-    month_font = ("Helvetica-Bold", 12)
-    day_font = ("Helvetica", 10)
-    bg_color = (0.98, 0.98, 0.98)  # Almost white background
-    normal_text_color = (0, 0, 0)
-    weekend_bg_color = (0.93, 0.93, 0.93)  # Light gray
-    holiday_bg_color = (1, 0.85, 0.85)  # Light red
-    week_num_text_color = (0.5, 0.5, 0.5)
-    week_num_bg_color = (0.98, 0.98, 0.98)
-    show_week_numbers = True
-    highlight_holidays = True
-    show_equinoxes = True
-    equinox_circle_color = (0.8, 0.2, 0.2)  # Red for visibility
-    show_moon_phases = True
-    moon_phase_color = (0.2, 0.2, 0.5)
-    moon_phase_size = 8
-    show_birthdays = False
-    birthdays_dict = default_birthdays
-    birthday_square_color = (1, 0.75, 0.8)
-    
-    # Get current month to start from
-    current_month = datetime.now().month
-    
-    # Draw months vertically in a single column
-    for i in range(num_months):
-        month = ((current_month - 1 + i) % 12) + 1
-        
-        # Position for this month (stacked vertically from top)
-        x = 0.3 * cm
-        y = page_height - top_margin - (i + 1) * month_height + 0.5 * cm
-        
-        # Draw the month
-        draw_calendar(c, year, month, x, y, 0, 0, 
-                     default_holidays, month_font, day_font, 
-                     bg_color, normal_text_color, weekend_bg_color, 
-                     holiday_bg_color, week_num_text_color, week_num_bg_color,
-                     show_week_numbers, highlight_holidays, show_equinoxes, 
-                     equinox_circle_color, show_moon_phases, moon_phase_color, 
-                     moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
-    
-    c.save()
-    
-    # Convert PDF to PNG
-    images = convert_from_path(tmp_pdf_path, dpi=200)
+    image = render_desktop_calendar_image(year, num_months, dpi)
     
     with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp_png:
         tmp_png_path = tmp_png.name
+    image.save(tmp_png_path, 'PNG')
     
-    if images:
-        # Save directly without transparency processing (DearPyGUI doesn't support window transparency well on Linux)
-        images[0].save(tmp_png_path, 'PNG')
+    return tmp_png_path
+
+def get_display_scale():
+    """Return the display scale factor reported by the desktop environment (1.0 if unknown)."""
+    for variable in ("GDK_SCALE", "QT_SCALE_FACTOR", "DESKTOP_CALENDAR_SCALE"):
+        try:
+            scale = float(os.environ.get(variable, ""))
+        except ValueError:
+            continue
+        if scale > 0:
+            return scale
+    return 1.0
+
+def level_pixel_width(dpi):
+    """Pixel width of the desktop calendar rasterized at the given dpi."""
+    return int(round(DESKTOP_PAGE_WIDTH / 72 * dpi))
+
+def select_pyramid_level(target_width):
+    """
+    Pick the pyramid level for a target pixel width.
+    An already cached level is reused when it is at least as wide as the target
+    and not more than one level above the best fit; otherwise the smallest level
+    covering the target (or the largest level) is chosen.
+    """
+    best_dpi = PYRAMID_DPI_LEVELS[-1]
+    for dpi in PYRAMID_DPI_LEVELS:
+        if level_pixel_width(dpi) >= target_width:
+            best_dpi = dpi
+            break
     
-    # Clean up PDF
-    try:
-        os.unlink(tmp_pdf_path)
-    except:
-        pass
+    best_index = PYRAMID_DPI_LEVELS.index(best_dpi)
+    for dpi in PYRAMID_DPI_LEVELS[best_index:best_index + 2]:
+        if dpi in _pyramid_levels:
+            return dpi
+    return best_dpi
+
+def get_pyramid_level(year, dpi, num_months=6):
+    """
+    Return (width, height, texture tag) for a pyramid level, rendering it on first use.
+    Levels are composed from stored month tiles, rendered once per size.
+    """
+    if dpi in _pyramid_levels:
+        return _pyramid_levels[dpi]
     
-    return tmp_png_path
+    # Upload the composed pixels straight from memory
+    image = render_desktop_calendar_image(year, num_months, dpi)
+    texture_tag = add_image_texture(image)
+    
+    _pyramid_levels[dpi] = (image.width, image.height, texture_tag)
+    return _pyramid_levels[dpi]
+
+def clear_pyramid():
+    """Drop all cached pyramid levels (the month tiles stay on disk)."""
+    global _shown_level
+    _shown_level = None
+    for width, height, texture_tag in _pyramid_levels.values():
+        try:
+            release_texture(texture_tag)
+        except:
+            pass
+    _pyramid_levels.clear()
+
+def trim_pyramid(shown_dpi):
+    """
+    Release every cached level except the shown one and the level just below it,
+    so texture memory follows what is on screen (a maximized window does not
+    keep its 400 dpi level once the widget is small again).
+    """
+    index = PYRAMID_DPI_LEVELS.index(shown_dpi)
+    keep = set(PYRAMID_DPI_LEVELS[max(0, index - 1):index + 1])
+    for dpi in [dpi for dpi in _pyramid_levels if dpi not in keep]:
+        width, height, texture_tag = _pyramid_levels.pop(dpi)
+        try:
+            release_texture(texture_tag)
+        except:
+            pass
+
+def show_calendar_level(year, display_width):
+    """
+    Show the calendar at the given on-screen width using the closest pyramid level.
+    The level is picked for the physical pixel width (display width times display scale).
+    Switching level releases the levels no longer needed (see trim_pyramid).
+    """
+    global _shown_level
+    
+    dpi = select_pyramid_level(display_width * get_display_scale())
+    width, height, texture_tag = get_pyramid_level(year, dpi)
+    display_height = int(height * display_width / width)
+    dpg.configure_item("calendar_image", texture_tag=texture_tag, width=display_width, height=display_height)
+    if dpi != _shown_level:
+        _shown_level = dpi
+        trim_pyramid(dpi)
+
+# Native (drawlist) mode: pixels per PDF point, matching the default 200 dpi image
+NATIVE_DEFAULT_SCALE = 200 / 72
+TODAY_BG_COLOR = (1, 0.93, 0.55)
+TODAY_BORDER_COLOR = (0.85, 0.55, 0)
+
+# Drawn day cells: (year, month, day) -> {"cell", "text": item ids, "column", "fill", "text_color"}
+_native_days = {}
+# (year, first month, number of months, scale) of the current drawlist
+_native_layout = None
+
+def rgba(color):
+    """Convert a 0-1 RGB colour to Dear PyGui's 0-255 RGBA."""
+    return [int(round(component * 255)) for component in color[:3]] + [255]
+
+def native_point(x, y, page_height, scale):
+    """Convert PDF coordinates (points, y up) to drawlist pixels (y down)."""
+    return [x * scale, (page_height - y) * scale]
+
+def draw_native_text(drawlist, x, y, text, font, color, page_height, scale, centred=True):
+    """Draw text with its baseline at (x, y) PDF points, centred on x by default."""
+    size = font[1] * scale
+    if centred:
+        x -= string_width(text, font[0], font[1]) / 2
+    left, baseline = native_point(x, y, page_height, scale)
+    # draw_text places the top of the line; the baseline is about 0.8 em below it
+    return dpg.draw_text([left, baseline - 0.8 * size], text, size=size, color=rgba(color), parent=drawlist)
+
+def native_day_colors(day, column, month_holidays, is_today):
+    """Cell fill and text colour of a day, with the same priorities as draw_calendar."""
+    if is_today:
+        fill = TODAY_BG_COLOR
+    elif DESKTOP_STYLE["highlight_holidays"] and day in month_holidays:
+        fill = DESKTOP_STYLE["holiday_bg_color"]
+    elif column in (5, 6):
+        fill = DESKTOP_STYLE["weekend_bg_color"]
+    else:
+        fill = DESKTOP_STYLE["bg_color"]
+    
+    if DESKTOP_STYLE["highlight_holidays"] and day in month_holidays:
+        text_color = (1, 0, 0)
+    elif column == 5:
+        text_color = (0.5, 0.5, 0.5)
+    elif column == 6:
+        text_color = (1, 0, 0)
+    else:
+        text_color = DESKTOP_STYLE["normal_text_color"]
+    return fill, text_color
 
-def create_desktop_calendar():
-    """Create the desktop calendar widget."""
+def draw_native_moon(drawlist, x, y, phase_type, page_height, scale):
+    """Draw a moon phase symbol centred at (x, y) PDF points."""
+    color = rgba(DESKTOP_STYLE["moon_phase_color"])
+    center = native_point(x, y, page_height, scale)
+    radius = DESKTOP_STYLE["moon_phase_size"] / 2.8 * scale
+    fill = color if phase_type == 'new' else [0, 0, 0, 0]
+    dpg.draw_circle(center, radius, color=color, fill=fill, parent=drawlist)
+    
+    if phase_type in ('first', 'last'):
+        # Filled half disc: right half for the first quarter, left half for the last
+        side = 1 if phase_type == 'first' else -1
+        points = [[center[0] + side * radius * math.sin(math.pi * step / 16),
+                   center[1] - radius * math.cos(math.pi * step / 16)] for step in range(17)]
+        dpg.draw_polygon(points + [points[0]], color=color, fill=color, parent=drawlist)
+
+def draw_native_month(drawlist, year, month, x, y, page_height, scale, holidays_dict, today):
+    """
+    Draw one month with drawlist primitives, using the same geometry as draw_calendar.
+    Day cells are remembered so they can be recoloured later without redrawing.
+    """
+    style = DESKTOP_STYLE
+    month_font = style["month_font"]
+    day_font = style["day_font"]
+    month_holidays = holidays_dict.get(month, [])
+    
+    # Background
+    dpg.draw_rectangle(native_point(x - 1.5 * cm, y + 7 * cm, page_height, scale),
+                       native_point(x + 6.5 * cm, y - 0.5 * cm, page_height, scale),
+                       color=[0, 0, 0, 0], fill=rgba(style["bg_color"]), parent=drawlist)
+    
+    draw_native_text(drawlist, x + 2.5 * cm, y + 7 * cm, month_name[month], month_font, style["normal_text_color"], page_height, scale)
+    for i, day_name in enumerate(["Mo", "Tue", "We", "Th", "Fr", "Sat", "Sun"]):
+        draw_native_text(drawlist, x + (i + DAY_COLUMN_OFFSET) * cm, y + 10 + 6 * cm, day_name, day_font, style["normal_text_color"], page_height, scale)
+    
+    cell_width = 0.95 * cm * (day_font[1] / 11)
+    cell_height = 0.65 * cm * (day_font[1] / 11)
+    month_moon_phases = {day: phase_type for day, phase_type in moon_phases(year).get(month, [])}
+    
+    for row, (week_number, week) in enumerate(month_layout(year, month)):
+        if style["show_week_numbers"] and week_number:
+            week_num_x = x - 1.6 * cm
+            week_num_y = day_position(x, y, 0, 0, row, 0)[1]
+            dpg.draw_rectangle(native_point(week_num_x - 0.15 * cm, week_num_y + 0.3 * cm, page_height, scale),
+                               native_point(week_num_x + 0.45 * cm, week_num_y - 0.15 * cm, page_height, scale),
+                               color=[0, 0, 0, 0], fill=rgba(style["week_num_bg_color"]), parent=drawlist)
+            draw_native_text(drawlist, week_num_x, week_num_y, str(week_number), day_font, style["week_num_text_color"], page_height, scale, centred=False)
+        
+        for column, day in enumerate(week):
+            if day == 0:
+                continue
+            day_x, day_y = day_position(x, y, 0, 0, row, column)
+            fill, text_color = native_day_colors(day, column, month_holidays, date(year, month, day) == today)
+            cell = dpg.draw_rectangle(native_point(day_x - cell_width / 2, day_y + cell_height / 2, page_height, scale),
+                                      native_point(day_x + cell_width / 2, day_y - cell_height / 2, page_height, scale),
+                                      color=rgba(TODAY_BORDER_COLOR) if date(year, month, day) == today else [0, 0, 0, 0],
+                                      fill=rgba(fill), parent=drawlist)
+            text = draw_native_text(drawlist, day_x, day_y, str(day), day_font, text_color, page_height, scale)
+            _native_days[(year, month, day)] = {"cell": cell, "text": text, "column": column, "fill": fill, "text_color": text_color}
+            
+            if style["show_equinoxes"] and day in equinoxes_solstices(year).get(month, []):
+                radius = (0.35 * cm - 0.07 * cm) * (day_font[1] / 11)
+                dpg.draw_circle(native_point(day_x, day_y + 0.15 * cm, page_height, scale), radius * scale,
+                                color=rgba(style["equinox_circle_color"]), thickness=1.5 * scale, parent=drawlist)
+            
+            if style["show_moon_phases"] and day in month_moon_phases:
+                draw_native_moon(drawlist, day_x + 0.48 * cm, day_y + 0.25 * cm, month_moon_phases[day], page_height, scale)
+
+def native_calendar_size(num_months, scale):
+    """Pixel size of the native calendar drawlist."""
+    page_height = DESKTOP_MONTH_HEIGHT * num_months + DESKTOP_TOP_MARGIN
+    return int(DESKTOP_PAGE_WIDTH * scale), int(page_height * scale)
+
+def draw_native_calendar(parent, year, first_month, num_months=6, scale=NATIVE_DEFAULT_SCALE, holidays_dict=default_holidays, today=None):
+    """
+    Draw the vertical desktop calendar into a drawlist (tag "calendar_drawlist"),
+    replacing the previous one. No PDF or image is involved.
+    """
+    global _native_layout
+    
+    today = today or date.today()
+    if dpg.does_item_exist("calendar_drawlist"):
+        dpg.delete_item("calendar_drawlist")
+    _native_days.clear()
+    
+    width, height = native_calendar_size(num_months, scale)
+    page_height = DESKTOP_MONTH_HEIGHT * num_months + DESKTOP_TOP_MARGIN
+    with dpg.drawlist(width=width, height=height, tag="calendar_drawlist", parent=parent) as drawlist:
+        for month_year, month, x, y in desktop_month_positions(year, first_month, num_months):
+            draw_native_month(drawlist, month_year, month, x, y, page_height, scale, holidays_dict, today)
+    
+    _native_layout = (year, first_month, num_months, scale)
+
+def update_native_days(holidays_dict=default_holidays, today=None):
+    """
+    Recolour only the day cells whose state changed (today moved, holidays edited).
+    Returns the number of cells updated.
+    """
+    today = today or date.today()
+    updated = 0
+    for (year, month, day), node in _native_days.items():
+        is_today = date(year, month, day) == today
+        fill, text_color = native_day_colors(day, node["column"], holidays_dict.get(month, []), is_today)
+        if (fill, text_color) == (node["fill"], node["text_color"]):
+            continue
+        dpg.configure_item(node["cell"], fill=rgba(fill), color=rgba(TODAY_BORDER_COLOR) if is_today else [0, 0, 0, 0])
+        dpg.configure_item(node["text"], color=rgba(text_color))
+        node["fill"], node["text_color"] = fill, text_color
+        updated += 1
+    return updated
+
+def refresh_native_calendar(parent, holidays_dict=default_holidays, scale=None):
+    """
+    Bring the native calendar up to date: redraw everything when the months shown
+    or the scale change, otherwise only recolour the affected day cells.
+    """
+    today = date.today()
+    year, first_month, num_months, current_scale = _native_layout
+    scale = scale or current_scale
+    if (year, first_month) != (today.year, today.month) or scale != current_scale:
+        draw_native_calendar(parent, today.year, today.month, num_months, scale, holidays_dict, today)
+    else:
+        update_native_days(holidays_dict, today)
+
+# How often the calendar checks whether the day changed, in seconds
+NATIVE_REFRESH_INTERVAL = 60
+
+def create_desktop_calendar(mode="native"):
+    """
+    Create the desktop calendar widget.
+    mode "native" draws the calendar with Dear PyGui primitives; "image" shows
+    the calendar composed from rasterized month tiles (needs pdf2image and poppler).
+    """
     dpg.create_context()
     
     # Load Roboto font
@@ -106,20 +368,19 @@ def create_desktop_calendar():
         else:
             default_font = None
     
-    # Generate calendar image
     year = datetime.now().year
-    calendar_image_path = generate_desktop_calendar_image(year, num_months=6)
+    scale = get_display_scale()
     
-    # Load the calendar image
-    width, height, channels, data = dpg.load_image(calendar_image_path)
-    
-    # Create texture
-    with dpg.texture_registry():
-        dpg.add_static_texture(width, height, data, tag="calendar_texture")
-    
-    # Calculate window size (minimal padding)
-    window_width = width + 10
-    window_height = height + 70
+    # Calculate window size (minimal padding), in logical pixels
+    display_width = int(level_pixel_width(200) / scale)
+    if mode == "image":
+        # Generate the default pyramid level
+        width, height, texture_tag = get_pyramid_level(year, select_pyramid_level(level_pixel_width(200)))
+        display_height = int(height * display_width / width)
+    else:
+        display_height = native_calendar_size(6, display_width / DESKTOP_PAGE_WIDTH)[1]
+    window_width = display_width + 10
+    window_height = display_height + 70
     
     # Create viewport with light background
     dpg.create_viewport(
@@ -157,49 +418,63 @@ def create_desktop_calendar():
         
         dpg.add_separator()
         
-        # Calendar image
-        dpg.add_image("calendar_texture", width=width, height=height, tag="calendar_image")
+        if mode == "image":
+            # Calendar image
+            dpg.add_image(texture_tag, width=display_width, height=display_height, tag="calendar_image")
+        else:
+            # Calendar drawn directly
+            with dpg.group(tag="calendar_group"):
+                draw_native_calendar("calendar_group", year, datetime.now().month, 6, display_width / DESKTOP_PAGE_WIDTH)
+    
+    def current_display_width():
+        """On-screen width available for the calendar."""
+        return max(50, dpg.get_viewport_client_width() - 10)
     
     def refresh_calendar():
-        """Refresh the calendar image."""
-        year = datetime.now().year
-        new_image_path = generate_desktop_calendar_image(year, num_months=6)
-        
-        # Load new image
-        new_width, new_height, new_channels, new_data = dpg.load_image(new_image_path)
-        
-        # Delete old texture completely
-        try:
-            if dpg.does_item_exist("calendar_texture"):
-                dpg.delete_item("calendar_texture")
-        except:
-            pass
-        
-        # Create new texture with same tag
-        with dpg.texture_registry():
-            dpg.add_static_texture(new_width, new_height, new_data, tag="calendar_texture")
-        
-        # Update image
-        dpg.configure_item("calendar_image", texture_tag="calendar_texture", width=new_width, height=new_height)
-        
-        # Clean up temp file
-        try:
-            os.unlink(new_image_path)
-        except:
-            pass
+        """Refresh the calendar."""
+        if mode == "image":
+            # Drop all cached levels and render the one needed for the current size
+            clear_pyramid()
+            show_calendar_level(datetime.now().year, current_display_width())
+        else:
+            refresh_native_calendar("calendar_group")
+    
+    def on_viewport_resize():
+        """Fit the calendar to the new viewport size."""
+        if mode == "image":
+            # Switch to the pyramid level matching the new size
+            show_calendar_level(datetime.now().year, current_display_width())
+        else:
+            refresh_native_calendar("calendar_group", scale=current_display_width() / DESKTOP_PAGE_WIDTH)
+    
+    dpg.set_viewport_resize_callback(lambda: on_viewport_resize())
     
     dpg.setup_dearpygui()
     dpg.show_viewport()
     dpg.set_primary_window("calendar_window", True)
     
-    # Clean up temp file after display
-    try:
-        os.unlink(calendar_image_path)
-    except:
-        pass
+    # Render loop; the calendar follows the date (today's cell, month change)
+    last_check = time.monotonic()
+    shown_day = date.today()
+    while dpg.is_dearpygui_running():
+        if time.monotonic() - last_check >= NATIVE_REFRESH_INTERVAL:
+            if mode != "image":
+                refresh_native_calendar("calendar_group")
+            elif date.today() != shown_day:
+                # Recomposed from the stored month tiles with the marker on the new day
+                refresh_calendar()
+            shown_day = date.today()
+            last_check = time.monotonic()
+        dpg.render_dearpygui_frame()
     
-    dpg.start_dearpygui()
+    clear_pyramid()
     dpg.destroy_context()
 
+def main():
+    parser = argparse.ArgumentParser(description="Desktop calendar widget.")
+    parser.add_argument("--image", action="store_true", help="show a rasterized PDF instead of drawing natively (needs pdf2image and poppler)")
+    args = parser.parse_args()
+    create_desktop_calendar("image" if args.image else "native")
+
 if __name__ == "__main__":
-    create_desktop_calendar()
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+Year-at-a-glance event heatmap: the 12 months/page sheet with every day
+cell shaded by how many events (meetings, on-call, leave, ...) fall on it.
+
+Events come from a CSV file or an .ics file. Their dates are turned into
+NumPy day numbers and binned per day of the year in one np.bincount, and
+the counts are mapped to a colour ramp in one pass, so even 100k+ events
+bin in milliseconds. The colours go into draw_calendar's day cell stage.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+import numpy as np
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+# Import the calendar generation functions from calendar_gui
+sys.path.append(os.path.dirname(__file__))
+from calendar_gui import CalendarSettings, draw_full_year_page, string_width
+from ics_import import read_ics
+
+# Colour ramp from few to many events per day (0-1 RGB stops, evenly spaced)
+HEATMAP_RAMP = [(1, 0.96, 0.78), (1, 0.82, 0.45), (0.98, 0.55, 0.3), (0.85, 0.25, 0.2)]
+
+# Number of distinct shades (and legend entries)
+DEFAULT_LEVELS = 6
+
+def load_csv_events(path, category=None):
+    """
+    Read events from a CSV file with a `date` or `start` column and an optional
+    `end` column (inclusive), as ISO dates (YYYY-MM-DD, a time part is ignored).
+    With category, only rows whose `category` column matches are kept.
+    Returns (start dates, lengths in days) as NumPy arrays.
+    """
+    starts = []
+    ends = []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        date_column = "date" if "date" in reader.fieldnames else "start"
+        has_end = "end" in reader.fieldnames
+        for row in reader:
+            if category and row.get("category", "").strip().lower() != category.lower():
+                continue
+            start = row[date_column].strip()[:10]
+            starts.append(start)
+            ends.append((row["end"].strip()[:10] or start) if has_end else start)
+    start_dates = np.array(starts, dtype="datetime64[D]")
+    end_dates = np.array(ends, dtype="datetime64[D]")
+    return start_dates, np.maximum((end_dates - start_dates).astype(np.int64) + 1, 1)
+
+def load_ics_events(path, year):
+    """
+    Read the events of a year from an .ics file (yearly events expanded, multi-day
+    events split into days). Returns (dates, event counts) as NumPy arrays.
+    """
+    events = read_ics(path).events_for_year(year)
+    dates = np.array(list(events), dtype="datetime64[D]")
+    counts = np.fromiter((len(summaries) for summaries in events.values()), dtype=np.int64, count=len(events))
+    return dates, counts
+
+def bin_events(year, starts, days=None, weights=None):
+    """
+    Count events per day of a year. starts are datetime64[D] dates; days
+    (event lengths) spread an event over consecutive days, weights count
+    an entry as several events. Returns an array with one count per day.
+    """
+    year_start = np.datetime64(f"{year}-01-01", "D")
+    year_days = int((np.datetime64(f"{year + 1}-01-01", "D") - year_start).astype(np.int64))
+    offsets = (starts - year_start).astype(np.int64)
+    if days is not None and len(days) and days.max() > 1:
+        # Expand multi-day events: one entry per covered day
+        weights = np.repeat(weights, days) if weights is not None else None
+        group_starts = np.repeat(np.cumsum(days) - days, days)
+        offsets = np.repeat(offsets, days) + (np.arange(int(days.sum())) - group_starts)
+    inside = (offsets >= 0) & (offsets < year_days)
+    return np.bincount(offsets[inside], weights=None if weights is None else weights[inside],
+                       minlength=year_days).astype(np.int64)
+
+def ramp_colors(levels, ramp=HEATMAP_RAMP):
+    """levels colours sampled evenly along the ramp, as an array of RGB rows."""
+    ramp = np.array(ramp, dtype=float)
+    positions = np.linspace(0, 1, len(ramp))
+    samples = np.linspace(0, 1, levels) if levels > 1 else np.zeros(1)
+    return np.stack([np.interp(samples, positions, ramp[:, channel]) for channel in range(3)], axis=1)
+
+def level_ranges(levels, max_count):
+    """
+    (lowest, highest) count of each level when counts 1..max_count are split into
+    levels equal steps: a count c is in level ceil(c * levels / max_count).
+    """
+    return [(max_count * index // levels + 1, max_count * (index + 1) // levels) for index in range(levels)]
+
+def heatmap_colors(year, counts, levels=DEFAULT_LEVELS, max_count=None, ramp=HEATMAP_RAMP):
+    """
+    Map day counts to ramp colours. Counts are split into levels equal steps up to
+    max_count (default: the busiest day), one level per count when there are fewer
+    counts than levels, so no level is empty; busier days get the last level and
+    days without events keep their usual background.
+    Returns ({month: {day: color}} for draw_calendar, legend label of each level).
+    """
+    busiest = int(counts.max()) if len(counts) else 0
+    max_count = max_count or max(busiest, 1)
+    levels = max(1, min(levels, max_count))
+    level = np.clip(np.ceil(counts * levels / max_count), 0, levels).astype(np.int64)
+    colors = ramp_colors(levels, ramp)
+
+    dates = np.datetime64(f"{year}-01-01", "D") + np.nonzero(level)[0]
+    months = dates.astype("datetime64[M]")
+    month_numbers = months.astype(np.int64) % 12 + 1
+    day_numbers = (dates - months.astype("datetime64[D]")).astype(np.int64) + 1
+
+    cell_colors = {month: {} for month in range(1, 13)}
+    for month, day, color in zip(month_numbers.tolist(), day_numbers.tolist(), colors[level[level > 0] - 1].tolist()):
+        cell_colors[month][day] = tuple(color)
+    labels = [str(lowest) if lowest == highest else f"{lowest}-{highest}" for lowest, highest in level_ranges(levels, max_count)]
+    if busiest > max_count:
+        labels[-1] = f"{level_ranges(levels, max_count)[-1][0]}+"
+    return cell_colors, labels
+
+def draw_heatmap_legend(c, labels, font=("Helvetica-Bold", 7), text_color=(0, 0, 0), ramp=HEATMAP_RAMP):
+    """Draws the colour steps, each with its counts, at the top right of a landscape A4 sheet."""
+    levels = len(labels)
+    width, height = landscape(A4)
+    box_width = 0.7 * cm
+    box_height = 0.3 * cm
+    x = width - 1 * cm - levels * box_width
+    y = height - 0.75 * cm
+
+    c.setFont(font[0], font[1])
+    c.setFillColorRGB(text_color[0], text_color[1], text_color[2])
+    label = "Events/day"
+    c.drawString(x - string_width(label, font[0], font[1]) - 0.2 * cm, y + 0.08 * cm, label)
+    for index, color in enumerate(ramp_colors(levels, ramp).tolist()):
+        c.setFillColorRGB(color[0], color[1], color[2])
+        c.rect(x + index * box_width, y, box_width, box_height, fill=1, stroke=0)
+        c.setFillColorRGB(text_color[0], text_color[1], text_color[2])
+        text = labels[index]
+        c.drawString(x + index * box_width + (box_width - string_width(text, font[0], font[1])) / 2, y - 0.3 * cm, text)
+
+def create_heatmap_pdf(filename, year, cell_colors, labels, **options):
+    """
+    Creates the 12 months/page sheet of a year with heatmap cell colours and a legend.
+    options are the create_full_year_calendar_pdf() keyword arguments.
+    """
+    c = canvas.Canvas(filename, pagesize=landscape(A4))
+    draw_full_year_page(c, year, cell_bg_colors=cell_colors, **options)
+    draw_heatmap_legend(c, labels, (options["day_font"][0], 7), options["normal_text_color"])
+    c.save()
+
+def main():
+    parser = argparse.ArgumentParser(description="Shade a 12 months/page calendar by the number of events per day.")
+    parser.add_argument("events", help="CSV (date or start[,end], optional category) or .ics file")
+    parser.add_argument("--year", type=int, default=CalendarSettings().year, help="calendar year (default: current year)")
+    parser.add_argument("--output", help="output PDF (default: heatmap_<year>.pdf)")
+    parser.add_argument("--category", help="only count CSV rows of this category")
+    parser.add_argument("--levels", type=int, default=DEFAULT_LEVELS, help="number of shades")
+    parser.add_argument("--max", type=int, default=None, help="events/day shown with the darkest shade (default: busiest day)")
+    parser.add_argument("--settings", help="JSON file with calendar settings keyed by GUI field name")
+    args = parser.parse_args()
+
+    settings_values = {}
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as f:
+            settings_values = json.load(f)
+    output = args.output or f"heatmap_{args.year}.pdf"
+
+    start_time = time.perf_counter()
+    if args.events.lower().endswith(".ics"):
+        dates, weights = load_ics_events(args.events, args.year)
+        days = None
+    else:
+        dates, days = load_csv_events(args.events, args.category)
+        weights = None
+    load_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    counts = bin_events(args.year, dates, days, weights)
+    cell_colors, labels = heatmap_colors(args.year, counts, args.levels, args.max)
+    bin_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    options = CalendarSettings(dict(settings_values, year_input=args.year)).render_options()
+    create_heatmap_pdf(output, args.year, cell_colors, labels, **options)
+    render_time = time.perf_counter() - start_time
+
+    print(f"Generated {output}: {int(counts.sum())} event days in {args.year}, busiest day {int(counts.max())} events")
+    print(f"Load: {load_time:.2f} s, bin: {bin_time * 1000:.1f} ms, render: {render_time * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Export every page of the calendar layouts as high-resolution PNG files.
+
+Each page is rasterized by its own pdftoppm process (through pdf2image),
+written straight to disk and never loaded into Python, so memory stays
+bounded and all cores are used.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from reportlab.lib.pagesizes import A4, landscape
+
+# Import the calendar generation functions from calendar_gui
+sys.path.append(os.path.dirname(__file__))
+from calendar_gui import CalendarSettings
+from pdf_stream import create_multi_year_calendar_pdf
+
+# Page size and pages per year of each layout
+LAYOUTS = {
+    "office": (A4, 3),
+    "full": (landscape(A4), 1),
+}
+
+def page_file_name(layout, first_year, page_index):
+    """Output file name (without extension) of a page."""
+    pages_per_year = LAYOUTS[layout][1]
+    year = first_year + page_index // pages_per_year
+    if pages_per_year == 1:
+        return f"calendar_{layout}_{year}"
+    return f"calendar_{layout}_{year}_page{page_index % pages_per_year + 1}"
+
+def rasterize_page(pdf_path, page_number, dpi, output_dir, output_name):
+    """Worker: rasterize one page (1-based) to output_dir/output_name.png. Returns the path."""
+    from pdf2image import convert_from_path
+
+    paths = convert_from_path(pdf_path, dpi=dpi, first_page=page_number, last_page=page_number,
+                              output_folder=output_dir, output_file=output_name, fmt="png",
+                              single_file=True, paths_only=True)
+    return paths[0]
+
+def export_png(first_year, last_year, layouts, dpi, output_dir, jobs=None, options=None):
+    """
+    Rasterize every page of the given layouts for a range of years into output_dir.
+    Pages are rendered in parallel and reported as they finish.
+    Returns (number of pages, megapixels written, elapsed seconds).
+    """
+    jobs = jobs or os.cpu_count() or 1
+    options = options or CalendarSettings().render_options()
+    os.makedirs(output_dir, exist_ok=True)
+    start_time = time.perf_counter()
+
+    # Draw the vector PDFs first; they are small compared to the images
+    pdf_paths = []
+    tasks = []
+    try:
+        for layout in layouts:
+            with tempfile.NamedTemporaryFile(suffix=f'_{layout}.pdf', delete=False) as tmp_pdf:
+                pdf_paths.append(tmp_pdf.name)
+            page_count = create_multi_year_calendar_pdf(pdf_paths[-1], first_year, last_year, layout, **options)
+            page_size = LAYOUTS[layout][0]
+            megapixels = (page_size[0] / 72 * dpi) * (page_size[1] / 72 * dpi) / 1e6
+            for page_index in range(page_count):
+                tasks.append((pdf_paths[-1], page_index + 1, page_file_name(layout, first_year, page_index), megapixels))
+
+        total_megapixels = 0
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(rasterize_page, pdf_path, page_number, dpi, output_dir, output_name): megapixels
+                       for pdf_path, page_number, output_name, megapixels in tasks}
+            for done, future in enumerate(as_completed(futures), 1):
+                path = future.result()
+                total_megapixels += futures[future]
+                print(f"[{done}/{len(tasks)}] {path}")
+    finally:
+        # Clean up temp PDFs
+        for pdf_path in pdf_paths:
+            try:
+                os.unlink(pdf_path)
+            except:
+                pass
+
+    return len(tasks), total_megapixels, time.perf_counter() - start_time
+
+def main():
+    parser = argparse.ArgumentParser(description="Export every calendar page as a high-resolution PNG.")
+    parser.add_argument("--year", type=int, default=CalendarSettings().year, help="calendar year (default: current year)")
+    parser.add_argument("--last-year", type=int, default=None, help="export a range of years up to this one")
+    parser.add_argument("--layout", choices=["office", "full", "both"], default="both", help="4 months/page (office), 12 months/page (full) or both")
+    parser.add_argument("--dpi", type=int, default=300, help="resolution, e.g. 300-600 for print")
+    parser.add_argument("--output-dir", default="png_export", help="directory for the PNG files")
+    parser.add_argument("--jobs", type=int, default=None, help="pages rasterized at once (default: number of cores)")
+    parser.add_argument("--settings", help="JSON file with calendar settings keyed by GUI field name")
+    args = parser.parse_args()
+
+    settings_values = {}
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as f:
+            settings_values = json.load(f)
+
+    layouts = ["office", "full"] if args.layout == "both" else [args.layout]
+    options = CalendarSettings(settings_values).render_options()
+    try:
+        pages, megapixels, elapsed = export_png(args.year, args.last_year or args.year, layouts, args.dpi,
+                                                args.output_dir, args.jobs, options)
+    except ImportError:
+        print("Error: pdf2image not installed. Install with: pip install pdf2image")
+        return
+
+    print(f"Exported {pages} pages at {args.dpi} dpi into {args.output_dir}")
+    print(f"Time: {elapsed:.2f} s, {pages / elapsed:.2f} pages/s, {megapixels / elapsed:.1f} megapixels/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+TrueType/OpenType font support for the calendar PDFs.
+Parsed fonts and string width measurements are cached in memory and
+persisted between runs, so custom fonts are only parsed once.
+"""
+import os
+import hashlib
+import pickle
+import atexit
+from functools import partial
+from operator import mul
+from weakref import WeakKeyDictionary
+from reportlab import rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTEncoding
+
+# Where parsed fonts and the string width cache are kept between runs
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "simple_calendar")
+WIDTH_CACHE_PATH = os.path.join(CACHE_DIR, "string_widths.pickle")
+
+# Directories searched for .ttf/.otf files
+FONT_DIRS = [
+    "/usr/share/fonts",
+    "/usr/local/share/fonts",
+    os.path.expanduser("~/.fonts"),
+    os.path.expanduser("~/.local/share/fonts"),
+    "C:/Windows/Fonts",
+]
+
+# Registered custom fonts: font file path -> ReportLab font name, and font name -> file digest
+_fonts = {}
+_font_digests = {}
+
+# String widths: (font digest, font size, text) -> width in points
+_widths = None
+_widths_changed = False
+
+def find_font_files():
+    """Return the TrueType/OpenType font files found in the usual font directories."""
+    font_files = []
+    for font_dir in FONT_DIRS:
+        for root, dirs, files in os.walk(font_dir):
+            for name in files:
+                if name.lower().endswith((".ttf", ".otf")):
+                    font_files.append(os.path.join(root, name))
+    return sorted(font_files)
+
+def font_digest(path):
+    """Identify a font file by path, size and modification time."""
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+def write_pickle(path, data):
+    """
+    Pickle data to path under a per-process temporary name first, so concurrent
+    writers (GUI, scripts, worker processes) never mix their files and a crash
+    never leaves a truncated cache file behind.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except:
+        try:
+            os.unlink(tmp_path)
+        except:
+            pass
+        raise
+
+def load_font(name, path, digest):
+    """
+    Return a TTFont for a font file, using the parsed face persisted by an earlier run if there is one.
+    """
+    face_path = os.path.join(CACHE_DIR, "fonts", f"{digest}.pickle")
+    try:
+        with open(face_path, "rb") as f:
+            face = pickle.load(f)
+        font = TTFont.__new__(TTFont)
+        font.fontName = name
+        font.face = face
+        font.encoding = TTEncoding()
+        font.state = WeakKeyDictionary()
+        font._asciiReadable = rl_config.ttfAsciiReadable
+        font.shapable = False
+        return font
+    except Exception:
+        pass
+
+    font = TTFont(name, path)
+
+    # The face keeps a scaling lambda that cannot be pickled; replace it with an equivalent partial
+    font.face._pdfScale = partial(mul, 1000 / font.face.unitsPerEm)
+    try:
+        os.makedirs(os.path.dirname(face_path), exist_ok=True)
+        write_pickle(face_path, font.face)
+    except Exception:
+        pass
+    return font
+
+def register_font(path):
+    """
+    Register a TTF/OTF file with ReportLab and return the font name to use.
+    Each file is parsed at most once per process (and once overall while the
+    file is unchanged). Raises TTFError for fonts ReportLab cannot embed,
+    such as OpenType fonts with PostScript outlines.
+    """
+    if path in _fonts:
+        return _fonts[path]
+
+    digest = font_digest(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    name = "Custom-" + "".join(ch for ch in stem if ch.isalnum() or ch in "-_") + "-" + digest[:8]
+    font = load_font(name, path, digest)
+    pdfmetrics.registerFont(font)
+    _fonts[path] = name
+    _font_digests[name] = digest
+    return name
+
+def load_width_cache():
+    """Load the persisted string widths (once per process)."""
+    global _widths
+
+    if _widths is None:
+        try:
+            with open(WIDTH_CACHE_PATH, "rb") as f:
+                _widths = pickle.load(f)
+        except Exception:
+            _widths = {}
+    return _widths
+
+def save_width_cache():
+    """Persist the string widths measured in this run."""
+    global _widths_changed
+
+    if not _widths_changed:
+        return
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        write_pickle(WIDTH_CACHE_PATH, _widths)
+        _widths_changed = False
+    except Exception:
+        pass
+
+atexit.register(save_width_cache)
+
+def string_width(text, font_name, font_size):
+    """Width of a string in points, cached per (font, size, string)."""
+    global _widths_changed
+
+    widths = load_width_cache()
+    # Custom fonts are keyed by file digest so an edited font file is measured again
+    key = (_font_digests.get(font_name, font_name), font_size, text)
+    width = widths.get(key)
+    if width is None:
+        width = pdfmetrics.stringWidth(text, font_name, font_size)
+        widths[key] = width
+        _widths_changed = True
+    return width
@@ -2,106 +2,142 @@
 """
 Generate calendar image for Conky desktop widget
 """
-from reportlab.lib.units import cm
-from reportlab.pdfgen import canvas
 from PIL import Image
-import tempfile
+import argparse
+import re
+import time
 import os
 from datetime import datetime
-from pdf2image import convert_from_path
 
 # Import calendar generation functions
 import sys
 sys.path.append(os.path.dirname(__file__))
-from calendar_gui import draw_calendar, default_holidays, equinoxes_solstices, moon_phases, default_birthdays
+from calendar_gui import default_holidays, default_birthdays
+from tile_store import CONKY_STRIP, LAYERS, compose_strip, strip_page_height
 
-def generate_conky_calendar(year, num_months=6, output_path="conky_calendar.png"):
+# Styling for Conky calendar (draw_calendar keyword arguments)
+CONKY_STYLE = {
+    "month_font": ("Helvetica-Bold", 11),
+    "day_font": ("Helvetica", 9),
+    "bg_color": (1, 1, 1),  # White background (will be transparent)
+    "normal_text_color": (0.1, 0.1, 0.1),  # Dark text
+    "weekend_bg_color": (0.92, 0.92, 0.92),  # Light gray
+    "holiday_bg_color": (1, 0.88, 0.88),  # Light red
+    "week_num_text_color": (0.5, 0.5, 0.5),
+    "week_num_bg_color": (0.96, 0.96, 0.96),
+    "show_week_numbers": True,
+    "highlight_holidays": True,
+    "show_equinoxes": True,
+    "equinox_circle_color": (0.85, 0.25, 0.25),  # Red
+    "show_moon_phases": True,
+    "moon_phase_color": (0.25, 0.25, 0.6),  # Blue
+    "moon_phase_size": 7,
+    "show_birthdays": False,
+    "birthdays_dict": default_birthdays,
+    "birthday_square_color": (1, 0.75, 0.8),
+}
+
+# Output formats: full RGBA PNG, palette PNG with alpha, lossless WebP
+IMAGE_FORMATS = ["png", "png8", "webp"]
+# File extension of each output format
+IMAGE_EXTENSIONS = {"png": "png", "png8": "png", "webp": "webp"}
+DEFAULT_PALETTE_COLORS = 32
+
+def save_conky_image(img, output_path, image_format="png", colors=DEFAULT_PALETTE_COLORS):
     """
-    Generate a vertical calendar image for Conky display.
+    Save the Conky image.
+    png8 quantizes to a small palette with alpha (a calendar uses only a few colours)
+    and optimizes the compression; webp writes lossless WebP.
     """
-    # Create temporary PDF
-    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_pdf:
-        tmp_pdf_path = tmp_pdf.name
-    
-    # Generate vertical layout calendar - one column
-    page_width = 7.5 * cm  # Width for Conky display
-    month_height = 5.2 * cm  # Height per month
-    top_margin = 1 * cm  # Extra space at top
-    page_height = month_height * num_months + top_margin
-    
-    c = canvas.Canvas(tmp_pdf_path, pagesize=(page_width, page_height))
-    
-    # Styling for Conky calendar
-    month_font = ("Helvetica-Bold", 11)
-    day_font = ("Helvetica", 9)
-    bg_color = (1, 1, 1)  # White background (will be transparent)
-    normal_text_color = (0.1, 0.1, 0.1)  # Dark text
-    weekend_bg_color = (0.92, 0.92, 0.92)  # Light gray
-    holiday_bg_color = (1, 0.88, 0.88)  # Light red
-    week_num_text_color = (0.5, 0.5, 0.5)
-    week_num_bg_color = (0.96, 0.96, 0.96)
-    show_week_numbers = True
-    highlight_holidays = True
-    show_equinoxes = True
-    equinox_circle_color = (0.85, 0.25, 0.25)  # Red
-    show_moon_phases = True
-    moon_phase_color = (0.25, 0.25, 0.6)  # Blue
-    moon_phase_size = 7
-    show_birthdays = False
-    birthdays_dict = default_birthdays
-    birthday_square_color = (1, 0.75, 0.8)
-    
-    # Get current month to start from
-    current_month = datetime.now().month
-    
-    # Draw months vertically
-    for i in range(num_months):
-        month = ((current_month - 1 + i) % 12) + 1
-        
-        # Position for this month
-        x = 0.25 * cm
-        y = page_height - top_margin - (i + 1) * month_height + 0.6 * cm
-        
-        # Draw the month
-        draw_calendar(c, year, month, x, y, 0, 0, 
-                     default_holidays, month_font, day_font, 
-                     bg_color, normal_text_color, weekend_bg_color, 
-                     holiday_bg_color, week_num_text_color, week_num_bg_color,
-                     show_week_numbers, highlight_holidays, show_equinoxes, 
-                     equinox_circle_color, show_moon_phases, moon_phase_color, 
-                     moon_phase_size, show_birthdays, birthdays_dict, birthday_square_color)
+    if image_format == "png8":
+        img.quantize(colors=colors, method=Image.Quantize.FASTOCTREE).save(output_path, 'PNG', optimize=True)
+    elif image_format == "webp":
+        img.save(output_path, 'WEBP', lossless=True, method=6)
+    else:
+        img.save(output_path, 'PNG')
+
+def image_report(path, repeat=20):
+    """Return (file size in bytes, average decode time in ms) of an image file."""
+    start_time = time.perf_counter()
+    for _ in range(repeat):
+        with Image.open(path) as img:
+            img.load()
+    return os.path.getsize(path), (time.perf_counter() - start_time) / repeat * 1000
+
+# Conky config shipped next to this script, and its image size option (-s WIDTHxHEIGHT)
+CONKY_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "conky_calendar.conf")
+_image_size_pattern = re.compile(r"\$\{image\s[^}]*?-s\s+(\d+)x(\d+)")
+
+def read_conky_image_size(config_path=CONKY_CONFIG_PATH):
+    """Return the (width, height) the Conky config displays the image at, or None."""
+    try:
+        with open(config_path, encoding="utf-8") as f:
+            match = _image_size_pattern.search(f.read())
+    except OSError:
+        return None
+    return (int(match.group(1)), int(match.group(2))) if match else None
+
+def fit_dpi(page_size, target_size):
+    """The largest dpi at which a page (in points) fits inside target_size pixels."""
+    return min(target_size[0] * 72 / page_size[0], target_size[1] * 72 / page_size[1])
+
+def pad_to_size(img, size):
+    """Centre an RGBA image horizontally on a transparent canvas of exactly size, top aligned."""
+    if img.size == tuple(size):
+        return img
+    canvas_img = Image.new('RGBA', size, (255, 255, 255, 0))
+    canvas_img.paste(img, ((size[0] - img.width) // 2, 0))
+    return canvas_img
+
+def generate_conky_calendar(year, num_months=6, output_path="conky_calendar.png", image_format="png", colors=DEFAULT_PALETTE_COLORS, size=None, layers=LAYERS, style=CONKY_STYLE, holidays_dict=default_holidays, holidays_by_year=None):
+    """
+    Generate a vertical calendar image for Conky display, starting with the current month.
+    Months are composed from the tile store, so only months not rendered before are drawn;
+    layers selects the layers shown (base, astronomy, personal, today).
+    With size=(width, height) the image is rendered pixel-exact at that size
+    (the size Conky displays it at), otherwise at 200 dpi.
+    style and holidays_dict replace the Conky look and the default holidays;
+    holidays_by_year gives the holidays of single years (see compose_strip).
+    """
+    page_size = (CONKY_STRIP["page_width"], strip_page_height(CONKY_STRIP, num_months))
+    dpi = fit_dpi(page_size, size) if size else 200
     
-    c.save()
+    img = compose_strip(year, datetime.now().month, num_months, style, CONKY_STRIP, holidays_dict, dpi, layers=layers,
+                        holidays_by_year=holidays_by_year)
+    if size:
+        img = pad_to_size(img, size)
     
-    # Convert PDF to PNG
-    images = convert_from_path(tmp_pdf_path, dpi=200)
+    # Save the image
+    save_conky_image(img, output_path, image_format, colors)
+    print(f"Calendar image generated: {output_path}")
     
-    if images:
-        # Convert to RGBA and make white background transparent
-        img = images[0].convert('RGBA')
-        width_img, height_img = img.size
-        pixels = img.load()
-        
-        # Make white and near-white pixels transparent
-        for y in range(height_img):
-            for x in range(width_img):
-                r, g, b, a = pixels[x, y]
-                # Make white background transparent (adjust threshold as needed)
-                if r > 248 and g > 248 and b > 248:
-                    pixels[x, y] = (255, 255, 255, 0)  # Fully transparent
-        
-        # Save the image
-        img.save(output_path, 'PNG')
-        print(f"Calendar image generated: {output_path}")
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the calendar image for the Conky desktop widget.")
+    parser.add_argument("--output", default=None, help="output image (default: conky_calendar.png, or .webp with --format webp)")
+    parser.add_argument("--months", type=int, default=6, help="number of months, starting with the current one")
+    parser.add_argument("--format", choices=IMAGE_FORMATS, default="png", help="png (RGBA), png8 (palette with alpha) or webp (lossless)")
+    parser.add_argument("--colors", type=int, default=DEFAULT_PALETTE_COLORS, help="palette size for png8")
+    parser.add_argument("--report", action="store_true", help="print the file size and decode time of the image")
+    parser.add_argument("--conky-config", default=CONKY_CONFIG_PATH, help="Conky config to read the displayed image size (-s WxH) from")
+    parser.add_argument("--width", type=int, help="image width in pixels (with --height, overrides the Conky config)")
+    parser.add_argument("--height", type=int, help="image height in pixels (with --width, overrides the Conky config)")
+    parser.add_argument("--layers", nargs="+", choices=LAYERS, default=LAYERS, help="layers to show (default: all)")
+    args = parser.parse_args()
     
-    # Clean up temp PDF
-    try:
-        os.unlink(tmp_pdf_path)
-    except:
-        pass
+    size = read_conky_image_size(args.conky_config)
+    if args.width and args.height:
+        size = (args.width, args.height)
+    elif args.width or args.height:
+        parser.error("--width and --height must be given together")
     
-    return output_path
+    output = args.output or f"conky_calendar.{IMAGE_EXTENSIONS[args.format]}"
+    year = datetime.now().year
+    generate_conky_calendar(year, args.months, output, args.format, args.colors, size, args.layers)
+    if args.report and os.path.exists(output):
+        size, decode_ms = image_report(output)
+        print(f"Size: {size / 1024:.1f} KiB, decode: {decode_ms:.2f} ms")
 
 if __name__ == "__main__":
-    year = datetime.now().year
-    generate_conky_calendar(year, num_months=6)
+    main()
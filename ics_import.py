@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Import holidays and birthdays from iCalendar (.ics) files.
+
+The file is read line by line, so exports with tens of thousands of events
+never have to fit in memory as text. Events are indexed by date: one-off
+events are bucketed by year as they are read, yearly recurring events are
+kept as rules and expanded only for the years that are actually rendered.
+"""
+import argparse
+import os
+import time
+from datetime import date, datetime, timedelta
+
+# Longest event expanded into single days (a multi-day holiday, not a whole term)
+MAX_EVENT_DAYS = 366
+
+def unfold_lines(f):
+    """Yields the logical lines of an .ics file, joining folded continuation lines."""
+    pending = None
+    for line in f:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t"):
+            if pending is not None:
+                pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending:
+        yield pending
+
+def split_content_line(line):
+    """
+    Splits a content line into (NAME, {PARAM: value}, value).
+    The value starts at the first colon outside a quoted parameter value.
+    """
+    in_quotes = False
+    for index, ch in enumerate(line):
+        if ch == '"':
+            in_quotes = not in_quotes
+        elif ch == ":" and not in_quotes:
+            break
+    else:
+        return line.upper(), {}, ""
+
+    name, *params = line[:index].split(";")
+    param_dict = {}
+    for param in params:
+        key, _, value = param.partition("=")
+        param_dict[key.upper()] = value.strip('"')
+    return name.upper(), param_dict, line[index + 1:]
+
+def parse_ics_date(value):
+    """Parses a DATE (20260101) or DATE-TIME (20260101T090000[Z]) value into a date."""
+    return datetime.strptime(value.strip()[:8], "%Y%m%d").date()
+
+def parse_rrule(value):
+    """
+    Parses the yearly part of an RRULE into (interval, until date, count).
+    Returns None for other frequencies, which are imported as their first occurrence only.
+    """
+    parts = dict(part.partition("=")[::2] for part in value.upper().split(";") if part)
+    if parts.get("FREQ") != "YEARLY":
+        return None
+    interval = max(1, int(parts.get("INTERVAL") or 1))
+    until = parse_ics_date(parts["UNTIL"]) if parts.get("UNTIL") else None
+    count = int(parts["COUNT"]) if parts.get("COUNT") else None
+    return interval, until, count
+
+def unescape_text(value):
+    """Undoes the TEXT escaping of SUMMARY values."""
+    return (value.replace("\\n", " ").replace("\\N", " ").replace("\\,", ",")
+                 .replace("\\;", ";").replace("\\\\", "\\"))
+
+def iter_ics_events(path):
+    """
+    Yields (start date, number of days, yearly rule or None, summary) for every
+    VEVENT of an .ics file, streaming it line by line. Times are reduced to
+    their date; events that cannot be parsed are skipped.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        event = None
+        depth = 0  # Components nested in the event (VALARM)
+        for line in unfold_lines(f):
+            name, params, value = split_content_line(line)
+            if name == "BEGIN":
+                if value.upper() == "VEVENT":
+                    event = {}
+                elif event is not None:
+                    depth += 1
+            elif name == "END":
+                if value.upper() == "VEVENT" and event is not None:
+                    parsed = finish_event(event)
+                    if parsed:
+                        yield parsed
+                    event = None
+                    depth = 0
+                elif event is not None and depth:
+                    depth -= 1
+            elif event is not None and not depth and name in ("DTSTART", "DTEND", "RRULE", "SUMMARY"):
+                event[name] = (params, value)
+
+def finish_event(event):
+    """Turns the collected properties of a VEVENT into an event tuple (None if unusable)."""
+    if "DTSTART" not in event:
+        return None
+    try:
+        start_params, start_value = event["DTSTART"]
+        start = parse_ics_date(start_value)
+        days = 1
+        if "DTEND" in event:
+            end = parse_ics_date(event["DTEND"][1])
+            # DTEND is exclusive for all-day events and inclusive for timed ones
+            is_date = start_params.get("VALUE", "").upper() == "DATE" or len(start_value.strip()) == 8
+            days = min(MAX_EVENT_DAYS, max(1, (end - start).days + (0 if is_date else 1)))
+        yearly = parse_rrule(event["RRULE"][1]) if "RRULE" in event else None
+    except ValueError:
+        return None
+    summary = unescape_text(event["SUMMARY"][1]) if "SUMMARY" in event else ""
+    return start, days, yearly, summary
+
+def occurrence_date(year, start):
+    """Date of a yearly event in a year; 29 February falls back to the 28th in common years."""
+    try:
+        return date(year, start.month, start.day)
+    except ValueError:
+        return date(year, start.month, 28)
+
+class EventIndex:
+    """
+    Events indexed by date. One-off events are stored per year when added;
+    yearly events are kept as rules and expanded per year on first request,
+    so looking up a year costs the events of that year, not of the whole file.
+    """
+
+    def __init__(self):
+        self.event_count = 0
+        self._dated = {}  # year -> {date: [summaries]}
+        self._yearly = []  # (start, days, interval, until, count, summary)
+        self._years = {}  # year -> {date: [summaries]}, dated and expanded yearly events
+        self._month_days = {}  # year -> {month: [days]}
+
+    def add(self, start, days=1, yearly=None, summary=""):
+        """Add an event (see iter_ics_events for the arguments)."""
+        self.event_count += 1
+        self._years.clear()
+        self._month_days.clear()
+        if yearly:
+            interval, until, count = yearly
+            self._yearly.append((start, days, interval, until, count, summary))
+            return
+        for offset in range(days):
+            day = start + timedelta(days=offset)
+            self._dated.setdefault(day.year, {}).setdefault(day, []).append(summary)
+
+    @property
+    def yearly_count(self):
+        return len(self._yearly)
+
+    def events_for_year(self, year):
+        """Returns {date: [summaries]} of a year, expanding yearly events on first use."""
+        if year not in self._years:
+            events = {day: list(summaries) for day, summaries in self._dated.get(year, {}).items()}
+            # Occurrences of the previous year can run into this one
+            for occurrence_year in (year - 1, year):
+                for start, days, interval, until, count, summary in self._yearly:
+                    step = occurrence_year - start.year
+                    if step < 0 or step % interval or (count is not None and step // interval >= count):
+                        continue
+                    first_day = occurrence_date(occurrence_year, start)
+                    if until is not None and first_day > until:
+                        continue
+                    for offset in range(days):
+                        day = first_day + timedelta(days=offset)
+                        if day.year == year:
+                            events.setdefault(day, []).append(summary)
+            self._years[year] = events
+        return self._years[year]
+
+    def events_on(self, day):
+        """Summaries of the events on a date."""
+        return self.events_for_year(day.year).get(day, [])
+
+    def month_days(self, year):
+        """Returns {month: sorted days with events} of a year, in the format of holidays_dict."""
+        if year not in self._month_days:
+            month_days = {month: set() for month in range(1, 13)}
+            for day in self.events_for_year(year):
+                month_days[day.month].add(day.day)
+            self._month_days[year] = {month: sorted(days) for month, days in month_days.items()}
+        return self._month_days[year]
+
+def read_ics(path):
+    """Read an .ics file into an EventIndex."""
+    index = EventIndex()
+    for start, days, yearly, summary in iter_ics_events(path):
+        index.add(start, days, yearly, summary)
+    return index
+
+# Indexes of files already read: absolute path -> (modification time, size, index)
+_loaded_indexes = {}
+
+def load_event_index(path):
+    """Read an .ics file into an EventIndex, reusing the index while the file is unchanged."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    cached = _loaded_indexes.get(path)
+    if cached and cached[:2] == (stat.st_mtime, stat.st_size):
+        return cached[2]
+    index = read_ics(path)
+    _loaded_indexes[path] = (stat.st_mtime, stat.st_size, index)
+    return index
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the days an iCalendar (.ics) file marks in a year.")
+    parser.add_argument("ics_file")
+    parser.add_argument("--year", type=int, default=date.today().year, help="year to list (default: current year)")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    index = read_ics(args.ics_file)
+    read_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    month_days = index.month_days(args.year)
+    year_time = time.perf_counter() - start_time
+
+    for month in range(1, 13):
+        if month_days[month]:
+            print(f"{month:2d}: {','.join(str(day) for day in month_days[month])}")
+    print(f"{index.event_count} events ({index.yearly_count} yearly), read in {read_time:.2f} s; "
+          f"{args.year} indexed in {year_time * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
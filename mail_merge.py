@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Mail-merge personalized calendars from a CSV of people and birthdays.
+
+The shared calendar base (grid, holidays, astronomy) is drawn once per
+output document as a PDF form; each person's pages reuse that form and
+only add their own birthday markers on top.
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+# Import the calendar generation functions from calendar_gui
+sys.path.append(os.path.dirname(__file__))
+from calendar_gui import (CalendarSettings, draw_birthday_markers, draw_office_page, draw_full_year_page,
+                          office_page_positions, full_year_positions)
+from pdf_stream import StreamingPDFWriter, DEFAULT_CHUNK_PAGES
+
+def parse_month_day(text):
+    """
+    Parses a date given as YYYY-MM-DD, MM-DD or DD.MM[.YYYY] into (month, day).
+    Raises ValueError for anything else.
+    """
+    text = text.strip()
+    if "-" in text:
+        parts = text.split("-")
+        month, day = int(parts[-2]), int(parts[-1])
+    elif "." in text:
+        parts = text.split(".")
+        day, month = int(parts[0]), int(parts[1])
+    else:
+        raise ValueError(f"unrecognized date: {text!r}")
+    if not (1 <= month <= 12 and 1 <= day <= 31):
+        raise ValueError(f"date out of range: {text!r}")
+    return month, day
+
+def read_people_csv(path):
+    """
+    Reads people and their birthdays from a CSV file with a 'name' column and
+    either a 'date' column or 'month' and 'day' columns. Several rows for the
+    same name are merged.
+    Returns ({name: {month: [days]}} in file order, number of skipped rows).
+    """
+    people = {}
+    skipped = 0
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            name = (row.get("name") or "").strip()
+            try:
+                if row.get("date"):
+                    month, day = parse_month_day(row["date"])
+                else:
+                    month, day = parse_month_day(f"{row['month']}-{row['day']}")
+            except (KeyError, TypeError, ValueError):
+                skipped += 1
+                continue
+            if not name:
+                skipped += 1
+                continue
+
+            birthdays = people.setdefault(name, {})
+            if day not in birthdays.setdefault(month, []):
+                birthdays[month].append(day)
+    return people, skipped
+
+def layout_pages(layout):
+    """
+    Pages of a layout as (month positions, page drawing function, first month) tuples,
+    together with the page size.
+    """
+    if layout == "office":
+        pages = [(office_page_positions(month), draw_office_page, month) for month in range(1, 13, 4)]
+        return A4, pages
+    return landscape(A4), [(full_year_positions(), draw_full_year_page, None)]
+
+def draw_base_forms(c, year, pages, options):
+    """
+    Draws every page of the layout, without birthdays, into a PDF form.
+    Returns the form names in page order.
+    """
+    base_options = dict(options, show_birthdays=False)
+    form_names = []
+    for index, (positions, draw_page, first_month) in enumerate(pages):
+        form_name = f"calendar_base_{index}"
+        c.beginForm(form_name)
+        if first_month:
+            draw_page(c, year, first_month, **base_options)
+        else:
+            draw_page(c, year, **base_options)
+        c.endForm()
+        form_names.append(form_name)
+    return form_names
+
+def draw_person_pages(c, year, pagesize, pages, form_names, name, birthdays, options):
+    """Draws one person's pages: the shared base form plus their birthday markers."""
+    page_width, page_height = pagesize
+    for form_name, (positions, draw_page, first_month) in zip(form_names, pages):
+        c.doForm(form_name)
+
+        for month, month_x, month_y, width_offset, height_offset in positions:
+            if birthdays.get(month):
+                draw_birthday_markers(c, year, month, month_x, month_y, width_offset, height_offset,
+                                      birthdays[month], options["day_font"], options["birthday_square_color"])
+
+        # Name of the person in the top left corner
+        c.setFont("Helvetica", 9)
+        c.setFillColorRGB(0.4, 0.4, 0.4)
+        c.drawString(1 * cm, page_height - 0.8 * cm, name)
+        c.showPage()
+
+def render_document(output_path, people, year, layout, settings_values):
+    """
+    Renders the calendars of the given (name, birthdays) pairs into one PDF.
+    Returns the number of pages written.
+    """
+    options = CalendarSettings(settings_values).render_options()
+    pagesize, pages = layout_pages(layout)
+    c = canvas.Canvas(output_path, pagesize=pagesize)
+    form_names = draw_base_forms(c, year, pages, options)
+    for name, birthdays in people:
+        draw_person_pages(c, year, pagesize, pages, form_names, name, birthdays, options)
+    c.save()
+    return len(people) * len(pages)
+
+def render_person_files(people_paths, year, layout, settings_values):
+    """
+    Worker: renders one PDF per person, given as (name, birthdays, output path) tuples.
+    The chunk is rendered as a single document (so the base is drawn once) and
+    split into per-person files; without pypdf each file is rendered on its own.
+    Returns the number of pages written.
+    """
+    people = [(name, birthdays) for name, birthdays, output_path in people_paths]
+    try:
+        from pypdf import PdfReader, PdfWriter
+    except ImportError:
+        return sum(render_document(output_path, [(name, birthdays)], year, layout, settings_values)
+                   for name, birthdays, output_path in people_paths)
+
+    with tempfile.NamedTemporaryFile(suffix='_merge_chunk.pdf', delete=False) as tmp_pdf:
+        tmp_pdf_path = tmp_pdf.name
+    try:
+        page_count = render_document(tmp_pdf_path, people, year, layout, settings_values)
+        pages_per_person = page_count // max(1, len(people))
+        reader = PdfReader(tmp_pdf_path)
+        for index, (name, birthdays, output_path) in enumerate(people_paths):
+            writer = PdfWriter()
+            for page in reader.pages[index * pages_per_person:(index + 1) * pages_per_person]:
+                writer.add_page(page)
+            with open(output_path, "wb") as f:
+                writer.write(f)
+    finally:
+        try:
+            os.unlink(tmp_pdf_path)
+        except:
+            pass
+    return page_count
+
+def safe_filename(name):
+    """Turns a person's name into a file name component."""
+    cleaned = "".join(ch if ch.isalnum() or ch in "-_" else "_" for ch in name.strip())
+    return cleaned or "unnamed"
+
+def split_chunks(items, count):
+    """Splits a list into at most count contiguous chunks of similar size."""
+    count = max(1, min(count, len(items)))
+    size, extra = divmod(len(items), count)
+    chunks = []
+    start = 0
+    for index in range(count):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(items[start:end])
+        start = end
+    return chunks
+
+def mail_merge(people, year, layout="full", output=None, output_dir=None, jobs=None, settings_values=None, chunk_pages=DEFAULT_CHUNK_PAGES):
+    """
+    Renders personalized calendars, either all into one multi-document PDF
+    (output) or one PDF per person (output_dir), in parallel worker processes.
+    A single PDF is rendered in parts of at most chunk_pages pages that are
+    appended to the output in order, so memory stays bounded for any size.
+    Returns (number of calendars, number of pages, elapsed seconds).
+    """
+    jobs = jobs or os.cpu_count() or 1
+    settings_values = dict(settings_values or {}, show_birthdays=True)
+    people = list(people.items())
+    pages_per_person = len(layout_pages(layout)[1])
+    start_time = time.perf_counter()
+
+    part_paths = []
+    writer = None
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+        people_paths = [(name, birthdays, os.path.join(output_dir, f"calendar_{year}_{safe_filename(name)}.pdf"))
+                        for name, birthdays in people]
+        # Several chunks per worker keep all cores busy until the end
+        tasks = [(render_person_files, chunk) for chunk in split_chunks(people_paths, jobs * 4)]
+    else:
+        part_count = max(jobs, -(-len(people) * pages_per_person // chunk_pages))
+        tasks = []
+        for people_chunk in split_chunks(people, part_count):
+            with tempfile.NamedTemporaryFile(suffix='_merge_part.pdf', delete=False) as tmp_pdf:
+                part_paths.append(tmp_pdf.name)
+            tasks.append((render_document, part_paths[-1], people_chunk))
+        writer = StreamingPDFWriter(output)
+
+    executor = None
+    try:
+        if jobs == 1:
+            results = (task[0](*task[1:], year, layout, settings_values) for task in tasks)
+        else:
+            executor = ProcessPoolExecutor(max_workers=jobs)
+            futures = [executor.submit(*task, year, layout, settings_values) for task in tasks]
+            results = (future.result() for future in futures)
+
+        # Parts are appended in order as soon as they are done
+        page_count = 0
+        for index, pages in enumerate(results):
+            page_count += pages
+            if writer is not None:
+                writer.append(part_paths[index])
+                os.unlink(part_paths[index])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        if writer is not None:
+            writer.close()
+        # Clean up part files
+        for part_path in part_paths:
+            try:
+                os.unlink(part_path)
+            except:
+                pass
+
+    return len(people), page_count, time.perf_counter() - start_time
+
+def main():
+    parser = argparse.ArgumentParser(description="Mail-merge personalized calendars from a CSV of people and birthdays.")
+    parser.add_argument("csv_file", help="CSV with a 'name' column and a 'date' column (or 'month' and 'day' columns)")
+    parser.add_argument("--year", type=int, default=CalendarSettings().year, help="calendar year (default: current year)")
+    parser.add_argument("--layout", choices=["full", "office"], default="full", help="12 months/page (full) or 4 months/page (office)")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--output", help="write all calendars into this PDF (default: calendar_<year>_merged.pdf)")
+    target.add_argument("--output-dir", help="write one PDF per person into this directory")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: number of cores)")
+    parser.add_argument("--settings", help="JSON file with calendar settings keyed by GUI field name")
+    parser.add_argument("--chunk-pages", type=int, default=DEFAULT_CHUNK_PAGES, help="pages per part when writing a single PDF")
+    args = parser.parse_args()
+
+    settings_values = {}
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as f:
+            settings_values = json.load(f)
+
+    people, skipped = read_people_csv(args.csv_file)
+    if skipped:
+        print(f"Skipped {skipped} rows without a valid name and date")
+    if not people:
+        print("No people found, nothing to do.")
+        return
+
+    output = args.output or (None if args.output_dir else f"calendar_{args.year}_merged.pdf")
+    count, pages, elapsed = mail_merge(people, args.year, args.layout, output, args.output_dir, args.jobs, settings_values, args.chunk_pages)
+
+    print(f"Generated {count} calendars ({pages} pages) into {output or args.output_dir}")
+    print(f"Time: {elapsed:.2f} s, {count / elapsed:.1f} calendars/s, {pages / elapsed:.1f} pages/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Bounded-memory output for very large PDF jobs.
+
+ReportLab's canvas keeps every page in memory until save(). Large jobs are
+rendered in chunks of pages instead: each chunk is saved to a temporary PDF,
+appended to the output file and deleted, so peak memory depends on the
+chunk size and not on the total number of pages.
+"""
+import argparse
+import os
+import re
+import sys
+import tempfile
+import time
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+# Import the calendar generation functions from calendar_gui
+sys.path.append(os.path.dirname(__file__))
+from calendar_gui import CalendarSettings, draw_office_page, draw_full_year_page
+
+# Pages rendered per temporary chunk document
+DEFAULT_CHUNK_PAGES = 200
+
+_reference_pattern = re.compile(rb"(\d+) 0 R")
+_type_pattern = re.compile(rb"/Type\s*/(\w+)")
+
+class StreamingPDFWriter:
+    """
+    Concatenates ReportLab-generated PDFs into one document, one input at a time.
+    Objects are renumbered and written straight to the output; only their
+    offsets and the page numbers are kept in memory.
+    """
+
+    def __init__(self, output_path):
+        self._file = open(output_path, "wb")
+        self._file.write(b"%PDF-1.4\n%\x93\x8c\x8b\x9e\n")
+        self._offsets = {}
+        self._page_numbers = []
+        # Object 1 is the catalog and object 2 the page tree, both written on close()
+        self._next_number = 3
+
+    def append(self, pdf_path):
+        """Append every page of a ReportLab-generated PDF."""
+        with open(pdf_path, "rb") as f:
+            data = f.read()
+
+        objects = read_pdf_objects(data)
+        root = int(re.search(rb"/Root (\d+) 0 R", data[data.rindex(b"trailer"):]).group(1))
+        info = re.search(rb"/Info (\d+) 0 R", data[data.rindex(b"trailer"):])
+
+        # Collect the pages in order, and the page tree nodes that are replaced by ours
+        page_tree_root = int(re.search(rb"/Pages (\d+) 0 R", objects[root]).group(1))
+        page_tree_nodes = set()
+        pages = []
+        pending = [page_tree_root]
+        while pending:
+            number = pending.pop(0)
+            body = objects[number]
+            if object_type(body) == b"Pages":
+                page_tree_nodes.add(number)
+                kids = re.search(rb"/Kids\s*\[([^\]]*)\]", body).group(1)
+                pending = [int(kid) for kid in _reference_pattern.findall(kids)] + pending
+            else:
+                pages.append(number)
+
+        skipped = page_tree_nodes | {root}
+        if info:
+            skipped.add(int(info.group(1)))
+
+        base = self._next_number
+        renumber = lambda number: 2 if number in page_tree_nodes else base + number
+        for number, body in objects.items():
+            if number in skipped:
+                continue
+            self._write_object(renumber(number), remap_references(body, renumber))
+
+        self._page_numbers.extend(renumber(number) for number in pages)
+        self._next_number = base + max(objects) + 1
+
+    def close(self):
+        """Write the page tree, catalog, cross-reference table and trailer."""
+        kids = b" ".join(b"%d 0 R" % number for number in self._page_numbers)
+        self._write_object(2, b"<< /Type /Pages /Count %d /Kids [ %s ] >>" % (len(self._page_numbers), kids))
+        self._write_object(1, b"<< /Type /Catalog /Pages 2 0 R >>")
+
+        xref_offset = self._file.tell()
+        size = self._next_number
+        self._file.write(b"xref\n0 %d\n0000000000 65535 f \n" % size)
+        for number in range(1, size):
+            if number in self._offsets:
+                self._file.write(b"%010d 00000 n \n" % self._offsets[number])
+            else:
+                self._file.write(b"0000000000 65535 f \n")
+        self._file.write(b"trailer\n<< /Root 1 0 R /Size %d >>\nstartxref\n%d\n%%%%EOF\n" % (size, xref_offset))
+        self._file.close()
+
+    @property
+    def page_count(self):
+        return len(self._page_numbers)
+
+    def _write_object(self, number, body):
+        self._offsets[number] = self._file.tell()
+        self._file.write(b"%d 0 obj\n" % number)
+        self._file.write(body)
+        self._file.write(b"\nendobj\n")
+
+def read_pdf_objects(data):
+    """
+    Read the objects of a PDF with a plain cross-reference table (as written by ReportLab).
+    Returns {object number: object body}.
+    """
+    xref_offset = int(data[data.rindex(b"startxref") + 9:].split()[0])
+    lines = data[xref_offset:data.index(b"trailer", xref_offset)].split(b"\n")
+    first, count = (int(value) for value in lines[1].split())
+    offsets = {}
+    for index, line in enumerate(lines[2:2 + count]):
+        fields = line.split()
+        if len(fields) == 3 and fields[2] == b"n":
+            offsets[first + index] = int(fields[0])
+
+    # Each object ends where the next one (or the cross-reference table) starts
+    starts = sorted(offsets.values())
+    ends = dict(zip(starts, starts[1:] + [xref_offset]))
+    objects = {}
+    for number, offset in offsets.items():
+        body = data[offset:ends[offset]]
+        body = body[body.index(b"obj") + 3:body.rindex(b"endobj")].strip()
+        objects[number] = body
+    return objects
+
+def object_type(body):
+    """The /Type name of an object dictionary, if any."""
+    match = _type_pattern.search(object_dictionary(body))
+    return match.group(1) if match else None
+
+def object_dictionary(body):
+    """The part of an object before its stream data."""
+    stream_start = body.find(b"stream")
+    return body if stream_start < 0 else body[:stream_start]
+
+def remap_references(body, renumber):
+    """Renumber the indirect references of an object, leaving its stream data untouched."""
+    dictionary = object_dictionary(body)
+    remapped = _reference_pattern.sub(lambda match: b"%d 0 R" % renumber(int(match.group(1))), dictionary)
+    return remapped + body[len(dictionary):]
+
+def render_pages_streaming(output_path, pagesize, page_drawers, chunk_pages=DEFAULT_CHUNK_PAGES):
+    """
+    Render pages, given as callables that draw one page on a canvas, into output_path.
+    Every chunk_pages pages are saved to a temporary PDF and appended to the output.
+    Returns the number of pages written.
+    """
+    writer = StreamingPDFWriter(output_path)
+    c = None
+    chunk_path = None
+    pages_in_chunk = 0
+
+    try:
+        for draw_page in page_drawers:
+            if c is None:
+                with tempfile.NamedTemporaryFile(suffix='_chunk.pdf', delete=False) as tmp_pdf:
+                    chunk_path = tmp_pdf.name
+                c = canvas.Canvas(chunk_path, pagesize=pagesize)
+
+            draw_page(c)
+            c.showPage()
+            pages_in_chunk += 1
+
+            if pages_in_chunk == chunk_pages:
+                c.save()
+                writer.append(chunk_path)
+                os.unlink(chunk_path)
+                c, chunk_path, pages_in_chunk = None, None, 0
+
+        if c is not None:
+            c.save()
+            writer.append(chunk_path)
+    finally:
+        # Clean up the chunk left over by an error (or the last one)
+        if chunk_path is not None:
+            try:
+                os.unlink(chunk_path)
+            except:
+                pass
+        writer.close()
+
+    return writer.page_count
+
+def create_multi_year_calendar_pdf(filename, first_year, last_year, layout="office", chunk_pages=DEFAULT_CHUNK_PAGES, **options):
+    """
+    Creates one PDF with the calendars of a range of years, with bounded memory.
+    options are the draw_calendar() keyword arguments (including holidays_dict).
+    Returns the number of pages written.
+    """
+    if layout == "office":
+        pagesize = A4
+        page_drawers = (lambda c, year=year, month=month: draw_office_page(c, year, month, **options)
+                        for year in range(first_year, last_year + 1) for month in range(1, 13, 4))
+    else:
+        pagesize = landscape(A4)
+        page_drawers = (lambda c, year=year: draw_full_year_page(c, year, **options)
+                        for year in range(first_year, last_year + 1))
+    return render_pages_streaming(filename, pagesize, page_drawers, chunk_pages)
+
+def main():
+    parser = argparse.ArgumentParser(description="Render calendars for a range of years into one PDF with bounded memory.")
+    parser.add_argument("first_year", type=int)
+    parser.add_argument("last_year", type=int)
+    parser.add_argument("--layout", choices=["office", "full"], default="office", help="4 months/page (office) or 12 months/page (full)")
+    parser.add_argument("--output", help="output PDF (default: calendar_<first>_<last>.pdf)")
+    parser.add_argument("--chunk-pages", type=int, default=DEFAULT_CHUNK_PAGES, help="pages rendered per temporary chunk")
+    parser.add_argument("--memory-report", action="store_true", help="trace Python memory and report the peak")
+    args = parser.parse_args()
+
+    output = args.output or f"calendar_{args.first_year}_{args.last_year}.pdf"
+    options = CalendarSettings().render_options()
+
+    if args.memory_report:
+        import tracemalloc
+        tracemalloc.start()
+
+    start_time = time.perf_counter()
+    pages = create_multi_year_calendar_pdf(output, args.first_year, args.last_year, args.layout, args.chunk_pages, **options)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"Generated {output}: {pages} pages in {elapsed:.1f} s ({pages / elapsed:.0f} pages/s)")
+    if args.memory_report:
+        current, peak = tracemalloc.get_traced_memory()
+        print(f"Peak traced memory: {peak / 1024 / 1024:.1f} MB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Settings model updates from widget callbacks.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import calendar_gui
+
+@pytest.fixture
+def settings(monkeypatch):
+    """A fresh settings model in place of the GUI's, with live previews switched off."""
+    settings = calendar_gui.CalendarSettings()
+    monkeypatch.setattr(calendar_gui, "gui_settings", settings)
+    monkeypatch.setattr(calendar_gui, "schedule_live_preview", lambda: None)
+    return settings
+
+def test_color_callback_value_is_read_from_the_widget(settings, monkeypatch):
+    # A color_edit callback passes 0-1 floats, get_value returns 0-255
+    monkeypatch.setattr(calendar_gui.dpg, "get_value", lambda tag: [51.0, 102.0, 255.0, 255.0])
+    calendar_gui.setting_changed("bg_color", [0.2, 0.4, 1.0, 1.0])
+    assert settings.values["bg_color"] == pytest.approx((0.2, 0.4, 1.0))
+    assert settings.render_options()["bg_color"] == pytest.approx((0.2, 0.4, 1.0))
+
+def test_other_callback_values_are_used_as_passed(settings, monkeypatch):
+    monkeypatch.setattr(calendar_gui.dpg, "get_value", lambda tag: pytest.fail("get_value called"))
+    calendar_gui.setting_changed("day_font_size", 14)
+    assert settings.values["day_font_size"] == 14
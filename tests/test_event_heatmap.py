@@ -0,0 +1,65 @@
+"""
+Day counts to heatmap colours and legend labels.
+"""
+import math
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from event_heatmap import heatmap_colors, level_ranges, ramp_colors
+
+YEAR = 2026
+
+def year_counts(day_counts):
+    """Per-day counts of YEAR from {date: count}."""
+    counts = np.zeros(365, dtype=np.int64)
+    for day, count in day_counts.items():
+        counts[day.timetuple().tm_yday - 1] = count
+    return counts
+
+def color_of(cell_colors, day):
+    return cell_colors[day.month].get(day.day)
+
+def test_fewer_counts_than_levels_use_one_level_per_count():
+    jan1, jan2, jan3 = date(YEAR, 1, 1), date(YEAR, 1, 2), date(YEAR, 1, 3)
+    cell_colors, labels = heatmap_colors(YEAR, year_counts({jan1: 1, jan2: 2, jan3: 2}), levels=3)
+    colors = [tuple(color) for color in ramp_colors(2).tolist()]
+    assert labels == ["1", "2"]
+    assert color_of(cell_colors, jan1) == colors[0]
+    assert color_of(cell_colors, jan2) == colors[1]
+
+def test_count_gets_the_colour_of_its_label():
+    days = {date(YEAR, 3, day): day for day in range(1, 5)}
+    cell_colors, labels = heatmap_colors(YEAR, year_counts(days))
+    colors = [tuple(color) for color in ramp_colors(4).tolist()]
+    assert labels == ["1", "2", "3", "4"]
+    assert color_of(cell_colors, date(YEAR, 3, 3)) == colors[labels.index("3")]
+    assert color_of(cell_colors, date(YEAR, 3, 5)) is None
+
+def test_ranges_of_several_counts_per_level():
+    days = {date(YEAR, 5, day): day for day in range(1, 11)}
+    cell_colors, labels = heatmap_colors(YEAR, year_counts(days), levels=3)
+    colors = [tuple(color) for color in ramp_colors(3).tolist()]
+    assert labels == ["1-3", "4-6", "7-10"]
+    assert color_of(cell_colors, date(YEAR, 5, 3)) == colors[0]
+    assert color_of(cell_colors, date(YEAR, 5, 4)) == colors[1]
+    assert color_of(cell_colors, date(YEAR, 5, 10)) == colors[2]
+
+def test_counts_above_max_count_share_the_last_level():
+    days = {date(YEAR, 7, 1): 5, date(YEAR, 7, 2): 9}
+    cell_colors, labels = heatmap_colors(YEAR, year_counts(days), levels=3, max_count=5)
+    assert labels == ["1", "2-3", "4+"]
+    assert color_of(cell_colors, date(YEAR, 7, 1)) == color_of(cell_colors, date(YEAR, 7, 2))
+
+@pytest.mark.parametrize("levels, max_count", [(3, 2), (6, 4), (6, 7), (6, 100), (8, 13)])
+def test_level_ranges_match_the_binning(levels, max_count):
+    levels = min(levels, max_count)
+    ranges = level_ranges(levels, max_count)
+    for count in range(1, max_count + 1):
+        lowest, highest = ranges[math.ceil(count * levels / max_count) - 1]
+        assert lowest <= count <= highest
+    assert all(lowest <= highest for lowest, highest in ranges)
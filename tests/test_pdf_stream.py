@@ -0,0 +1,65 @@
+"""
+Memory test of the streaming PDF output: a 5,000-page job must not keep its
+pages in memory, unlike a single ReportLab canvas.
+"""
+import os
+import sys
+import tracemalloc
+
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pdf_stream import render_pages_streaming
+
+PAGES = 5000
+BASELINE_PAGES = 1000
+CHUNK_PAGES = 200
+
+# Peak traced memory allowed for the streamed job, whatever its page count
+PEAK_BOUND = 8 * 1024 * 1024
+
+def draw_page(c, index):
+    c.setFont("Helvetica", 12)
+    c.drawString(100, 700, f"Page {index}")
+    for k in range(10):
+        c.rect(50 + k * 20, 100, 15, 15, fill=1)
+
+def traced_peak(function):
+    """Peak traced memory (bytes) while running function."""
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def test_streaming_memory_is_bounded(tmp_path):
+    output = tmp_path / "streamed.pdf"
+    baseline_output = tmp_path / "single_canvas.pdf"
+
+    def single_canvas():
+        c = canvas.Canvas(str(baseline_output), pagesize=A4)
+        for index in range(BASELINE_PAGES):
+            draw_page(c, index)
+            c.showPage()
+        c.save()
+
+    def streamed():
+        page_drawers = (lambda c, index=index: draw_page(c, index) for index in range(PAGES))
+        assert render_pages_streaming(str(output), A4, page_drawers, CHUNK_PAGES) == PAGES
+
+    baseline_peak = traced_peak(single_canvas)
+    streamed_peak = traced_peak(streamed)
+
+    # Five times the pages of the single-canvas baseline, in less memory than it
+    assert streamed_peak < PEAK_BOUND
+    assert streamed_peak < baseline_peak
+
+    reader = PdfReader(str(output))
+    assert len(reader.pages) == PAGES
+    for page in reader.pages:
+        assert page.get_contents() is not None
+    assert "Page 0" in reader.pages[0].extract_text()
+    assert f"Page {PAGES - 1}" in reader.pages[-1].extract_text()
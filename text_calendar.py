@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Render the calendar as text: plain, ANSI-coloured for terminals, or with
+Conky ${color} markup for execpi. Uses the same month layout, holidays and
+astronomy data as the PDF calendar, without any PDF or image work.
+"""
+import argparse
+import os
+import sys
+from calendar import month_name
+from datetime import date
+
+sys.path.append(os.path.dirname(__file__))
+from calendar_layout import default_holidays, equinoxes_solstices, moon_phases, month_layout
+
+DAY_NAMES = ["Mo", "Tu", "We", "Th", "Fr", "Sa", "Su"]
+
+# Marker printed after a day number
+MOON_GLYPHS = {'new': '●', 'first': '◐', 'full': '○', 'last': '◑'}
+EQUINOX_MARK = '*'
+
+# Colour of each text role: (ANSI SGR parameters, Conky colour)
+TEXT_COLORS = {
+    "title": ("1", "#FFFFFF"),
+    "header": ("1", "#BBBBBB"),
+    "week_number": ("2", "#808080"),
+    "normal": ("", "#EEEEEE"),
+    "saturday": ("90", "#999999"),
+    "sunday": ("31", "#E05050"),
+    "holiday": ("1;31", "#FF6060"),
+    "today": ("7", "#FFD700"),
+    "moon": ("34", "#8080FF"),
+    "equinox": ("33", "#E0A030"),
+}
+
+FORMATS = ["plain", "ansi", "conky"]
+
+def colorize(text, role, output_format):
+    """Wraps text in the colour codes of a role for the output format."""
+    if output_format == "ansi":
+        code = TEXT_COLORS[role][0]
+        return f"\033[{code}m{text}\033[0m" if code else text
+    if output_format == "conky":
+        return f"${{color {TEXT_COLORS[role][1]}}}{text}${{color}}"
+    return text
+
+def day_role(day, column, month_holidays, highlight_holidays, is_today):
+    """Colour role of a day number, with the same priorities as the PDF calendar."""
+    if is_today:
+        return "today"
+    if highlight_holidays and day in month_holidays:
+        return "holiday"
+    if column == 5:
+        return "saturday"
+    if column == 6:
+        return "sunday"
+    return "normal"
+
+def format_month(year, month, holidays_dict=default_holidays, output_format="plain", show_week_numbers=True, highlight_holidays=True, show_equinoxes=True, show_moon_phases=True, today=None):
+    """
+    Returns the lines of one month. Every day takes three columns: the day
+    number and a marker (moon phase glyph or equinox star).
+    """
+    today = today or date.today()
+    month_holidays = holidays_dict.get(month, [])
+    month_moon_phases = {day: phase_type for day, phase_type in moon_phases(year).get(month, [])} if show_moon_phases else {}
+    month_equinoxes = equinoxes_solstices(year).get(month, []) if show_equinoxes else []
+    prefix_width = 3 if show_week_numbers else 0
+
+    title = f"{month_name[month]} {year}".center(prefix_width + 7 * 3).rstrip()
+    lines = [colorize(title, "title", output_format)]
+    header = " " * prefix_width + " ".join(DAY_NAMES)
+    lines.append(colorize(header, "header", output_format))
+
+    for week_number, week in month_layout(year, month):
+        parts = []
+        if show_week_numbers:
+            parts.append(colorize(f"{week_number:>2}", "week_number", output_format) + " ")
+        for column, day in enumerate(week):
+            if day == 0:
+                parts.append("   ")
+                continue
+            is_today = (year, month, day) == (today.year, today.month, today.day)
+            parts.append(colorize(f"{day:>2}", day_role(day, column, month_holidays, highlight_holidays, is_today), output_format))
+            if day in month_moon_phases:
+                parts.append(colorize(MOON_GLYPHS[month_moon_phases[day]], "moon", output_format))
+            elif day in month_equinoxes:
+                parts.append(colorize(EQUINOX_MARK, "equinox", output_format))
+            else:
+                parts.append(" ")
+        lines.append("".join(parts).rstrip())
+    return lines
+
+def format_months(year, first_month, num_months=1, **options):
+    """Returns the text of consecutive months, continuing into the next year if needed."""
+    blocks = []
+    for i in range(num_months):
+        month_year, month_index = divmod(first_month - 1 + i, 12)
+        blocks.append("\n".join(format_month(year + month_year, month_index + 1, **options)))
+    return "\n\n".join(blocks)
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the calendar as text for terminals or Conky (execpi).")
+    parser.add_argument("--format", choices=FORMATS, default=None, help="output format (default: ansi on a terminal, plain otherwise)")
+    parser.add_argument("--year", type=int, default=None, help="year of the first month (default: current year)")
+    parser.add_argument("--month", type=int, default=None, help="first month (default: current month)")
+    parser.add_argument("--months", type=int, default=1, help="number of months to print")
+    parser.add_argument("--no-week-numbers", action="store_true", help="hide the week numbers")
+    parser.add_argument("--no-moon-phases", action="store_true", help="hide the moon phase glyphs")
+    parser.add_argument("--no-equinoxes", action="store_true", help="hide the equinox and solstice markers")
+    parser.add_argument("--font", help="Conky font for the calendar, e.g. 'DejaVu Sans Mono:size=9' (conky format only)")
+    args = parser.parse_args()
+
+    output_format = args.format or ("ansi" if sys.stdout.isatty() else "plain")
+    today = date.today()
+    text = format_months(args.year or today.year, args.month or today.month, args.months,
+                         output_format=output_format,
+                         show_week_numbers=not args.no_week_numbers,
+                         show_equinoxes=not args.no_equinoxes,
+                         show_moon_phases=not args.no_moon_phases,
+                         today=today)
+    if output_format == "conky" and args.font:
+        text = f"${{font {args.font}}}{text}${{font}}"
+    print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Persistent month tiles for the vertical Conky and desktop calendar strips.
+
+Every month is rendered once as independent transparent tiles, one per
+layer (base grid and holidays, astronomy markers, personal events), and
+kept on disk as raw RGBA NumPy arrays (loaded memory-mapped). A strip of
+consecutive months is composed from tiles, continuing into the next year
+after December, so moving the window forward by a month renders only the
+new month, and toggling a layer or moving the "today" marker renders
+nothing at all.
+"""
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import numpy as np
+from datetime import date
+from PIL import Image, ImageDraw
+from reportlab.lib.units import cm
+from reportlab.pdfgen import canvas
+
+sys.path.append(os.path.dirname(__file__))
+from calendar_gui import (draw_calendar, draw_birthday_markers, draw_equinox_markers, draw_moon_phase_markers,
+                          day_position)
+from calendar_layout import equinoxes_solstices, moon_phases, month_layout
+from font_cache import CACHE_DIR
+
+TILE_DIR = os.path.join(CACHE_DIR, "tiles")
+
+# Vertical extent of a month tile around the y passed to draw_calendar:
+# from below the sixth week row up to above the month title
+TILE_BOTTOM = 1.2 * cm
+TILE_TOP = 7.6 * cm
+
+# Geometry of the vertical strips, in points: page width, distance between
+# months, space above the first month, and the x/y offsets passed to draw_calendar
+CONKY_STRIP = {"page_width": 7.5 * cm, "month_height": 5.2 * cm, "top_margin": 1 * cm, "x": 0.25 * cm, "y_offset": 0.6 * cm}
+DESKTOP_STRIP = {"page_width": 8 * cm, "month_height": 5.5 * cm, "top_margin": 0.8 * cm, "x": 0.3 * cm, "y_offset": 0.5 * cm}
+
+# Layers from bottom to top; "today" is drawn at compose time and never stored
+LAYERS = ["base", "astronomy", "personal", "today"]
+
+# Style keys each stored layer depends on
+LAYER_SETTINGS = {
+    "base": ["month_font", "day_font", "normal_text_color", "weekend_bg_color", "holiday_bg_color",
+             "week_num_text_color", "week_num_bg_color", "show_week_numbers", "highlight_holidays"],
+    "astronomy": ["day_font", "show_equinoxes", "equinox_circle_color", "show_moon_phases", "moon_phase_color", "moon_phase_size"],
+    "personal": ["day_font", "show_birthdays", "birthday_square_color"],
+}
+
+# Outline of today's day cell
+TODAY_COLOR = (0.85, 0.55, 0)
+
+def make_background_transparent(image, threshold=248):
+    """Return an RGBA copy of the image with white and near-white pixels fully transparent."""
+    pixels = np.array(image.convert('RGBA'))
+    background = (pixels[:, :, :3] > threshold).all(axis=2)
+    pixels[background] = (255, 255, 255, 0)
+    return Image.fromarray(pixels, 'RGBA')
+
+def strip_page_height(strip, num_months):
+    """Height of a strip of num_months months, in points."""
+    return strip["month_height"] * num_months + strip["top_margin"]
+
+def strip_month_positions(strip, year, first_month, num_months):
+    """
+    Returns (year, month, y) for each month of a strip, y in PDF points from the bottom.
+    Months after December continue in the next year.
+    """
+    page_height = strip_page_height(strip, num_months)
+    positions = []
+    for i in range(num_months):
+        month_year, month_index = divmod(first_month - 1 + i, 12)
+        y = page_height - strip["top_margin"] - (i + 1) * strip["month_height"] + strip["y_offset"]
+        positions.append((year + month_year, month_index + 1, y))
+    return positions
+
+def tile_pixel_size(strip, dpi):
+    """Pixel size of a month tile at the given dpi."""
+    return int(round(strip["page_width"] / 72 * dpi)), int(round((TILE_TOP - TILE_BOTTOM) / 72 * dpi))
+
+def layer_enabled(layer, style):
+    """Whether a layer has anything to draw with the given style."""
+    if layer == "astronomy":
+        return style["show_equinoxes"] or style["show_moon_phases"]
+    if layer == "personal":
+        return style["show_birthdays"]
+    return True
+
+def layer_data(layer, year, month, style, holidays_dict):
+    """The month data a stored layer is drawn from."""
+    if layer == "base":
+        return {"holidays": holidays_dict.get(month, [])}
+    if layer == "astronomy":
+        return {"moon_phases": moon_phases(year).get(month, []), "equinoxes": equinoxes_solstices(year).get(month, [])}
+    return {"birthdays": style["birthdays_dict"].get(month, [])}
+
+def tile_key(year, month, layer, style, strip, holidays_dict):
+    """
+    Hash of everything a layer tile depends on: the layer's style keys, the
+    strip geometry and the month data the layer shows.
+    """
+    data = {
+        "year": year,
+        "month": month,
+        "layer": layer,
+        "style": {name: style[name] for name in LAYER_SETTINGS[layer]},
+        "strip": strip,
+        "data": layer_data(layer, year, month, style, holidays_dict),
+    }
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+def tile_path(year, month, layer, key, size):
+    """Cache file of a layer tile."""
+    return os.path.join(TILE_DIR, f"{year}_{month:02d}_{layer}_{size[0]}x{size[1]}_{key}.npy")
+
+def remove_superseded_tiles(year, month, layer, path, size):
+    """
+    Delete the older tiles of the same month, layer and size (the ones with other keys),
+    so edits to the style or the day lists do not pile up tiles on disk.
+    """
+    pattern = os.path.join(TILE_DIR, f"{year}_{month:02d}_{layer}_{size[0]}x{size[1]}_*.npy")
+    for old_path in glob.glob(pattern):
+        # Skip tiles other processes are still writing
+        if old_path != path and ".tmp." not in os.path.basename(old_path):
+            try:
+                os.unlink(old_path)
+            except:
+                pass
+
+def draw_layer(c, layer, year, month, x, y, style, holidays_dict):
+    """Draw one stored layer of a month, as draw_calendar would draw that part."""
+    if layer == "base":
+        # Drawn on white, which becomes transparent so overlapping tiles compose cleanly
+        base_style = dict(style, bg_color=(1, 1, 1), show_equinoxes=False, show_moon_phases=False, show_birthdays=False)
+        draw_calendar(c, year, month, x, y, 0, 0, holidays_dict, **base_style)
+    elif layer == "astronomy":
+        if style["show_equinoxes"]:
+            draw_equinox_markers(c, year, month, x, y, 0, 0, style["day_font"], style["equinox_circle_color"])
+        if style["show_moon_phases"]:
+            draw_moon_phase_markers(c, year, month, x, y, 0, 0, style["moon_phase_color"], style["moon_phase_size"])
+    elif layer == "personal":
+        draw_birthday_markers(c, year, month, x, y, 0, 0, style["birthdays_dict"].get(month, []),
+                              style["day_font"], style["birthday_square_color"])
+
+def render_tiles(tiles, style, strip, size):
+    """
+    Render layer tiles, given as (year, month, layer, path, holidays_dict) tuples, into the store.
+    All missing tiles are drawn into one PDF and rasterized in a single pass.
+    """
+    from pdf2image import convert_from_path
+
+    tile_height = TILE_TOP - TILE_BOTTOM
+
+    with tempfile.NamedTemporaryFile(suffix='_tiles.pdf', delete=False) as tmp_pdf:
+        tmp_pdf_path = tmp_pdf.name
+    try:
+        c = canvas.Canvas(tmp_pdf_path, pagesize=(strip["page_width"], tile_height))
+        for year, month, layer, path, holidays_dict in tiles:
+            draw_layer(c, layer, year, month, strip["x"], -TILE_BOTTOM, style, holidays_dict)
+            c.showPage()
+        c.save()
+
+        images = convert_from_path(tmp_pdf_path, size=size)
+        os.makedirs(TILE_DIR, exist_ok=True)
+        for (year, month, layer, path, holidays_dict), image in zip(tiles, images):
+            pixels = np.asarray(make_background_transparent(image))
+            # Write under a temporary name so readers never see a partial tile
+            tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+            np.save(tmp_path, pixels)
+            os.replace(tmp_path, path)
+            remove_superseded_tiles(year, month, layer, path, size)
+    finally:
+        try:
+            os.unlink(tmp_pdf_path)
+        except:
+            pass
+
+def load_tile(path):
+    """Map a stored tile into memory as a read-only (height, width, 4) uint8 array."""
+    return np.load(path, mmap_mode="r")
+
+def today_cell_box(strip, year, month, y, day, day_font):
+    """Box (x0, y0, x1, y1) in PDF points around a day number, sized like its cell."""
+    for row, (week_number, week) in enumerate(month_layout(year, month)):
+        if day in week:
+            day_x, day_y = day_position(strip["x"], y, 0, 0, row, week.index(day))
+            half_width = 0.95 * cm * (day_font[1] / 11) / 2
+            half_height = 0.65 * cm * (day_font[1] / 11) / 2
+            centre_y = day_y + 0.1 * cm
+            return day_x - half_width, centre_y - half_height, day_x + half_width, centre_y + half_height
+    return None
+
+def draw_today_marker(image, strip, positions, page_height, dpi, style, today):
+    """Outline today's cell on a composed strip, if today is one of its months."""
+    for month_year, month, y in positions:
+        if (month_year, month) != (today.year, today.month):
+            continue
+        box = today_cell_box(strip, month_year, month, y, today.day, style["day_font"])
+        if box:
+            scale = dpi / 72
+            color = tuple(int(round(c * 255)) for c in style.get("today_color", TODAY_COLOR)) + (255,)
+            draw = ImageDraw.Draw(image)
+            draw.rectangle([box[0] * scale, (page_height - box[3]) * scale, box[2] * scale, (page_height - box[1]) * scale],
+                           outline=color, width=max(1, int(round(1.5 * scale))))
+
+def compose_strip(year, first_month, num_months, style, strip, holidays_dict, dpi, background=None, layers=LAYERS, today=None, holidays_by_year=None):
+    """
+    Compose a vertical strip of months from stored layer tiles, rendering only missing tiles.
+    layers selects the layers shown (layers the style switches off are skipped anyway);
+    the "today" layer outlines today (default: the current date).
+    holidays_by_year ({year: holidays_dict}) gives the holidays of the years it contains,
+    e.g. the next year's moving holidays when the strip runs past December.
+    Returns an RGBA PIL image, transparent outside the calendar unless a
+    background colour (0-1 RGB) is given.
+    """
+    size = tile_pixel_size(strip, dpi)
+    positions = strip_month_positions(strip, year, first_month, num_months)
+    stored_layers = [layer for layer in LAYERS if layer in layers and layer in LAYER_SETTINGS and layer_enabled(layer, style)]
+
+    # Tiles in drawing order: month by month, bottom layer first
+    tiles = []
+    for month_year, month, y in positions:
+        year_holidays = (holidays_by_year or {}).get(month_year, holidays_dict)
+        for layer in stored_layers:
+            key = tile_key(month_year, month, layer, style, strip, year_holidays)
+            tiles.append((month_year, month, layer, tile_path(month_year, month, layer, key, size), y, year_holidays))
+
+    missing = [(month_year, month, layer, path, year_holidays)
+               for month_year, month, layer, path, y, year_holidays in tiles if not os.path.exists(path)]
+    if missing:
+        render_tiles(missing, style, strip, size)
+
+    page_height = strip_page_height(strip, num_months)
+    strip_size = (size[0], int(round(page_height / 72 * dpi)))
+    fill = (0, 0, 0, 0) if background is None else tuple(int(round(c * 255)) for c in background[:3]) + (255,)
+    strip_image = Image.new('RGBA', strip_size, fill)
+
+    for month_year, month, layer, path, y, year_holidays in tiles:
+        tile = load_tile(path)
+        top = int(round((page_height - y - TILE_TOP) / 72 * dpi))
+        # Clip tiles that reach beyond the top or bottom of the strip
+        first_row = max(0, -top)
+        last_row = min(tile.shape[0], strip_size[1] - top)
+        if last_row <= first_row:
+            continue
+        tile_image = Image.fromarray(np.ascontiguousarray(tile[first_row:last_row]), 'RGBA')
+        strip_image.alpha_composite(tile_image, (0, top + first_row))
+
+    if "today" in layers:
+        draw_today_marker(strip_image, strip, positions, page_height, dpi, style, today or date.today())
+    return strip_image
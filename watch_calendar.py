@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Watch a calendar config file and rebuild only what an edit changes.
+
+The config is a JSON file of calendar settings keyed by GUI field name
+(the --settings format of the other scripts), holiday and birthday lists
+included; the .ics files it names are watched too. Every month gets a key
+from the inputs it is drawn from (the shared style plus its own holidays
+and birthdays), every page a key from its months, and the Conky strip a
+key from the months it shows. On each edit only pages whose key changed
+are drawn; the other pages come from a cache of single-page PDFs and the
+output PDFs are reassembled from it. Editing a June birthday redraws the
+office page holding June, the full-year sheet and, if June is in the
+rolling window, the Conky image (through the tile store, June only).
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from calendar import month_name
+from datetime import date, datetime
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.pdfgen import canvas
+
+# Import the calendar generation functions from calendar_gui
+sys.path.append(os.path.dirname(__file__))
+from calendar_gui import CalendarSettings, CALENDAR_OUTPUTS, ICS_SETTINGS, draw_office_page, draw_full_year_page
+from font_cache import CACHE_DIR
+from generate_conky_calendar import CONKY_STYLE, DEFAULT_PALETTE_COLORS, generate_conky_calendar, read_conky_image_size
+from pdf_stream import StreamingPDFWriter
+
+PAGE_CACHE_DIR = os.path.join(CACHE_DIR, "pages")
+
+# Seconds between checks of the watched files
+WATCH_INTERVAL = 1.0
+
+# Months on each office page, and the one full-year sheet
+OFFICE_PAGES = [list(range(first_month, min(first_month + 4, 13))) for first_month in range(1, 13, 4)]
+FULL_PAGES = [list(range(1, 13))]
+
+OUTPUTS = ["office", "full", "conky"]
+
+def fingerprint(data):
+    """Short hash of JSON-serializable data."""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+def style_options(options):
+    """The render options every month depends on (all but the per-month day lists)."""
+    return {name: value for name, value in options.items() if name not in ("holidays_dict", "birthdays_dict")}
+
+def month_key(year, month, style, holidays_dict, birthdays_dict):
+    """
+    Key of everything a month is drawn from. Day lists only count when the
+    style shows them, so e.g. birthdays do not matter with show_birthdays off.
+    """
+    return fingerprint({
+        "year": year,
+        "month": month,
+        "style": style,
+        "holidays": holidays_dict.get(month, []) if style["highlight_holidays"] else [],
+        "birthdays": birthdays_dict.get(month, []) if style["show_birthdays"] else [],
+    })
+
+def file_state(paths):
+    """Modification time and size of each file (None for missing files)."""
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime, stat.st_size)
+        except OSError:
+            state[path] = None
+    return state
+
+def render_page(path, page_size, draw_page):
+    """Draw one page into a single-page PDF, written under a temporary name first."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    c = canvas.Canvas(tmp_path, pagesize=page_size)
+    draw_page(c)
+    c.showPage()
+    c.save()
+    os.replace(tmp_path, path)
+
+def assemble_pdf(output_path, page_paths):
+    """Concatenate cached page PDFs into output_path, replacing it only when complete."""
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.NamedTemporaryFile(suffix='.pdf', dir=output_dir, delete=False) as tmp_pdf:
+        tmp_path = tmp_pdf.name
+    try:
+        writer = StreamingPDFWriter(tmp_path)
+        try:
+            for page_path in page_paths:
+                writer.append(page_path)
+        finally:
+            writer.close()
+        os.replace(tmp_path, output_path)
+    except:
+        try:
+            os.unlink(tmp_path)
+        except:
+            pass
+        raise
+
+def log(message):
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {message}", flush=True)
+
+class CalendarWatcher:
+    """
+    Rebuilds the outputs of a config file incrementally. The keys of the last
+    build are kept, so rebuild() compares months, pages and the Conky strip
+    against them and redraws only what changed.
+    """
+
+    def __init__(self, config_path, year=None, outputs=("office", "full"), output_dir=".",
+                 conky_output="conky_calendar.png", conky_months=6, conky_size=None):
+        self.config_path = config_path
+        self.year = year
+        self.outputs = list(outputs)
+        self.output_dir = output_dir
+        self.conky_output = conky_output
+        self.conky_months = conky_months
+        self.conky_size = conky_size
+        self.values = {}
+        self.file_state = {}
+        self.month_keys = {}  # (year, month) -> key
+        self.page_keys = {}  # (output, year, first month) -> key
+        self.conky_key = None
+        # Pages of other configs or output directories live in their own cache directories
+        self.page_cache_dir = os.path.join(PAGE_CACHE_DIR, fingerprint([os.path.abspath(config_path), os.path.abspath(output_dir)]))
+
+    def watched_files(self):
+        """The config file and the .ics files it imports."""
+        return [self.config_path] + [self.values[tag] for tag in sorted(ICS_SETTINGS) if self.values.get(tag)]
+
+    def changed(self):
+        """Whether a watched file changed since the last build."""
+        return file_state(self.watched_files()) != self.file_state
+
+    def rebuild(self):
+        """
+        Read the config and rebuild the affected outputs, logging what changed and how long it took.
+        Returns the list of rebuilt parts. An unreadable config is logged and skipped.
+        """
+        start_time = time.perf_counter()
+        try:
+            with open(self.config_path, encoding="utf-8") as f:
+                values = json.load(f)
+            if self.year:
+                values["year_input"] = self.year
+            settings = CalendarSettings(values)
+            options = settings.render_options()
+        except Exception as e:
+            # Typically a half-written file: keep the outputs and wait for the next save
+            log(f"Cannot read {self.config_path}: {e}")
+            self.file_state = file_state(self.watched_files())
+            return []
+
+        first_build = not self.month_keys
+        changed_settings = sorted(tag for tag in set(values) | set(self.values) if values.get(tag) != self.values.get(tag))
+        self.values = values
+        self.file_state = file_state(self.watched_files())
+        year = settings.year
+        style = style_options(options)
+
+        month_keys = {(year, month): month_key(year, month, style, options["holidays_dict"], options["birthdays_dict"])
+                      for month in range(1, 13)}
+        changed_months = [month for (key_year, month), key in month_keys.items() if self.month_keys.get((key_year, month)) != key]
+        self.month_keys = month_keys
+
+        rebuilt = []
+        os.makedirs(self.page_cache_dir, exist_ok=True)
+        if "office" in self.outputs:
+            rebuilt += self.build_pdf("office", year, OFFICE_PAGES, A4, month_keys,
+                                      lambda c, months: draw_office_page(c, year, months[0], **options))
+        if "full" in self.outputs:
+            rebuilt += self.build_pdf("full", year, FULL_PAGES, landscape(A4), month_keys,
+                                      lambda c, months: draw_full_year_page(c, year, **options))
+        if "conky" in self.outputs:
+            rebuilt += self.build_conky(settings, options)
+
+        elapsed = time.perf_counter() - start_time
+        if first_build:
+            what = "Initial build"
+        else:
+            tags = ", ".join(changed_settings[:5]) + (f" (+{len(changed_settings) - 5})" if len(changed_settings) > 5 else "")
+            months = ", ".join(month_name[month] for month in changed_months)
+            what = f"Changed {tags or 'nothing'}; months: {months or 'none'}"
+        log(f"{what}; rebuilt: {', '.join(rebuilt) or 'nothing'} in {elapsed:.2f} s")
+        return rebuilt
+
+    def build_pdf(self, output, year, pages, page_size, month_keys, draw_page):
+        """
+        Bring one output PDF up to date: draw the pages not in the page cache,
+        and reassemble the file if any page changed or it is missing.
+        Returns labels of the drawn pages.
+        """
+        output_path = os.path.join(self.output_dir, CALENDAR_OUTPUTS[output][0].format(year=year))
+        page_paths = []
+        rebuilt = []
+        changed = not os.path.exists(output_path)
+        for number, months in enumerate(pages, 1):
+            key = fingerprint([month_keys[(year, month)] for month in months])
+            path = os.path.join(self.page_cache_dir, f"{output}_{year}_{months[0]:02d}_{key}.pdf")
+            if not os.path.exists(path):
+                render_page(path, page_size, lambda c, months=months: draw_page(c, months))
+                rebuilt.append(f"{output} page {number}" if len(pages) > 1 else output)
+                # The page's previous versions are not needed any more
+                for old_path in glob.glob(os.path.join(self.page_cache_dir, f"{output}_{year}_{months[0]:02d}_*.pdf")):
+                    if old_path != path:
+                        try:
+                            os.unlink(old_path)
+                        except:
+                            pass
+            page_paths.append(path)
+            if self.page_keys.get((output, year, months[0])) != key:
+                changed = True
+            self.page_keys[(output, year, months[0])] = key
+
+        if changed:
+            assemble_pdf(output_path, page_paths)
+        return rebuilt
+
+    def build_conky(self, settings, options):
+        """
+        Redraw the Conky image if a month of its rolling window (from the current
+        month, into the next year) or the date changed. Tiles of unchanged months
+        come from the tile store. Months of the following year get that year's holidays.
+        """
+        today = date.today()
+        style = dict(CONKY_STYLE, show_birthdays=options["show_birthdays"], birthdays_dict=options["birthdays_dict"])
+        holidays_dict = options["holidays_dict"]
+        strip_months = [(today.year + (today.month - 1 + i) // 12, (today.month - 1 + i) % 12 + 1) for i in range(self.conky_months)]
+        holidays_by_year = {year: settings.holidays_dict(year) for year in sorted(set(year for year, month in strip_months))}
+        key = fingerprint({
+            "today": today,
+            "months": [month_key(year, month, style_options(style), holidays_by_year[year], style["birthdays_dict"])
+                       for year, month in strip_months],
+        })
+        if key == self.conky_key and os.path.exists(self.conky_output):
+            return []
+        try:
+            generate_conky_calendar(today.year, self.conky_months, self.conky_output, "png", DEFAULT_PALETTE_COLORS,
+                                    self.conky_size, style=style, holidays_dict=holidays_dict, holidays_by_year=holidays_by_year)
+        except ImportError:
+            log("Conky image skipped: pdf2image not installed. Install with: pip install pdf2image")
+            return []
+        except Exception as e:
+            log(f"Conky image failed: {e}")
+            return []
+        self.conky_key = key
+        return ["conky"]
+
+    def watch(self, interval=WATCH_INTERVAL):
+        """Rebuild now, then after every change of a watched file (and at midnight for Conky)."""
+        self.rebuild()
+        log(f"Watching {self.config_path} (Ctrl+C to stop)")
+        day = date.today()
+        while True:
+            time.sleep(interval)
+            if self.changed() or ("conky" in self.outputs and date.today() != day):
+                day = date.today()
+                self.rebuild()
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a calendar settings file and rebuild only the affected pages.")
+    parser.add_argument("config", help="JSON file with calendar settings keyed by GUI field name")
+    parser.add_argument("--year", type=int, default=None, help="calendar year (default: year_input of the config, or the current year)")
+    parser.add_argument("--outputs", nargs="+", choices=OUTPUTS, default=["office", "full"], help="outputs to keep up to date (default: office full)")
+    parser.add_argument("--output-dir", default=".", help="directory for the PDF files")
+    parser.add_argument("--conky-output", default="conky_calendar.png", help="Conky image (with --outputs conky)")
+    parser.add_argument("--conky-months", type=int, default=6, help="months in the Conky image")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL, help="seconds between checks for changes")
+    parser.add_argument("--once", action="store_true", help="build once and exit")
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    watcher = CalendarWatcher(args.config, args.year, args.outputs, args.output_dir, args.conky_output,
+                              args.conky_months, read_conky_image_size())
+    if args.once:
+        watcher.rebuild()
+        return
+    try:
+        watcher.watch(args.interval)
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Year overview thumbnails for comparing years and themes at a glance.
+
+Each thumbnail shows the twelve months of a year as coloured day cells,
+drawn with PIL straight from the shared month layout (no PDF involved).
+Thumbnails are rendered in parallel worker processes and cached on disk
+by year, size and a hash of the settings they depend on.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+from calendar import month_abbr
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from PIL import Image, ImageDraw, ImageFont
+
+sys.path.append(os.path.dirname(__file__))
+from calendar_layout import equinoxes_solstices, moon_phases, month_layout
+from font_cache import CACHE_DIR
+from ics_import import load_event_index
+
+THUMBNAIL_DIR = os.path.join(CACHE_DIR, "thumbnails")
+THUMBNAIL_WIDTH = 360
+
+# Settings a thumbnail depends on
+THUMBNAIL_SETTINGS = ["bg_color", "normal_text_color", "weekend_bg_color", "holiday_bg_color",
+                      "highlight_holidays", "show_equinoxes", "equinox_circle_color",
+                      "show_moon_phases", "moon_phase_color", "show_birthdays", "birthday_square_color"]
+
+def thumbnail_theme(settings):
+    """The part of a CalendarSettings that thumbnails are drawn from, as plain data."""
+    theme = {tag: settings.values[tag] for tag in THUMBNAIL_SETTINGS}
+    theme["holidays_dict"] = settings.holidays_dict(imported=False)
+    theme["birthdays_dict"] = settings.birthdays_dict(imported=False)
+    # Imported .ics files are expanded per year when drawing; the modification
+    # time makes an edited file change the theme hash. Files moved or deleted
+    # since the import are left out, as if none was imported.
+    theme["ics_files"] = {}
+    for tag in ("holiday_ics_file", "birthday_ics_file"):
+        if settings.values[tag]:
+            try:
+                theme["ics_files"][tag] = [settings.values[tag], os.path.getmtime(settings.values[tag])]
+            except OSError:
+                pass
+    return theme
+
+def theme_days(theme, name, tag, year):
+    """Days of a theme per month (name is "holidays_dict" or "birthdays_dict") plus those of its imported .ics file."""
+    days = {month: list(month_days) for month, month_days in theme[name].items()}
+    if tag in theme.get("ics_files", {}):
+        for month, month_days in load_event_index(theme["ics_files"][tag][0]).month_days(year).items():
+            days[month] = days.get(month, []) + [day for day in month_days if day not in days.get(month, [])]
+    return days
+
+def theme_hash(theme):
+    """Stable hash of a thumbnail theme, used in the cache file names."""
+    return hashlib.sha1(json.dumps(theme, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+def thumbnail_path(year, theme_digest, width=THUMBNAIL_WIDTH):
+    """Cache file of a thumbnail."""
+    return os.path.join(THUMBNAIL_DIR, f"{year}_{width}_{theme_digest}.png")
+
+def rgb(color):
+    """Convert a 0-1 RGB colour to PIL's 0-255 tuple."""
+    return tuple(int(round(component * 255)) for component in color[:3])
+
+def load_font(size):
+    """PIL's built-in font at a pixel size (bitmap default on old Pillow versions)."""
+    try:
+        return ImageFont.load_default(size)
+    except TypeError:
+        return ImageFont.load_default()
+
+def render_thumbnail(year, theme, width=THUMBNAIL_WIDTH):
+    """
+    Draw the year as a 4x3 grid of months.
+    Returns a PIL RGB image width pixels wide.
+    """
+    cell = width / 34  # 4 months of 8 cells plus margins
+    month_width = 8 * cell
+    month_height = 8 * cell  # title row, 6 week rows, spacing
+    title_height = 2 * cell
+    height = int(round(title_height + 3 * month_height + cell))
+
+    image = Image.new("RGB", (width, height), rgb(theme["bg_color"]))
+    draw = ImageDraw.Draw(image)
+    text_color = rgb(theme["normal_text_color"])
+    draw.text((width / 2, title_height / 2), str(year), fill=text_color, font=load_font(int(cell * 1.5)), anchor="mm")
+
+    # Faint cell borders so plain days stay visible on the background
+    grid_color = tuple(int(round(b * 0.85 + t * 0.15)) for b, t in zip(rgb(theme["bg_color"]), text_color))
+    label_font = load_font(max(6, int(cell * 0.9)))
+    day_font = load_font(int(cell * 0.6)) if cell >= 12 else None
+    holidays_dict = theme_days(theme, "holidays_dict", "holiday_ics_file", year)
+    birthdays_dict = theme_days(theme, "birthdays_dict", "birthday_ics_file", year)
+    for month in range(1, 13):
+        month_x = cell + ((month - 1) % 4) * (month_width + cell)
+        month_y = title_height + ((month - 1) // 4) * month_height
+        draw.text((month_x + 3.5 * cell, month_y + cell / 2), month_abbr[month], fill=text_color, font=label_font, anchor="mm")
+
+        month_holidays = holidays_dict.get(month, [])
+        month_birthdays = birthdays_dict.get(month, [])
+        month_moon_phases = [day for day, phase_type in moon_phases(year).get(month, [])]
+        for row, (week_number, week) in enumerate(month_layout(year, month)):
+            for column, day in enumerate(week):
+                if day == 0:
+                    continue
+                if theme["highlight_holidays"] and day in month_holidays:
+                    fill = rgb(theme["holiday_bg_color"])
+                elif column in (5, 6):
+                    fill = rgb(theme["weekend_bg_color"])
+                else:
+                    fill = rgb(theme["bg_color"])
+                left = month_x + column * cell
+                top = month_y + (row + 1) * cell
+                box = [left + 1, top + 1, left + cell - 1, top + cell - 1]
+                draw.rectangle(box, fill=fill, outline=grid_color)
+
+                if theme["show_birthdays"] and day in month_birthdays:
+                    draw.rectangle(box, outline=rgb(theme["birthday_square_color"]))
+                if theme["show_equinoxes"] and day in equinoxes_solstices(year).get(month, []):
+                    draw.ellipse(box, outline=rgb(theme["equinox_circle_color"]))
+                if theme["show_moon_phases"] and day in month_moon_phases:
+                    dot = max(1, cell / 8)
+                    draw.ellipse([left + cell - 2 * dot - 1, top + 1, left + cell - 1, top + 2 * dot + 1], fill=rgb(theme["moon_phase_color"]))
+                if day_font:
+                    draw.text((left + cell / 2, top + cell / 2), str(day), fill=text_color, font=day_font, anchor="mm")
+    return image
+
+def render_thumbnail_file(year, theme, width, output_path):
+    """Worker: render a thumbnail into the cache. Returns (year, output path)."""
+    image = render_thumbnail(year, theme, width)
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    # Write under a temporary name so readers never see a partial file
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    image.save(tmp_path, "PNG")
+    os.replace(tmp_path, output_path)
+    return year, output_path
+
+def iter_thumbnails(years, theme, width=THUMBNAIL_WIDTH, jobs=None):
+    """
+    Yields (year, thumbnail path) for every year: cached thumbnails first, then
+    the others as soon as a worker process finishes them.
+    """
+    digest = theme_hash(theme)
+    missing = []
+    for year in years:
+        path = thumbnail_path(year, digest, width)
+        if os.path.exists(path):
+            yield year, path
+        else:
+            missing.append((year, path))
+    if not missing:
+        return
+
+    jobs = min(jobs or os.cpu_count() or 1, len(missing))
+    if jobs == 1:
+        for year, path in missing:
+            yield render_thumbnail_file(year, theme, width, path)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(render_thumbnail_file, year, theme, width, path) for year, path in missing]
+        for future in as_completed(futures):
+            yield future.result()
+
+def contact_sheet(paths, columns=4):
+    """Combine thumbnails (in order) into one image, columns wide."""
+    images = [Image.open(path) for path in paths]
+    width, height = images[0].size
+    rows = -(-len(images) // columns)
+    sheet = Image.new("RGB", (columns * width, rows * height), (255, 255, 255))
+    for index, image in enumerate(images):
+        sheet.paste(image, ((index % columns) * width, (index // columns) * height))
+    return sheet
+
+def main():
+    from calendar_gui import CalendarSettings
+
+    parser = argparse.ArgumentParser(description="Export year overview thumbnails for a range of years.")
+    parser.add_argument("first_year", type=int)
+    parser.add_argument("last_year", type=int)
+    parser.add_argument("--output-dir", default="gallery", help="directory for the thumbnails and the contact sheet")
+    parser.add_argument("--width", type=int, default=THUMBNAIL_WIDTH, help="thumbnail width in pixels")
+    parser.add_argument("--jobs", type=int, default=None, help="worker processes (default: number of cores)")
+    parser.add_argument("--settings", help="JSON file with calendar settings keyed by GUI field name")
+    args = parser.parse_args()
+
+    settings_values = {}
+    if args.settings:
+        with open(args.settings, encoding="utf-8") as f:
+            settings_values = json.load(f)
+    theme = thumbnail_theme(CalendarSettings(settings_values))
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    years = list(range(args.first_year, args.last_year + 1))
+    start_time = time.perf_counter()
+    paths = {}
+    for year, path in iter_thumbnails(years, theme, args.width, args.jobs):
+        paths[year] = os.path.join(args.output_dir, f"year_{year}.png")
+        with open(path, "rb") as src, open(paths[year], "wb") as dst:
+            dst.write(src.read())
+        print(f"{year}: {paths[year]}")
+
+    sheet_path = os.path.join(args.output_dir, f"gallery_{args.first_year}_{args.last_year}.png")
+    contact_sheet([paths[year] for year in years]).save(sheet_path, "PNG")
+    elapsed = time.perf_counter() - start_time
+    print(f"Contact sheet: {sheet_path}")
+    print(f"Time: {elapsed:.2f} s for {len(years)} thumbnails")
+
+if __name__ == "__main__":
+    main()